@@ -1,16 +1,30 @@
 import streamlit as st
-from app_layout import setup_page, setup_sidebar
-from pages.overview import show_overview
-from pages.employer_analysis import show_employer_analysis
-from pages.geographic_analysis import show_geographic_analysis
+from app_layout import (
+    setup_page,
+    select_periods,
+    setup_sidebar,
+    show_context_stats,
+    show_sections,
+    visible_sections,
+)
+from pages.overview import show_overview, prefetch_overview
+from pages.employer_analysis import (
+    show_employer_analysis,
+    prefetch_employer_analysis,
+)
+from pages.geographic_analysis import (
+    show_geographic_analysis,
+    prefetch_geographic_analysis,
+)
 from utils import load_data
+from utils.aggregate_context import AggregateContext, get_section_pool
 
 
 def main():
     setup_page()
 
     try:
-        df = load_data()
+        df = load_data(select_periods())
     except Exception as e:
         st.error(f"Error loading data: {str(e)}")
         return
@@ -18,19 +32,29 @@ def main():
     if df is not None:
         # Setup sidebar and get filtered dataframe
         filtered_df = setup_sidebar(df)
+        context = AggregateContext(filtered_df, get_section_pool())
 
-        # Create tabs
-        tab1, tab2, tab3 = st.tabs(
-            ["Overview", "Employer Analysis", "Geographic Analysis"]
+        # Start the aggregations of every section about to render, so they
+        # run concurrently while earlier sections draw
+        prefetches = {
+            "Overview": prefetch_overview,
+            "Employer Analysis": prefetch_employer_analysis,
+            "Geographic Analysis": prefetch_geographic_analysis,
+        }
+        for section in visible_sections(prefetches, "main_section"):
+            prefetches[section](context)
+
+        # Show content of the selected tab
+        show_sections(
+            {
+                "Overview": lambda: show_overview(context),
+                "Employer Analysis": lambda: show_employer_analysis(context),
+                "Geographic Analysis": lambda: show_geographic_analysis(context),
+            },
+            key="main_section",
         )
 
-        # Show content based on selected tab
-        with tab1:
-            show_overview(filtered_df)
-        with tab2:
-            show_employer_analysis(filtered_df)
-        with tab3:
-            show_geographic_analysis(filtered_df)
+        show_context_stats(context)
 
     else:
         st.error(
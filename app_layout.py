@@ -1,5 +1,15 @@
 import streamlit as st
-from utils import get_soc_title
+from utils import list_periods, format_period
+from utils.data_loader import get_quarantine_counts
+from utils.data_constants import (
+    DEFAULT_PERIOD,
+    PUBLISHED_PERIODS,
+    LAZY_SECTIONS,
+    STATE_DIMENSION_FILE,
+)
+from utils.dimensions import dimension_table, soc_titles, wage_bounds
+from utils.aggregate_cache import get_aggregate_cache
+from utils.filter_index import get_filter_index, select_rows
 
 
 def setup_page():
@@ -25,27 +35,43 @@ def setup_page():
         )
 
 
+def select_periods():
+    """Setup fiscal period selector and return the selected periods"""
+    # Offer every published period plus any other period already ingested
+    periods = sorted(set(PUBLISHED_PERIODS) | set(list_periods()))
+    selected_periods = st.sidebar.multiselect(
+        "Fiscal Periods",
+        periods,
+        default=[DEFAULT_PERIOD],
+        format_func=format_period,
+        help="Periods not yet on disk are downloaded and processed on first use",
+    )
+
+    return tuple(sorted(selected_periods)) or (DEFAULT_PERIOD,)
+
+
 def setup_sidebar(df):
-    """Setup sidebar filters and return filtered dataframe"""
+    """Setup sidebar filters and return filtered dataframe
+
+    Options, labels and bounds come from the dataset's dimension tables, so
+    building the sidebar does not scan the rows.
+    """
     st.sidebar.header("Filters")
 
     # SOC code filter
-    soc_codes = sorted(df["SOC_CODE"].unique())
+    titles = soc_titles(df)
     selected_soc = st.sidebar.selectbox(
         "Filter by SOC Code",
-        ["All"] + list(soc_codes),
-        format_func=lambda x: (
-            f"{x} - {get_soc_title(df, x)}" if x != "All" else "All"
-        ),
+        ["All"] + list(titles.index),
+        format_func=lambda x: f"{x} - {titles[x]}" if x != "All" else "All",
     )
 
     # State filter
-    states = sorted(df["WORKSITE_STATE"].unique())
+    states = dimension_table(df, STATE_DIMENSION_FILE)["WORKSITE_STATE"]
     selected_state = st.sidebar.selectbox("Filter by State", ["All"] + list(states))
 
     # Wage range filter
-    wage_min = float(df["ANNUAL_WAGE"].min())
-    wage_max = float(df["ANNUAL_WAGE"].max())
+    wage_min, wage_max = wage_bounds(df)
     wage_range = st.sidebar.slider(
         "Annual Wage Range ($)",
         min_value=wage_min,
@@ -62,6 +88,24 @@ def setup_sidebar(df):
         st.write("State:", selected_state)
         st.write("Wage Range: ${:,.0f} - ${:,.0f}".format(wage_range[0], wage_range[1]))
         st.write("Filtered Records: {:,}".format(len(filtered_df)))
+        cache_stats = get_aggregate_cache().stats()
+        st.caption(
+            "Aggregate cache: {:,} hits, {:,} misses".format(
+                cache_stats["hits"], cache_stats["misses"]
+            )
+        )
+        quarantined, rule_counts = get_quarantine_counts(df)
+        if quarantined:
+            st.caption(
+                "Quarantined at ingest: {:,} rows ({})".format(
+                    quarantined,
+                    ", ".join(
+                        "{} {:,}".format(rule, count)
+                        for rule, count in rule_counts.items()
+                        if count
+                    ),
+                )
+            )
 
     # About section at the bottom
     st.sidebar.markdown("---")
@@ -77,18 +121,85 @@ def setup_sidebar(df):
     return filtered_df
 
 
+def visible_sections(labels, key):
+    """Labels of the sections `show_sections` is about to render
+
+    Lets a page start computing those sections before rendering anything.
+
+    Args:
+        labels: Section labels, in order
+        key: Widget key of the group's selector
+    """
+    labels = list(labels)
+    if not LAZY_SECTIONS:
+        return labels
+    selected = st.session_state.get(key)
+    return [selected if selected in labels else labels[0]]
+
+
+def show_sections(sections, key):
+    """Display a group of sections as tabs, computing only the selected one
+
+    With LAZY_SECTIONS, a section selector replaces the tabs and only the
+    selected section is rendered. The selector and its section run as one
+    fragment, so switching sections, or any widget inside them, reruns that
+    fragment alone rather than the whole page. Otherwise every section is
+    rendered into its own tab.
+
+    Args:
+        sections: Section labels mapped to functions rendering them
+        key: Widget key of the selector, unique per group
+    """
+    if not LAZY_SECTIONS:
+        for tab, show_section in zip(st.tabs(list(sections)), sections.values()):
+            with tab:
+                show_section()
+        return
+
+    @st.fragment
+    def show_selected_section():
+        selected = st.radio(
+            "Section",
+            list(sections),
+            horizontal=True,
+            key=key,
+            label_visibility="collapsed",
+        )
+        sections[selected]()
+
+    show_selected_section()
+
+
+def show_context_stats(context):
+    """Show how often sections shared an aggregate instead of recomputing it"""
+    context_stats = context.stats()
+    st.sidebar.caption(
+        "Shared aggregates: {:,} computed, {:,} recomputations avoided".format(
+            context_stats["computed"], context_stats["reused"]
+        )
+    )
+
+
 def apply_filters(df, selected_soc, selected_state, wage_range):
-    """Apply selected filters to dataframe"""
-    filtered_df = df.copy()
-
-    if selected_soc != "All":
-        filtered_df = filtered_df[filtered_df["SOC_CODE"] == selected_soc]
-    if selected_state != "All":
-        filtered_df = filtered_df[filtered_df["WORKSITE_STATE"] == selected_state]
-
-    filtered_df = filtered_df[
-        (filtered_df["ANNUAL_WAGE"] >= wage_range[0])
-        & (filtered_df["ANNUAL_WAGE"] <= wage_range[1])
-    ]
+    """Apply selected filters to dataframe
+
+    Filters are resolved through the dataset's precomputed filter index, so
+    the cost depends on the number of matching rows. The shared dataset is
+    never modified: the result is always a new frame, tagged with a filter
+    key for `cached_aggregate`.
+    """
+    rows = get_filter_index(df).select(selected_soc, selected_state, wage_range)
+    filtered_df = select_rows(df, rows)
+
+    # Tag the view so page aggregates can be cached by filter, not by contents
+    dataset_version = df.attrs.get("dataset_version")
+    if dataset_version is not None:
+        filtered_df.attrs["filter_key"] = (
+            dataset_version,
+            selected_soc,
+            selected_state,
+            tuple(wage_range),
+        )
+        filtered_df.attrs["filter_rows"] = len(filtered_df)
 
     return filtered_df
@@ -0,0 +1,56 @@
+"""
+Compare the single-sort grouped statistics kernel with pandas multi-function
+group-by aggregation, on keys of increasing cardinality.
+
+Run from the repository root:
+    python -m benchmarks.grouped_stats
+"""
+
+import timeit
+import pandas as pd
+from utils.data_constants import DEFAULT_PERIOD
+from utils.dataset_store import read_partitions
+from utils.grouped_stats import grouped_stats
+
+GROUP_COLUMNS = ["WORKSITE_STATE", "SOC_CODE", "EMPLOYER_NAME", "JOB_TITLE"]
+STATISTICS = ["count", "mean", "std", "min", "max", "median"]
+
+
+def best_time(stmt) -> float:
+    """Best of five runs in ms"""
+    return min(timeit.repeat(stmt, number=1, repeat=5)) * 1000
+
+
+def kernel_report(df: pd.DataFrame) -> pd.DataFrame:
+    """Time both approaches per group column and check they agree"""
+    rows = {}
+    for col in GROUP_COLUMNS:
+        pandas_stats = df.groupby(col, observed=True)["ANNUAL_WAGE"].agg(STATISTICS)
+        kernel_stats = grouped_stats(df, col).rename(columns={0.5: "median"})
+        pd.testing.assert_frame_equal(
+            kernel_stats[STATISTICS],
+            pandas_stats.astype({stat: "float64" for stat in STATISTICS[1:]}),
+            rtol=1e-6,
+        )
+
+        rows[col] = [
+            df[col].nunique(),
+            best_time(
+                lambda: df.groupby(col, observed=True)["ANNUAL_WAGE"].agg(STATISTICS)
+            ),
+            best_time(lambda: grouped_stats(df, col)),
+        ]
+
+    report = pd.DataFrame.from_dict(
+        rows, orient="index", columns=["Groups", "pandas agg (ms)", "Kernel (ms)"]
+    )
+    report["Speedup"] = report["pandas agg (ms)"] / report["Kernel (ms)"]
+    return report.round(2)
+
+
+if __name__ == "__main__":
+    df = read_partitions([DEFAULT_PERIOD])
+
+    print(f"Rows: {len(df):,}")
+    print(f"Statistics: {', '.join(STATISTICS)}\n")
+    print(kernel_report(df).to_string())
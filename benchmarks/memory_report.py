@@ -0,0 +1,62 @@
+"""
+Compare memory use and group-by speed of the compact processed schema with
+the plain object-string/float64 layout.
+
+Run from the repository root:
+    python -m benchmarks.memory_report
+"""
+
+import timeit
+import pandas as pd
+from utils.data_constants import CATEGORICAL_COLUMNS, DEFAULT_PERIOD, NUMERIC_COLUMNS
+from utils.dataset_store import read_partitions
+
+GROUP_COLUMNS = ["EMPLOYER_NAME", "JOB_TITLE", "WORKSITE_STATE"]
+
+
+def to_plain_types(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert a processed frame back to object strings and float64 wages"""
+    dtypes = {col: object for col in CATEGORICAL_COLUMNS}
+    dtypes.update({col: "float64" for col in NUMERIC_COLUMNS})
+    return df.astype(dtypes)
+
+
+def memory_report(plain: pd.DataFrame, compact: pd.DataFrame) -> pd.DataFrame:
+    """Per-column deep memory usage in MB for both layouts"""
+    report = pd.DataFrame(
+        {
+            "Plain (MB)": plain.memory_usage(deep=True, index=False) / 1e6,
+            "Compact (MB)": compact.memory_usage(deep=True, index=False) / 1e6,
+        }
+    )
+    report.loc["Total"] = report.sum()
+    report["Reduction"] = report["Plain (MB)"] / report["Compact (MB)"]
+    return report.round(2)
+
+
+def groupby_report(plain: pd.DataFrame, compact: pd.DataFrame) -> pd.DataFrame:
+    """Median group-by time in ms for both layouts"""
+    rows = {}
+    for col in GROUP_COLUMNS:
+        timings = []
+        for df in (plain, compact):
+            stmt = lambda: df.groupby(col, observed=True)["ANNUAL_WAGE"].agg(
+                ["count", "mean", "median"]
+            )
+            timings.append(min(timeit.repeat(stmt, number=1, repeat=5)) * 1000)
+        rows[col] = timings
+
+    report = pd.DataFrame.from_dict(
+        rows, orient="index", columns=["Plain (ms)", "Compact (ms)"]
+    )
+    report["Speedup"] = report["Plain (ms)"] / report["Compact (ms)"]
+    return report.round(2)
+
+
+if __name__ == "__main__":
+    compact = read_partitions([DEFAULT_PERIOD])
+    plain = to_plain_types(compact)
+
+    print(f"Rows: {len(compact):,}\n")
+    print(memory_report(plain, compact).to_string(), "\n")
+    print(groupby_report(plain, compact).to_string())
@@ -0,0 +1,92 @@
+"""
+Compare computing the aggregations of every dashboard section serially with
+prefetching them on section thread pools of increasing size.
+
+The aggregate cache is cleared before each run, so every run computes all
+sections from the filtered rows. Speedups are bounded by the number of
+cores; on a single core the pool can only add overhead.
+
+Run from the repository root:
+    python -m benchmarks.section_pool
+"""
+
+import os
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import pandas as pd
+from app_layout import apply_filters
+from pages.overview import (
+    calculate_key_metrics,
+    calculate_wage_metrics,
+    plot_wage_distribution,
+    calculate_job_stats,
+)
+from pages.employer_analysis.main import (
+    SECTION_AGGREGATES as EMPLOYER_AGGREGATES,
+    calculate_employer_metrics,
+)
+from pages.geographic_analysis.main import (
+    SECTION_AGGREGATES as GEOGRAPHIC_AGGREGATES,
+    calculate_state_metrics,
+)
+from utils import load_data
+from utils.aggregate_cache import get_aggregate_cache
+from utils.aggregate_context import AggregateContext
+from utils.data_constants import DEFAULT_PERIOD
+
+POOL_SIZES = [2, 4, 8]
+
+# Views to render, as (SOC code, state) filters over the full wage range
+VIEWS = [("All", "All"), ("All", "CA"), ("15-1252", "All")]
+
+SECTIONS = [
+    calculate_key_metrics,
+    calculate_wage_metrics,
+    plot_wage_distribution,
+    calculate_job_stats,
+    calculate_employer_metrics,
+    calculate_state_metrics,
+    *[func for funcs in EMPLOYER_AGGREGATES.values() for func in funcs],
+    *[func for funcs in GEOGRAPHIC_AGGREGATES.values() for func in funcs],
+]
+
+
+def render_sections(df: pd.DataFrame, pool: Optional[ThreadPoolExecutor]) -> None:
+    """Compute every section aggregation of a view, as a full rerun would"""
+    get_aggregate_cache().clear()
+    context = AggregateContext(df, pool)
+    context.prefetch(*SECTIONS)
+    for func in SECTIONS:
+        context.result(func)
+
+
+def best_time(stmt) -> float:
+    """Best of three runs in ms"""
+    return min(timeit.repeat(stmt, number=1, repeat=3)) * 1000
+
+
+def pool_report(df: pd.DataFrame) -> pd.DataFrame:
+    """Time serial and pooled section computation per view"""
+    wage_range = (df["ANNUAL_WAGE"].min(), df["ANNUAL_WAGE"].max())
+    rows = {}
+    for soc, state in VIEWS:
+        view = apply_filters(df, soc, state, wage_range)
+        timings = [best_time(lambda: render_sections(view, None))]
+        for size in POOL_SIZES:
+            with ThreadPoolExecutor(size) as pool:
+                timings.append(best_time(lambda: render_sections(view, pool)))
+        rows[f"{soc} / {state} ({len(view):,} rows)"] = timings
+
+    columns = ["Serial (ms)"] + [f"Pool of {size} (ms)" for size in POOL_SIZES]
+    report = pd.DataFrame.from_dict(rows, orient="index", columns=columns)
+    report["Best speedup"] = report["Serial (ms)"] / report[columns[1:]].min(axis=1)
+    return report.round(2)
+
+
+if __name__ == "__main__":
+    df = load_data((DEFAULT_PERIOD,))
+
+    print(f"Rows: {len(df):,}")
+    print(f"Cores: {os.cpu_count()}\n")
+    print(pool_report(df).to_string())
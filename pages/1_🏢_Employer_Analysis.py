@@ -1,11 +1,14 @@
 import streamlit as st
 from employer_analysis import show_employer_analysis
-from app_layout import setup_page, setup_sidebar
+from app_layout import setup_page, select_periods, setup_sidebar, show_context_stats
 from utils import load_data
+from utils.aggregate_context import AggregateContext, get_section_pool
 
 setup_page()
-df = load_data()
+df = load_data(select_periods())
 
 if df is not None:
     filtered_df = setup_sidebar(df)
-    show_employer_analysis(filtered_df)
+    context = AggregateContext(filtered_df, get_section_pool())
+    show_employer_analysis(context)
+    show_context_stats(context)
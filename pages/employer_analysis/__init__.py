@@ -1,3 +1,3 @@
-from .main import show_employer_analysis
+from .main import show_employer_analysis, prefetch_employer_analysis
 
-__all__ = ["show_employer_analysis"]
+__all__ = ["show_employer_analysis", "prefetch_employer_analysis"]
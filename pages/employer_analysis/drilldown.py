@@ -0,0 +1,153 @@
+import streamlit as st
+import plotly.graph_objects as go
+from utils.aggregate_cache import cached_aggregate
+from utils.chart_summaries import (
+    box_summary,
+    box_traces,
+    histogram_summary,
+    histogram_trace,
+)
+from utils.data_constants import DRILLDOWN_MAX_EMPLOYERS
+from utils.dimensions import soc_titles
+from utils.filter_index import group_rows
+
+
+@cached_aggregate
+def calculate_drilldown_employers(context):
+    """List the largest employers, by number of certifications"""
+    return context.employer_counts.sort_values(ascending=False, kind="stable").head(
+        DRILLDOWN_MAX_EMPLOYERS
+    )
+
+
+@cached_aggregate
+def calculate_employer_profile(df, employer):
+    """Calculate SOC mix, state mix and wage distribution of one employer"""
+    # The employer's rows are one contiguous slice of the clustered dataset
+    employer_df = group_rows(df, "EMPLOYER_NAME", employer)
+
+    soc_mix = (
+        employer_df.groupby("SOC_CODE", observed=True)
+        .size()
+        .sort_values(ascending=False, kind="stable")
+        .head(10)
+        .to_frame("Certifications")
+    )
+    soc_mix["Title"] = soc_titles(df).reindex(soc_mix.index.astype(str)).to_numpy()
+    state_mix = (
+        employer_df.groupby("WORKSITE_STATE", observed=True)
+        .size()
+        .sort_values(ascending=False, kind="stable")
+    )
+
+    return {
+        "certifications": len(employer_df),
+        "soc_mix": soc_mix,
+        "state_mix": state_mix,
+        "wage_box": box_summary(employer_df["ANNUAL_WAGE"]),
+        "wage_histogram": histogram_summary(employer_df["ANNUAL_WAGE"]),
+    }
+
+
+def create_soc_mix_figure(soc_mix):
+    """Create bar chart of an employer's most common occupations"""
+    labels = soc_mix.index.astype(str) + " " + soc_mix["Title"].astype(str)
+    fig = go.Figure(
+        go.Bar(
+            x=soc_mix["Certifications"],
+            y=labels,
+            orientation="h",
+        )
+    )
+    fig.update_layout(
+        title="Top Occupations",
+        xaxis_title="Certifications",
+        yaxis=dict(autorange="reversed"),
+        height=400,
+    )
+    return fig
+
+
+def create_state_mix_figure(state_mix):
+    """Create choropleth map of an employer's certifications by state"""
+    fig = go.Figure(
+        go.Choropleth(
+            locations=state_mix.index.astype(str),
+            z=state_mix.to_numpy(),
+            locationmode="USA-states",
+            colorscale="blues",
+            colorbar_title="Certifications",
+        )
+    )
+    fig.update_layout(title="Certifications by State", geo_scope="usa", height=400)
+    return fig
+
+
+def create_wage_histogram(wage_histogram):
+    """Create histogram of an employer's annual wages"""
+    fig = go.Figure(histogram_trace(wage_histogram, name="Certifications"))
+    fig.update_layout(
+        title="Wage Distribution",
+        xaxis_title="Annual Wage ($)",
+        xaxis=dict(tickformat="$,.0f"),
+        yaxis_title="Certifications",
+        height=400,
+    )
+    return fig
+
+
+def create_wage_box(wage_box, employer):
+    """Create box plot of an employer's annual wages"""
+    fig = go.Figure(box_traces(wage_box, employer))
+    fig.update_layout(
+        yaxis_title="Annual Wage ($)",
+        yaxis=dict(tickformat="$,.0f"),
+        xaxis=dict(showticklabels=False),
+        height=400,
+        showlegend=False,
+    )
+    return fig
+
+
+def show_employer_drilldown(context):
+    """Display the profile of a single employer"""
+    employers = context.result(calculate_drilldown_employers)
+    if employers.empty:
+        st.info("No employers match the current filters.")
+        return
+
+    employer = st.selectbox(
+        "Employer",
+        employers.index,
+        format_func=lambda name: f"{name} ({employers[name]:,})",
+        help=f"The {DRILLDOWN_MAX_EMPLOYERS:,} largest employers under the current filters",
+    )
+    profile = calculate_employer_profile(context.df, employer)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Certifications", f"{profile['certifications']:,}")
+    with col2:
+        st.metric("Median Wage", f"${profile['wage_box']['median']:,.0f}")
+    with col3:
+        st.metric("States", f"{len(profile['state_mix']):,}")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.plotly_chart(
+            create_soc_mix_figure(profile["soc_mix"]), use_container_width=True
+        )
+    with col2:
+        st.plotly_chart(
+            create_state_mix_figure(profile["state_mix"]), use_container_width=True
+        )
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.plotly_chart(
+            create_wage_histogram(profile["wage_histogram"]), use_container_width=True
+        )
+    with col2:
+        st.plotly_chart(
+            create_wage_box(profile["wage_box"], employer), use_container_width=True
+        )
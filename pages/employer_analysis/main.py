@@ -1,47 +1,81 @@
 import streamlit as st
-from .size_analysis import show_employer_size_distribution
-from .wage_analysis import show_wage_by_employer_size
-from .top_employers import show_top_employers_table
+from app_layout import show_sections, visible_sections
+from .size_analysis import (
+    show_employer_size_distribution,
+    calculate_size_distribution,
+)
+from .wage_analysis import show_wage_by_employer_size, calculate_wage_by_employer_size
+from .top_employers import show_top_employers_table, calculate_employer_stats
+from .drilldown import show_employer_drilldown, calculate_drilldown_employers
+from utils.aggregate_cache import cached_aggregate
 
 
-def show_employer_analysis(df):
+@cached_aggregate
+def calculate_employer_metrics(context):
+    """Calculate employer overview metrics"""
+    employer_counts = context.employer_counts
+    return {
+        "employers": len(employer_counts),
+        "top_10_share": employer_counts.nlargest(10).sum() / len(context.df) * 100,
+        "median_certs": employer_counts.median(),
+    }
+
+
+# Aggregations each section shows
+SECTION_AGGREGATES = {
+    "Top Employers": [calculate_employer_stats],
+    "Size Distribution": [calculate_size_distribution],
+    "Wage Analysis": [calculate_wage_by_employer_size],
+    "Employer Drill-down": [calculate_drilldown_employers],
+}
+
+
+def prefetch_employer_analysis(context):
+    """Start computing the overview metrics and the visible sections"""
+    sections = visible_sections(SECTION_AGGREGATES, "employer_section")
+    context.prefetch(
+        calculate_employer_metrics,
+        *[func for section in sections for func in SECTION_AGGREGATES[section]],
+    )
+
+
+def show_employer_analysis(context):
     """Display employer analysis page content"""
     st.subheader("🏢 Employer Analysis")
+    prefetch_employer_analysis(context)
 
     # Overview metrics
+    metrics = context.result(calculate_employer_metrics)
     col1, col2, col3 = st.columns(3)
 
     with col1:
         st.metric(
             "Total Employers",
-            f"{df['EMPLOYER_NAME'].nunique():,}",
+            f"{metrics['employers']:,}",
             help="Number of unique employers",
         )
 
     with col2:
-        top_10_share = df["EMPLOYER_NAME"].value_counts().head(10).sum() / len(df) * 100
         st.metric(
             "Top 10 Employers Share",
-            f"{top_10_share:.1f}%",
+            f"{metrics['top_10_share']:.1f}%",
             help="Percentage of certifications from top 10 employers",
         )
 
     with col3:
-        median_certs = df["EMPLOYER_NAME"].value_counts().median()
         st.metric(
             "Median Certifications per Employer",
-            f"{median_certs:.0f}",
+            f"{metrics['median_certs']:.0f}",
             help="Median number of certifications per employer",
         )
 
     # Employer Analysis Tabs
-    tab1, tab2, tab3 = st.tabs(["Top Employers", "Size Distribution", "Wage Analysis"])
-
-    with tab1:
-        show_top_employers_table(df)
-
-    with tab2:
-        show_employer_size_distribution(df)
-
-    with tab3:
-        show_wage_by_employer_size(df)
+    show_sections(
+        {
+            "Top Employers": lambda: show_top_employers_table(context),
+            "Size Distribution": lambda: show_employer_size_distribution(context),
+            "Wage Analysis": lambda: show_wage_by_employer_size(context),
+            "Employer Drill-down": lambda: show_employer_drilldown(context),
+        },
+        key="employer_section",
+    )
@@ -1,11 +1,13 @@
 import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
+from utils.aggregate_cache import cached_aggregate
 
 
-def show_employer_size_distribution(df):
-    """Display employer size distribution analysis"""
-    employer_sizes = df.groupby("EMPLOYER_NAME").size().reset_index()
+@cached_aggregate
+def calculate_size_distribution(context):
+    """Calculate the number of employers in each size category"""
+    employer_sizes = context.employer_counts.reset_index()
     employer_sizes.columns = ["Employer", "Size"]
 
     size_bins = [0, 10, 50, 100, 500, float("inf")]
@@ -15,6 +17,12 @@ def show_employer_size_distribution(df):
     )
 
     size_distribution = employer_sizes["Size Category"].value_counts().sort_index()
+    return size_distribution, len(employer_sizes)
+
+
+def show_employer_size_distribution(context):
+    """Display employer size distribution analysis"""
+    size_distribution, total_employers = context.result(calculate_size_distribution)
 
     fig = go.Figure(
         data=[
@@ -36,8 +44,7 @@ def show_employer_size_distribution(df):
 
     st.plotly_chart(fig, use_container_width=True)
 
-    cols = st.columns(len(size_labels))
-    total_employers = len(employer_sizes)
+    cols = st.columns(len(size_distribution))
 
     for i, (label, count) in enumerate(size_distribution.items()):
         with cols[i]:
@@ -1,37 +1,45 @@
 import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
+from utils.aggregate_cache import cached_aggregate
+from utils.chart_summaries import box_summary, box_traces
+from utils.filter_index import group_rows
+from utils.grouped_stats import grouped_stats
+from utils.wage_cube import primary_values
 
 
-def calculate_employer_stats(df):
+@cached_aggregate
+def calculate_employer_stats(context):
     """Calculate statistics for top employers"""
-    employer_stats = (
-        df.groupby("EMPLOYER_NAME")
-        .agg(
-            {
-                "ANNUAL_WAGE": ["count", "mean", "median", "std"],
-                "WAGE_RATIO": "mean",
-                "WORKSITE_STATE": lambda x: x.mode()[0],
-                "SOC_CODE": lambda x: x.mode()[0],
-            }
-        )
-        .reset_index()
+    df = context.df
+    summary = context.employer_summary
+    employer_stats = pd.DataFrame(
+        {
+            "Employer": summary.index,
+            "Certifications": summary["COUNT"].to_numpy(),
+            "Mean Wage": summary["MEAN_WAGE"].to_numpy(),
+            "Wage Std Dev": summary["WAGE_STD"].to_numpy(),
+            "Avg Wage Ratio": summary["MEAN_WAGE_RATIO"].to_numpy(),
+            "Primary State": primary_values(df, "EMPLOYER_NAME", "WORKSITE_STATE")
+            .reindex(summary.index)
+            .to_numpy(),
+            "Primary SOC": primary_values(df, "EMPLOYER_NAME", "SOC_CODE")
+            .reindex(summary.index)
+            .to_numpy(),
+        }
     )
 
-    employer_stats.columns = [
-        "Employer",
-        "Certifications",
-        "Mean Wage",
-        "Median Wage",
-        "Wage Std Dev",
-        "Avg Wage Ratio",
-        "Primary State",
-        "Primary SOC",
-    ]
-
     employer_stats = employer_stats.sort_values("Certifications", ascending=False).head(
         15
     )
+
+    # Medians need the rows, so only compute them for the employers shown
+    top_df = df[df["EMPLOYER_NAME"].isin(employer_stats["Employer"])]
+    medians = grouped_stats(top_df, "EMPLOYER_NAME")[0.5]
+    employer_stats.insert(
+        3, "Median Wage", medians.reindex(employer_stats["Employer"]).to_numpy()
+    )
+
     total_certs = employer_stats["Certifications"].sum()
     employer_stats["Market Share"] = (
         employer_stats["Certifications"] / total_certs * 100
@@ -75,32 +83,36 @@ def create_employer_table(employer_stats):
     return fig
 
 
-def show_detailed_stats(df, employer_stats):
+@cached_aggregate
+def create_top_employers_wage_figure(df, employers):
+    """Create wage box plot for the given employers"""
+    fig = go.Figure()
+
+    for employer in employers:
+        employer_data = group_rows(df, "EMPLOYER_NAME", employer)
+        fig.add_traces(box_traces(box_summary(employer_data["ANNUAL_WAGE"]), employer))
+
+    fig.update_layout(
+        title="Wage Distribution for Top 5 Employers",
+        yaxis_title="Annual Wage ($)",
+        yaxis=dict(tickformat="$,.0f"),
+        height=400,
+        showlegend=True,
+    )
+    return fig
+
+
+def show_detailed_stats(context, employer_stats):
     """Show detailed statistics in expandable section"""
     with st.expander("View Additional Statistics"):
-        top_5_employers = employer_stats["Employer"].head().tolist()
-        fig = go.Figure()
-
-        for employer in top_5_employers:
-            employer_data = df[df["EMPLOYER_NAME"] == employer]
-            fig.add_trace(
-                go.Box(y=employer_data["ANNUAL_WAGE"], name=employer, boxpoints="all")
-            )
-
-        fig.update_layout(
-            title="Wage Distribution for Top 5 Employers",
-            yaxis_title="Annual Wage ($)",
-            yaxis=dict(tickformat="$,.0f"),
-            height=400,
-            showlegend=True,
-        )
-
+        top_5_employers = tuple(employer_stats["Employer"].head().tolist())
+        fig = create_top_employers_wage_figure(context.df, top_5_employers)
         st.plotly_chart(fig, use_container_width=True)
 
 
-def show_top_employers_table(df):
+def show_top_employers_table(context):
     """Display enhanced top employers table"""
-    employer_stats = calculate_employer_stats(df)
+    employer_stats = context.result(calculate_employer_stats)
     fig = create_employer_table(employer_stats)
     st.plotly_chart(fig, use_container_width=True)
-    show_detailed_stats(df, employer_stats)
+    show_detailed_stats(context, employer_stats)
@@ -1,24 +1,13 @@
 import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
+from utils.aggregate_cache import cached_aggregate
+from utils.chart_summaries import box_summary, box_traces
+from utils.grouped_stats import grouped_stats
 
 
-def show_wage_size_stats(df):
+def show_wage_size_stats(wage_stats, correlation):
     """Show detailed wage statistics by employer size"""
-    wage_stats = (
-        df.groupby("Size Category")
-        .agg({"ANNUAL_WAGE": ["mean", "median", "std", "count"], "WAGE_RATIO": "mean"})
-        .round(2)
-    )
-
-    wage_stats.columns = [
-        "Mean Wage",
-        "Median Wage",
-        "Wage Std Dev",
-        "Number of Certifications",
-        "Average Wage Ratio",
-    ]
-
     st.dataframe(
         wage_stats.style.format(
             {
@@ -31,15 +20,31 @@ def show_wage_size_stats(df):
         )
     )
 
-    correlation = df[["Employer Size", "ANNUAL_WAGE"]].corr().iloc[0, 1]
     st.write(f"Correlation between employer size and wages: {correlation:.3f}")
 
 
-def show_wage_by_employer_size(df):
-    """Display wage analysis by employer size"""
-    employer_sizes = df.groupby("EMPLOYER_NAME").size()
-    df = df.copy()  # Create a copy to avoid modifying the original
-    df["Employer Size"] = df["EMPLOYER_NAME"].map(employer_sizes)
+def calculate_wage_size_stats(df):
+    """Calculate wage statistics by employer size category"""
+    wages = grouped_stats(df, "Size Category", "ANNUAL_WAGE")
+    ratios = grouped_stats(df, "Size Category", "WAGE_RATIO", quantiles=())
+    wage_stats = pd.DataFrame(
+        {
+            "Mean Wage": wages["mean"],
+            "Median Wage": wages[0.5],
+            "Wage Std Dev": wages["std"],
+            "Number of Certifications": wages["count"],
+            "Average Wage Ratio": ratios["mean"],
+        }
+    ).round(2)
+
+    correlation = df[["Employer Size", "ANNUAL_WAGE"]].corr().iloc[0, 1]
+    return wage_stats, correlation
+
+
+@cached_aggregate
+def calculate_wage_by_employer_size(context):
+    """Calculate wage box plot and statistics by employer size"""
+    df = context.df.assign(**{"Employer Size": context.employer_sizes})
 
     size_bins = [0, 10, 50, 100, 500, float("inf")]
     size_labels = ["1-10", "11-50", "51-100", "101-500", "500+"]
@@ -50,7 +55,7 @@ def show_wage_by_employer_size(df):
     fig = go.Figure()
     for category in sorted(df["Size Category"].unique()):
         subset = df[df["Size Category"] == category]
-        fig.add_trace(go.Box(y=subset["ANNUAL_WAGE"], name=category, boxpoints="all"))
+        fig.add_traces(box_traces(box_summary(subset["ANNUAL_WAGE"]), category))
 
     fig.update_layout(
         title="Annual Wage Distribution by Employer Size",
@@ -59,5 +64,12 @@ def show_wage_by_employer_size(df):
         height=500,
         showlegend=False,
     )
+    wage_stats, correlation = calculate_wage_size_stats(df)
+    return fig, wage_stats, correlation
+
+
+def show_wage_by_employer_size(context):
+    """Display wage analysis by employer size"""
+    fig, wage_stats, correlation = context.result(calculate_wage_by_employer_size)
     st.plotly_chart(fig, use_container_width=True)
-    show_wage_size_stats(df)
+    show_wage_size_stats(wage_stats, correlation)
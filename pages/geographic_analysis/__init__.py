@@ -1,3 +1,3 @@
-from .main import show_geographic_analysis
+from .main import show_geographic_analysis, prefetch_geographic_analysis
 
-__all__ = ["show_geographic_analysis"]
+__all__ = ["show_geographic_analysis", "prefetch_geographic_analysis"]
@@ -1,40 +1,75 @@
 import streamlit as st
+from app_layout import show_sections, visible_sections
 from . import maps, tables, metrics
+from utils.aggregate_cache import cached_aggregate
 
 
-def show_geographic_analysis(df):
+@cached_aggregate
+def calculate_state_metrics(context):
+    """Calculate state overview metrics"""
+    counts = context.state_counts
+    return {
+        "states": len(counts),
+        "top_state": counts.idxmax(),
+        "top_state_pct": counts.max() / counts.sum() * 100,
+    }
+
+
+# Aggregations each section shows
+SECTION_AGGREGATES = {
+    "Certifications by State": [
+        maps.create_certification_map,
+        tables.calculate_state_stats,
+    ],
+    "Wage Analysis": [maps.create_wage_map, maps.create_wage_boxplot],
+    "Detailed Statistics": [metrics.calculate_detailed_stats],
+}
+
+
+def prefetch_geographic_analysis(context):
+    """Start computing the overview metrics and the visible sections"""
+    sections = visible_sections(SECTION_AGGREGATES, "geographic_section")
+    context.prefetch(
+        calculate_state_metrics,
+        *[func for section in sections for func in SECTION_AGGREGATES[section]],
+    )
+
+
+def show_geographic_analysis(context):
     """Display geographic analysis page content"""
     st.subheader("🗺️ Geographic Analysis")
+    prefetch_geographic_analysis(context)
 
     # Overview metrics
+    state_metrics = context.result(calculate_state_metrics)
     col1, col2 = st.columns(2)
     with col1:
         st.metric(
             "States with H-1B Certifications",
-            f"{df['WORKSITE_STATE'].nunique()}",
+            f"{state_metrics['states']}",
             help="Number of states with at least one H-1B certification",
         )
     with col2:
-        top_state = df["WORKSITE_STATE"].mode()[0]
-        top_state_pct = len(df[df["WORKSITE_STATE"] == top_state]) / len(df) * 100
         st.metric(
             "Top State",
-            f"{top_state} ({top_state_pct:.1f}%)",
+            f"{state_metrics['top_state']} ({state_metrics['top_state_pct']:.1f}%)",
             help="State with the most H-1B certifications",
         )
 
     # State-level analysis tabs
-    tab1, tab2, tab3 = st.tabs(
-        ["Certifications by State", "Wage Analysis", "Detailed Statistics"]
-    )
+    def show_certifications():
+        maps.show_certification_map(context)
+        tables.show_top_states_table(context)
 
-    with tab1:
-        maps.show_certification_map(df)
-        tables.show_top_states_table(df)
+    def show_wages():
+        maps.show_wage_map(context)
+        maps.show_wage_boxplot(context)
 
-    with tab2:
-        maps.show_wage_map(df)
-        maps.show_wage_boxplot(df)
-
-    with tab3:
-        metrics.show_detailed_stats(df)
+    show_sections(
+        {
+            "Certifications by State": show_certifications,
+            "Wage Analysis": show_wages,
+            "Detailed Statistics": lambda: metrics.show_detailed_stats(context),
+        },
+        key="geographic_section",
+    )
@@ -1,11 +1,22 @@
 import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
+from utils.aggregate_cache import cached_aggregate
+from utils.chart_summaries import box_summary, box_traces
+from utils.filter_index import group_rows
+from utils.wage_cube import wage_median
 
 
-def show_certification_map(df):
+def show_certification_map(context):
     """Display choropleth map of certifications by state"""
-    state_stats = df.groupby("WORKSITE_STATE").size().reset_index()
+    fig = context.result(create_certification_map)
+    st.plotly_chart(fig, use_container_width=True)
+
+
+@cached_aggregate
+def create_certification_map(context):
+    """Create choropleth map of certifications by state"""
+    state_stats = context.state_counts.reset_index()
     state_stats.columns = [
         "WORKSITE_STATE",
         "Certifications",
@@ -18,14 +29,20 @@ def show_certification_map(df):
         "Certifications",
         "blues",
     )
+    return fig
+
 
+def show_wage_map(context):
+    """Display choropleth map of median wages by state"""
+    fig = context.result(create_wage_map)
     st.plotly_chart(fig, use_container_width=True)
 
 
-def show_wage_map(df):
-    """Display choropleth map of median wages by state"""
+@cached_aggregate
+def create_wage_map(context):
+    """Create choropleth map of median wages by state"""
     state_wages = (
-        df.groupby("WORKSITE_STATE").agg({"ANNUAL_WAGE": "median"}).reset_index()
+        wage_median(context.df, by="WORKSITE_STATE").rename("ANNUAL_WAGE").reset_index()
     )
 
     fig = create_choropleth(
@@ -36,8 +53,7 @@ def show_wage_map(df):
         "blues",
         number_format="$,.0f",
     )
-
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 
 def create_choropleth(
@@ -59,21 +75,23 @@ def create_choropleth(
     return fig
 
 
-def show_wage_boxplot(df):
+def show_wage_boxplot(context):
     """Display wage box plot for top states"""
+    fig = context.result(create_wage_boxplot)
+    st.plotly_chart(fig, use_container_width=True)
+
+
+@cached_aggregate
+def create_wage_boxplot(context):
+    """Create wage box plot for top states"""
     # Get top 10 states by number of certifications
-    top_states = df["WORKSITE_STATE"].value_counts().head(10).index
+    top_states = context.state_counts.nlargest(10).index
 
     fig = go.Figure()
     for state in top_states:
-        state_data = df[df["WORKSITE_STATE"] == state]
-        fig.add_trace(
-            go.Box(
-                y=state_data["ANNUAL_WAGE"],
-                name=state,
-                boxpoints=False,  # Removed all points
-            )
-        )
+        state_data = group_rows(context.df, "WORKSITE_STATE", state)
+        summary = box_summary(state_data["ANNUAL_WAGE"], max_outliers=0)
+        fig.add_traces(box_traces(summary, state))
 
     fig.update_layout(
         title="Wage Distribution in Top 10 States",
@@ -82,5 +100,4 @@ def show_wage_boxplot(df):
         height=500,
         showlegend=False,
     )
-
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
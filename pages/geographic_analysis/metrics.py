@@ -1,11 +1,13 @@
 import streamlit as st
 import pandas as pd
+from utils.aggregate_cache import cached_aggregate
+from utils.wage_cube import wage_median
 
 
-def show_detailed_stats(df):
+def show_detailed_stats(context):
     """Display detailed statistics by state"""
     # Calculate comprehensive statistics
-    state_stats = calculate_detailed_stats(df)
+    state_stats = context.result(calculate_detailed_stats)
 
     # Display as interactive table
     st.dataframe(
@@ -23,28 +25,25 @@ def show_detailed_stats(df):
     )
 
 
-def calculate_detailed_stats(df):
+@cached_aggregate
+def calculate_detailed_stats(context):
     """Calculate detailed statistics for each state"""
-    state_stats = (
-        df.groupby("WORKSITE_STATE")
-        .agg(
-            {
-                "ANNUAL_WAGE": ["count", "mean", "median", "std"],
-                "WAGE_RATIO": "mean",
-                "EMPLOYER_NAME": "nunique",
-            }
-        )
-        .round(2)
-    )
+    df = context.df
+    summary = context.state_summary
 
-    state_stats.columns = [
-        "Certifications",
-        "Mean Wage",
-        "Median Wage",
-        "Wage Std Dev",
-        "Wage Ratio",
-        "Unique Employers",
-    ]
+    # Distinct counts do not roll up from the cube
+    employers = df.groupby("WORKSITE_STATE", observed=True)["EMPLOYER_NAME"].nunique()
+    state_stats = pd.DataFrame(
+        {
+            "Certifications": summary["COUNT"],
+            "Mean Wage": summary["MEAN_WAGE"],
+            "Median Wage": wage_median(df, by="WORKSITE_STATE"),
+            "Wage Std Dev": summary["WAGE_STD"],
+            "Wage Ratio": summary["MEAN_WAGE_RATIO"],
+            "Unique Employers": employers,
+        }
+    ).round(2)
+    state_stats.index.name = "WORKSITE_STATE"
 
     # Reset index and sort by number of certifications
     return state_stats.reset_index().sort_values("Certifications", ascending=False)
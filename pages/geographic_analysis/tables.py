@@ -1,18 +1,20 @@
 import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
+from utils.aggregate_cache import cached_aggregate
 
 
-def show_top_states_table(df):
+def show_top_states_table(context):
     """Display table of top states"""
-    state_stats = calculate_state_stats(df)
+    state_stats = context.result(calculate_state_stats)
     fig = create_state_table(state_stats)
     st.plotly_chart(fig, use_container_width=True)
 
 
-def calculate_state_stats(df):
+@cached_aggregate
+def calculate_state_stats(context):
     """Calculate statistics for each state"""
-    state_stats = df.groupby("WORKSITE_STATE").size().reset_index()
+    state_stats = context.state_counts.reset_index()
     state_stats.columns = ["State", "Certifications"]
 
     # Calculate percentage of total
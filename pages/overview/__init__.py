@@ -1,20 +1,35 @@
-from .wage_analysis import show_wage_analysis
-from .metrics import show_key_metrics
-from .job_analysis import show_top_jobs
+from .wage_analysis import (
+    show_wage_analysis,
+    calculate_wage_metrics,
+    plot_wage_distribution,
+)
+from .metrics import show_key_metrics, calculate_key_metrics
+from .job_analysis import show_top_jobs, calculate_job_stats
 import streamlit as st
 
 
-def show_overview(df):
+def prefetch_overview(context):
+    """Start computing the overview aggregates"""
+    context.prefetch(
+        calculate_key_metrics,
+        calculate_wage_metrics,
+        plot_wage_distribution,
+        calculate_job_stats,
+    )
+
+
+def show_overview(context):
     """Display overview page content"""
+    prefetch_overview(context)
     st.subheader("💰 Wage Analysis")
     # Key metrics section
-    show_key_metrics(df)
+    show_key_metrics(context)
 
     # Wage analysis section
-    show_wage_analysis(df)
+    show_wage_analysis(context)
 
     # Top job titles section
-    show_top_jobs(df)
+    show_top_jobs(context)
 
 
-__all__ = ["show_overview"]
+__all__ = ["show_overview", "prefetch_overview"]
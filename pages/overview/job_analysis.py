@@ -1,19 +1,30 @@
 import streamlit as st
 import plotly.graph_objects as go
+import pandas as pd
+from utils.aggregate_cache import cached_aggregate
+from utils.grouped_stats import grouped_stats
+
+
+@cached_aggregate
+def calculate_job_stats(context):
+    """Calculate statistics for the top 10 job titles"""
+    stats = grouped_stats(context.df, "JOB_TITLE")
+    job_stats = pd.DataFrame(
+        {
+            "Job Title": stats.index,
+            "Count": stats["count"].to_numpy(),
+            "Mean Wage": stats["mean"].to_numpy(),
+            "Median Wage": stats[0.5].to_numpy(),
+        }
+    )
+    return job_stats.sort_values("Count", ascending=True).tail(10)
 
 
-def show_top_jobs(df):
+def show_top_jobs(context):
     """Display top job titles analysis"""
     st.subheader("👨‍💼 Top Job Titles")
 
-    job_stats = (
-        df.groupby("JOB_TITLE")
-        .agg({"ANNUAL_WAGE": ["count", "mean", "median"]})
-        .reset_index()
-    )
-
-    job_stats.columns = ["Job Title", "Count", "Mean Wage", "Median Wage"]
-    job_stats = job_stats.sort_values("Count", ascending=True).tail(10)
+    job_stats = context.result(calculate_job_stats)
 
     fig = go.Figure(
         data=[
@@ -1,27 +1,40 @@
 import streamlit as st
+from utils.aggregate_cache import cached_aggregate
+from utils.wage_cube import wage_median
 
 
-def show_key_metrics(df):
+@cached_aggregate
+def calculate_key_metrics(context):
+    """Calculate headline metrics"""
+    return {
+        "certifications": context.totals["COUNT"],
+        "employers": len(context.employer_counts),
+        "median_wage": wage_median(context.df),
+    }
+
+
+def show_key_metrics(context):
     """Display key metrics in columns"""
+    metrics = context.result(calculate_key_metrics)
     col1, col2, col3 = st.columns(3)
 
     with col1:
         st.metric(
             "Total DOL Certifications",
-            f"{len(df):,}",
+            f"{metrics['certifications']:,}",
             help="Number of Labor Condition Applications (LCAs) certified by the Department of Labor",
         )
 
     with col2:
         st.metric(
             "Unique Employers",
-            f"{df['EMPLOYER_NAME'].nunique():,}",
+            f"{metrics['employers']:,}",
             help="Number of unique employers submitting certified LCAs",
         )
 
     with col3:
         st.metric(
             "Median Annual Wage",
-            f"${df['ANNUAL_WAGE'].median():,.0f}",
+            f"${metrics['median_wage']:,.0f}",
             help="Median annual wage across all certified applications",
         )
@@ -1,37 +1,47 @@
 import streamlit as st
 import plotly.graph_objects as go
+from utils.aggregate_cache import cached_aggregate
+from utils.visualizations import cdf_grid
+from utils.wage_cube import wage_median
 
 
-def show_wage_analysis(df):
+@cached_aggregate
+def calculate_wage_metrics(context):
+    """Calculate offered and prevailing wage metrics"""
+    summary = context.totals
+    return {
+        "mean_offered": summary["MEAN_WAGE"],
+        "median_offered": wage_median(context.df),
+        "mean_prevailing": summary["MEAN_PREVAILING_WAGE"],
+        "median_prevailing": wage_median(context.df, "ANNUAL_PREVAILING_WAGE"),
+        "above_prevailing": summary["ABOVE_PREVAILING_SHARE"] * 100,
+    }
+
+
+def show_wage_analysis(context):
     """Display wage analysis section"""
+    metrics = context.result(calculate_wage_metrics)
     col1, col2 = st.columns(2)
 
     with col1:
-        st.metric("Average Offered Wage", f"${df['ANNUAL_WAGE'].mean():,.0f}")
-        st.metric("Median Offered Wage", f"${df['ANNUAL_WAGE'].median():,.0f}")
+        st.metric("Average Offered Wage", f"${metrics['mean_offered']:,.0f}")
+        st.metric("Median Offered Wage", f"${metrics['median_offered']:,.0f}")
 
     with col2:
-        st.metric(
-            "Average Prevailing Wage", f"${df['ANNUAL_PREVAILING_WAGE'].mean():,.0f}"
-        )
-        st.metric(
-            "Median Prevailing Wage", f"${df['ANNUAL_PREVAILING_WAGE'].median():,.0f}"
-        )
-
-        above_prevailing = (
-            df["ANNUAL_WAGE"] > df["ANNUAL_PREVAILING_WAGE"]
-        ).mean() * 100
-        st.metric("% Above Prevailing Wage", f"{above_prevailing:.1f}%")
+        st.metric("Average Prevailing Wage", f"${metrics['mean_prevailing']:,.0f}")
+        st.metric("Median Prevailing Wage", f"${metrics['median_prevailing']:,.0f}")
+        st.metric("% Above Prevailing Wage", f"{metrics['above_prevailing']:.1f}%")
 
-    st.plotly_chart(plot_wage_distribution(df), use_container_width=True)
+    st.plotly_chart(context.result(plot_wage_distribution), use_container_width=True)
 
 
-def plot_wage_distribution(df):
+@cached_aggregate
+def plot_wage_distribution(context):
     """Create wage distribution plot"""
-    actual = df["ANNUAL_WAGE"].sort_values()
-    prevailing = df["ANNUAL_PREVAILING_WAGE"].sort_values()
-    n = len(df)
-    percentiles = [i / (n - 1) for i in range(n)]
+    df = context.df
+    # Both CDFs share one probability grid, so hover values stay aligned
+    percentiles, actual = cdf_grid(df["ANNUAL_WAGE"])
+    _, prevailing = cdf_grid(df["ANNUAL_PREVAILING_WAGE"])
 
     fig = go.Figure()
 
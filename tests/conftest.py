@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.data_processor import process_data
+
+SOC_CODES = {
+    "15-1252.00": "Software Developers",
+    "15-1211": "Computer Systems Analysts",
+    "11-1011.00": "Chief Executives",
+    "13-2011": "Accountants and Auditors",
+    "29-1141.01": "Acute Care Nurses",
+    "99-9999": None,
+}
+
+# Code whose title only appears after this many raw rows
+LATE_TITLE_CODE = "29-1141.01"
+LATE_TITLE_ROW = 150
+
+STATES = ["CA", "TX", "NY", "WA", "NJ", "IL", "VI", "GU"]
+STATE_WEIGHTS = [0.3, 0.2, 0.15, 0.12, 0.1, 0.1, 0.02, 0.01]
+
+UNITS = {"Year": 1, "Hour": 2080, "Month": 12, "Week": 52}
+
+
+def make_raw_rows(num_rows: int = 400, seed: int = 0) -> pd.DataFrame:
+    """Synthetic raw disclosure rows, as the raw readers return them"""
+    rng = np.random.default_rng(seed)
+    codes = rng.choice(list(SOC_CODES), num_rows, p=[0.3, 0.2, 0.1, 0.2, 0.15, 0.05])
+    titles = [SOC_CODES[code] for code in codes]
+    for i, code in enumerate(codes):
+        if code == LATE_TITLE_CODE and i < LATE_TITLE_ROW:
+            titles[i] = None
+
+    units = rng.choice(list(UNITS), num_rows, p=[0.7, 0.2, 0.05, 0.05])
+    annual = rng.lognormal(np.log(110_000), 0.35, num_rows).round(2)
+    wages = [
+        f"${wage / UNITS[unit]:,.2f}" if i % 3 == 0 else f"{wage / UNITS[unit]:.2f}"
+        for i, (wage, unit) in enumerate(zip(annual, units))
+    ]
+    prevailing = (annual * rng.uniform(0.8, 1.0, num_rows)).round(2)
+
+    # Skewed employer sizes, with employers of equal size
+    employers = [f"Employer {int(i):03d}" for i in rng.zipf(1.6, num_rows) % 60]
+
+    return pd.DataFrame(
+        {
+            "CASE_STATUS": rng.choice(
+                ["Certified", "Certified - Withdrawn", "Denied"],
+                num_rows,
+                p=[0.85, 0.1, 0.05],
+            ),
+            "FULL_TIME_POSITION": rng.choice(["Y", "N"], num_rows, p=[0.9, 0.1]),
+            "WAGE_UNIT_OF_PAY": units,
+            "PW_UNIT_OF_PAY": "Year",
+            "EMPLOYER_NAME": employers,
+            "JOB_TITLE": rng.choice(["Engineer", "Analyst", "Manager"], num_rows),
+            "SOC_CODE": codes,
+            "SOC_TITLE": titles,
+            "WORKSITE_STATE": rng.choice(STATES, num_rows, p=STATE_WEIGHTS),
+            "WAGE_RATE_OF_PAY_FROM": wages,
+            "PREVAILING_WAGE": [f"{wage:.2f}" for wage in prevailing],
+        }
+    )
+
+
+def canonical(df: pd.DataFrame) -> pd.DataFrame:
+    """Rows of a frame in a fixed order, with plain column types"""
+    plain = df.astype(
+        {
+            col: object
+            for col in df.columns
+            if isinstance(df[col].dtype, pd.CategoricalDtype)
+        }
+    )
+    return plain.sort_values(list(plain.columns)).reset_index(drop=True)
+
+
+@pytest.fixture
+def raw_rows() -> pd.DataFrame:
+    return make_raw_rows()
+
+
+@pytest.fixture
+def processed_rows(raw_rows) -> pd.DataFrame:
+    return process_data(raw_rows)
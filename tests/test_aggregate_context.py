@@ -0,0 +1,56 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from utils.aggregate_context import AggregateContext, _aggregate
+
+
+class BarrierContext(AggregateContext):
+    """Context whose aggregates only finish while computed together"""
+
+    def __init__(self, df: pd.DataFrame):
+        super().__init__(df)
+        self.barrier = threading.Barrier(2, timeout=5)
+        self.calls = 0
+
+    @_aggregate
+    def first(self) -> int:
+        self.barrier.wait()
+        return 1
+
+    @_aggregate
+    def second(self) -> int:
+        self.barrier.wait()
+        return 2
+
+    @_aggregate
+    def slow(self) -> int:
+        self.calls += 1
+        time.sleep(0.1)
+        return 3
+
+
+def test_different_aggregates_compute_concurrently():
+    context = BarrierContext(pd.DataFrame())
+    with ThreadPoolExecutor(2) as pool:
+        first = pool.submit(lambda: context.first)
+        second = pool.submit(lambda: context.second)
+        assert (first.result(), second.result()) == (1, 2)
+    assert context.stats() == {"computed": 2, "reused": 0}
+
+
+def test_same_aggregate_computes_once():
+    context = BarrierContext(pd.DataFrame())
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(lambda _: context.slow, range(4)))
+    assert results == [3] * 4
+    assert context.calls == 1
+    assert context.stats() == {"computed": 1, "reused": 3}
+
+
+def test_aggregates_depending_on_others(processed_rows):
+    context = AggregateContext(processed_rows)
+    counts = context.employer_counts
+    assert counts.equals(context.employer_summary["COUNT"])
+    assert context.computed == {"employer_counts": 1, "employer_summary": 1}
+    assert context.reused == {"employer_summary": 1}
@@ -0,0 +1,177 @@
+import http.server
+import json
+import os
+import threading
+import pytest
+import utils.downloader
+from utils.downloader import download_file, partial_path, validators_path
+
+DATA = bytes(range(256)) * 4000
+CHUNK_SIZE = 16 * 1024
+LAST_MODIFIED = "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+class FileHandler(http.server.BaseHTTPRequestHandler):
+    """Serves DATA with an ETag, honouring Range, If-Range and If-None-Match"""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == server.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        start = 0
+        byte_range = self.headers.get("Range")
+        if byte_range and self.headers.get("If-Range") == server.etag:
+            start = int(byte_range.removeprefix("bytes=").split("-")[0])
+            if start >= len(DATA):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(DATA)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {start}-{len(DATA) - 1}/{len(DATA)}"
+            )
+        else:
+            self.send_response(200)
+
+        body = DATA[start:]
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", server.etag)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.end_headers()
+        if server.drop_after is not None:
+            # Close the connection part way through the body, once
+            body, server.drop_after = body[: server.drop_after], None
+            self.wfile.write(body)
+            self.wfile.flush()
+            self.connection.shutdown(2)
+            return
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), FileHandler)
+    server.etag = '"v1"'
+    server.drop_after = None
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/data.xlsx"
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "data.xlsx")
+
+
+def write_partial(path, data, etag):
+    """Leave a partial download behind, as an interrupted one does"""
+    with open(partial_path(path), "wb") as f:
+        f.write(data)
+    with open(validators_path(partial_path(path)), "w") as f:
+        json.dump({"ETag": etag, "Last-Modified": LAST_MODIFIED}, f)
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def assert_downloaded(path):
+    assert read(path) == DATA
+    assert not os.path.exists(partial_path(path))
+    with open(validators_path(path)) as f:
+        assert json.load(f) == {"ETag": '"v1"', "Last-Modified": LAST_MODIFIED}
+
+
+def test_full_download(server, url, path):
+    progress = []
+    assert download_file(url, path, lambda *args: progress.append(args))
+
+    assert_downloaded(path)
+    assert progress[-1] == (len(DATA), len(DATA))
+    assert "Range" not in server.requests[0]
+
+
+def test_dropped_connection_resumes_with_range(server, url, path, monkeypatch):
+    monkeypatch.setattr(utils.downloader, "DOWNLOAD_CHUNK_SIZE", CHUNK_SIZE)
+    server.drop_after = 6 * CHUNK_SIZE
+    assert download_file(url, path)
+
+    assert_downloaded(path)
+    assert len(server.requests) == 2
+    assert server.requests[1]["Range"] == f"bytes={6 * CHUNK_SIZE}-"
+    assert server.requests[1]["If-Range"] == '"v1"'
+
+
+def test_partial_download_resumes(server, url, path):
+    write_partial(path, DATA[:300_000], '"v1"')
+    assert download_file(url, path)
+
+    assert_downloaded(path)
+    assert server.requests[0]["Range"] == "bytes=300000-"
+    assert server.requests[0]["If-Range"] == '"v1"'
+
+
+def test_changed_file_restarts_download(server, url, path):
+    # If-Range does not match, so the server sends the whole new file
+    write_partial(path, b"old version" * 1000, '"v0"')
+    assert download_file(url, path)
+
+    assert_downloaded(path)
+    assert server.requests[0]["If-Range"] == '"v0"'
+
+
+def test_unchanged_file_is_kept(server, url, path):
+    assert download_file(url, path)
+    mtime = os.path.getmtime(path)
+
+    assert not download_file(url, path)
+    assert os.path.getmtime(path) == mtime
+    assert_downloaded(path)
+    assert server.requests[1]["If-None-Match"] == '"v1"'
+    assert server.requests[1]["If-Modified-Since"] == LAST_MODIFIED
+
+
+def test_changed_file_is_downloaded_again(server, url, path):
+    with open(path, "wb") as f:
+        f.write(b"old version")
+    with open(validators_path(path), "w") as f:
+        json.dump({"ETag": '"v0"'}, f)
+
+    assert download_file(url, path)
+    assert_downloaded(path)
+
+
+def test_unsatisfiable_range_restarts_download(server, url, path):
+    write_partial(path, DATA + b"trailing garbage", '"v1"')
+    assert download_file(url, path)
+
+    assert_downloaded(path)
+    assert server.requests[0]["Range"] == f"bytes={len(DATA) + 16}-"
+    assert "Range" not in server.requests[1]
+
+
+def test_partial_file_without_validators_restarts_download(server, url, path):
+    with open(partial_path(path), "wb") as f:
+        f.write(b"unknown origin")
+    assert download_file(url, path)
+
+    assert_downloaded(path)
+    assert "Range" not in server.requests[0]
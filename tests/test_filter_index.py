@@ -0,0 +1,87 @@
+import itertools
+import numpy as np
+import pandas as pd
+import pytest
+from tests.conftest import make_raw_rows
+from utils.data_processor import compact_types, process_data
+from utils.filter_index import FilterIndex, select_rows
+
+
+def mask_filter(df, selected_soc, selected_state, wage_range):
+    """The boolean-mask filter the index replaces"""
+    mask = df["ANNUAL_WAGE"].between(wage_range[0], wage_range[1])
+    if selected_soc != "All":
+        mask &= df["SOC_CODE"] == selected_soc
+    if selected_state != "All":
+        mask &= df["WORKSITE_STATE"] == selected_state
+    return mask.to_numpy()
+
+
+def with_missing_values(df):
+    """Processed rows with missing wages, SOC codes and states"""
+    df = df.copy()
+    df.loc[df.index[::17], "ANNUAL_WAGE"] = np.nan
+    df.loc[df.index[3::23], "SOC_CODE"] = np.nan
+    df.loc[df.index[5::29], "WORKSITE_STATE"] = np.nan
+    return df
+
+
+FRAMES = {
+    "single period": lambda: process_data(make_raw_rows()),
+    "missing values": lambda: with_missing_values(process_data(make_raw_rows())),
+    "multi period": lambda: compact_types(
+        pd.concat(
+            [process_data(make_raw_rows(seed=1)), process_data(make_raw_rows(seed=2))],
+            ignore_index=True,
+        )
+    ),
+}
+
+
+def wage_ranges(df):
+    """Full, inclusive edge, open, empty and inverted wage ranges"""
+    wages = np.sort(df["ANNUAL_WAGE"].dropna().unique())
+    low, high = float(wages[0]), float(wages[-1])
+    return [
+        (low, high),
+        (float(wages[10]), float(wages[-10])),
+        (float(wages[10]), float(wages[10])),
+        (-np.inf, np.inf),
+        (0.0, low - 1),
+        (
+            float(np.nextafter(wages[10], np.inf)),
+            float(np.nextafter(wages[11], -np.inf)),
+        ),
+        (high, low),
+    ]
+
+
+@pytest.mark.parametrize("build", FRAMES.values(), ids=FRAMES.keys())
+def test_select_matches_mask_filter(build):
+    df = build()
+    index = FilterIndex(df)
+    socs = ["All", "15-1252", "99-9999", "00-0000"]
+    states = ["All", "CA", "GU", "ZZ"]
+
+    for soc, state, wage_range in itertools.product(socs, states, wage_ranges(df)):
+        expected = mask_filter(df, soc, state, wage_range)
+        rows = index.select(soc, state, wage_range)
+        if rows is None:
+            assert expected.all(), (soc, state, wage_range)
+        else:
+            np.testing.assert_array_equal(rows, np.flatnonzero(expected))
+
+        pd.testing.assert_frame_equal(select_rows(df, rows), df[expected])
+
+
+def test_all_rows_select_nothing_to_filter():
+    df = process_data(make_raw_rows())
+    wage_range = (df["ANNUAL_WAGE"].min(), df["ANNUAL_WAGE"].max())
+    assert FilterIndex(df).select("All", "All", wage_range) is None
+
+
+def test_missing_wages_never_match_the_full_range():
+    df = with_missing_values(process_data(make_raw_rows()))
+    rows = FilterIndex(df).select("All", "All", (-np.inf, np.inf))
+    assert rows is not None
+    assert not df["ANNUAL_WAGE"].iloc[rows].isna().any()
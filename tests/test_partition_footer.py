@@ -0,0 +1,109 @@
+import json
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+import utils.data_loader as data_loader
+from utils.data_validation import (
+    VALIDATION_METADATA_KEY,
+    quarantine_rows,
+    verify_footer,
+)
+from utils.dataset_store import (
+    PROCESSED_SCHEMA,
+    partition_path,
+    verify_partition,
+    write_partition,
+)
+from utils.pipeline_version import pipeline_metadata
+
+PERIOD = (2030, 1)
+
+
+@pytest.fixture
+def clean_rows(processed_rows):
+    df, _, _ = quarantine_rows(processed_rows)
+    return df
+
+
+@pytest.fixture
+def partition(clean_rows, tmp_path, monkeypatch):
+    """Path of a partition written from valid rows"""
+    monkeypatch.chdir(tmp_path)
+    write_partition(PERIOD, clean_rows, pipeline_metadata())
+    return partition_path(PERIOD)
+
+
+def rewrite(path, df, metadata):
+    """Replace a partition's rows, keeping the given footer metadata"""
+    table = pa.Table.from_pandas(df, schema=PROCESSED_SCHEMA, preserve_index=False)
+    pq.write_table(table.replace_schema_metadata(metadata), path)
+
+
+def tamper_record(path, df, change):
+    """Rewrite a partition with a changed validation record"""
+    metadata = dict(pq.read_schema(path).metadata)
+    record = json.loads(metadata[VALIDATION_METADATA_KEY])
+    change(record)
+    metadata[VALIDATION_METADATA_KEY] = json.dumps(record).encode()
+    rewrite(path, df, metadata)
+
+
+def test_written_partition_verifies(partition):
+    assert verify_footer(partition, PROCESSED_SCHEMA) is True
+    assert verify_partition(PERIOD)
+
+
+def test_footer_without_record_cannot_tell(partition, clean_rows):
+    metadata = dict(pq.read_schema(partition).metadata)
+    del metadata[VALIDATION_METADATA_KEY]
+    rewrite(partition, clean_rows, metadata)
+
+    assert verify_footer(partition, PROCESSED_SCHEMA) is None
+    # The rows are then checked instead
+    assert verify_partition(PERIOD)
+
+
+RECORD_CHANGES = {
+    "rows": lambda record: record.update(rows=record["rows"] + 1),
+    "max": lambda record: record["columns"]["ANNUAL_WAGE"].update(max=1e9),
+    "nulls": lambda record: record["columns"]["EMPLOYER_NAME"].update(nulls=1),
+    "schema": lambda record: record.update(schema="0" * 16),
+}
+
+
+@pytest.mark.parametrize("change", RECORD_CHANGES.values(), ids=RECORD_CHANGES)
+def test_tampered_record_fails(partition, clean_rows, change):
+    tamper_record(partition, clean_rows, change)
+    assert verify_footer(partition, PROCESSED_SCHEMA) is False
+    assert not verify_partition(PERIOD)
+
+
+def test_changed_rows_fail(partition, clean_rows):
+    metadata = pq.read_schema(partition).metadata
+
+    # One row fewer
+    rewrite(partition, clean_rows.iloc[1:], metadata)
+    assert verify_footer(partition, PROCESSED_SCHEMA) is False
+
+    # A wage out of range, under a record of valid rows
+    changed = clean_rows.copy()
+    changed.iloc[0, changed.columns.get_loc("ANNUAL_WAGE")] = 5.0
+    rewrite(partition, changed, metadata)
+    assert verify_footer(partition, PROCESSED_SCHEMA) is False
+
+
+def test_tampered_partition_is_rebuilt(partition, clean_rows, monkeypatch):
+    tamper_record(partition, clean_rows, RECORD_CHANGES["rows"])
+    built = []
+
+    def build_partition(period):
+        built.append(period)
+        write_partition(period, clean_rows, pipeline_metadata())
+        return True
+
+    monkeypatch.setattr(data_loader, "build_partition", build_partition)
+    df = data_loader.read_processed_data((PERIOD,))
+
+    assert built == [PERIOD]
+    assert df is not None and len(df) == len(clean_rows)
+    assert verify_footer(partition, PROCESSED_SCHEMA) is True
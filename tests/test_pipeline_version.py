@@ -0,0 +1,62 @@
+import pytest
+import utils.pipeline_version as pipeline_version
+from utils.data_processor import DERIVED_COLUMNS
+from utils.pipeline_version import derived_fingerprints
+
+
+@pytest.fixture(autouse=True)
+def clear_fingerprints():
+    yield
+    derived_fingerprints.cache_clear()
+
+
+def fingerprints():
+    """Fingerprints computed afresh, after any change to DERIVED_COLUMNS"""
+    derived_fingerprints.cache_clear()
+    return derived_fingerprints()
+
+
+def redefine(monkeypatch, column, **changes):
+    monkeypatch.setitem(
+        pipeline_version.DERIVED_COLUMNS,
+        column,
+        DERIVED_COLUMNS[column]._replace(**changes),
+    )
+
+
+def test_fingerprints_cover_derived_columns():
+    current = fingerprints()
+    assert list(current) == list(DERIVED_COLUMNS)
+    assert fingerprints() == current
+
+
+def test_new_version_changes_column_and_dependents(monkeypatch):
+    before = fingerprints()
+    redefine(
+        monkeypatch, "ANNUAL_WAGE", version=DERIVED_COLUMNS["ANNUAL_WAGE"].version + 1
+    )
+    after = fingerprints()
+
+    assert after["ANNUAL_WAGE"] != before["ANNUAL_WAGE"]
+    assert after["WAGE_RATIO"] != before["WAGE_RATIO"]
+    assert after["ANNUAL_PREVAILING_WAGE"] == before["ANNUAL_PREVAILING_WAGE"]
+
+
+def test_new_constants_change_column(monkeypatch):
+    before = fingerprints()
+    redefine(monkeypatch, "ANNUAL_PREVAILING_WAGE", constants=[{"Year": 1}])
+    after = fingerprints()
+
+    assert after["ANNUAL_PREVAILING_WAGE"] != before["ANNUAL_PREVAILING_WAGE"]
+    assert after["ANNUAL_WAGE"] == before["ANNUAL_WAGE"]
+
+
+def test_source_is_not_fingerprinted(monkeypatch):
+    before = fingerprints()
+
+    def annual_wage(df):
+        """Same computation, documented differently"""
+        return DERIVED_COLUMNS["ANNUAL_WAGE"].compute(df)
+
+    redefine(monkeypatch, "ANNUAL_WAGE", compute=annual_wage)
+    assert fingerprints() == before
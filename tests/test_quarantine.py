@@ -0,0 +1,105 @@
+import pandas as pd
+import pytest
+from tests.conftest import make_raw_rows
+from utils.data_processor import process_data
+from utils.data_validation import (
+    FAILED_RULES_COLUMN,
+    ROW_RULES,
+    quarantine_rows,
+    validate_data,
+)
+from utils.dataset_store import (
+    ingest_period,
+    partition_path,
+    quarantine_counts,
+    quarantine_path,
+    write_partition,
+    write_quarantine,
+)
+from utils.pipeline_version import pipeline_metadata
+
+PERIOD = (2030, 1)
+
+# Raw values making a row fail each rule, and the rules the row then fails
+BAD_ROWS = {
+    "low-wage": ({"WAGE_RATE_OF_PAY_FROM": "5.00"}, ["annual_wage_in_range"]),
+    "high-prevailing": (
+        {"PREVAILING_WAGE": "99999999.00"},
+        ["prevailing_wage_in_range"],
+    ),
+    "no-employer": ({"EMPLOYER_NAME": None}, ["employer_present"]),
+    "no-soc": ({"SOC_CODE": None, "SOC_TITLE": None}, ["soc_code_present"]),
+    "no-state": ({"WORKSITE_STATE": None}, ["state_present"]),
+    "low-wage-no-state": (
+        {"WAGE_RATE_OF_PAY_FROM": "5.00", "WORKSITE_STATE": None},
+        ["annual_wage_in_range", "state_present"],
+    ),
+}
+
+
+@pytest.fixture
+def raw_with_bad_rows() -> pd.DataFrame:
+    """Raw rows where each BAD_ROWS job title marks a row failing rules"""
+    raw = make_raw_rows()
+    for row, (job_title, (values, _)) in enumerate(BAD_ROWS.items()):
+        # A certified, full-time row with a valid yearly wage, then made bad
+        raw.loc[row, ["CASE_STATUS", "FULL_TIME_POSITION", "JOB_TITLE"]] = [
+            "Certified",
+            "Y",
+            job_title,
+        ]
+        raw.loc[row, ["WAGE_UNIT_OF_PAY", "WAGE_RATE_OF_PAY_FROM"]] = [
+            "Year",
+            "100000.00",
+        ]
+        for column, value in values.items():
+            raw.loc[row, column] = value
+    return raw
+
+
+def stream(raw, tmp_path):
+    source = tmp_path / "raw.feather"
+    raw.to_feather(source)
+    ingest_period(PERIOD, str(source))
+
+
+def in_memory(raw, tmp_path):
+    df, quarantined, counts = quarantine_rows(process_data(raw))
+    write_partition(PERIOD, df, pipeline_metadata())
+    write_quarantine(PERIOD, quarantined, counts)
+
+
+@pytest.mark.parametrize("ingest", [stream, in_memory])
+def test_rule_failures_are_quarantined(
+    raw_with_bad_rows, tmp_path, monkeypatch, ingest
+):
+    monkeypatch.chdir(tmp_path)
+    ingest(raw_with_bad_rows, tmp_path)
+
+    partition = pd.read_parquet(partition_path(PERIOD))
+    quarantined = pd.read_parquet(quarantine_path(PERIOD))
+
+    # Each bad row is set aside with the rules it fails
+    reasons = quarantined.set_index(quarantined["JOB_TITLE"].astype(str))[
+        FAILED_RULES_COLUMN
+    ]
+    assert reasons.sort_index().to_dict() == {
+        job_title: ",".join(rules) for job_title, (_, rules) in BAD_ROWS.items()
+    }
+    assert not partition["JOB_TITLE"].isin(list(BAD_ROWS)).any()
+
+    # Every other row stays in the partition, which passes every rule
+    processed = process_data(raw_with_bad_rows)
+    assert len(partition) == len(processed) - len(BAD_ROWS)
+    assert validate_data(partition)
+
+    rows, counts = quarantine_counts([PERIOD])
+    assert rows == len(BAD_ROWS)
+    assert counts == {
+        name: sum(name in rules for _, rules in BAD_ROWS.values()) for name in ROW_RULES
+    }
+
+
+def test_every_rule_is_exercised():
+    exercised = {rule for _, rules in BAD_ROWS.values() for rule in rules}
+    assert exercised == set(ROW_RULES)
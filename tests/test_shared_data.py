@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.shared_data import ReadOnlyDataFrame, share_frame
+
+
+@pytest.fixture
+def shared() -> ReadOnlyDataFrame:
+    df = pd.DataFrame(
+        {
+            "ANNUAL_WAGE": np.array([100_000.0, 120_000.0, np.nan], dtype="float32"),
+            "WORKSITE_STATE": pd.Categorical(["CA", "TX", "CA"]),
+        }
+    )
+    df.attrs["dataset_version"] = "v1"
+    return share_frame(df)
+
+
+MUTATIONS = {
+    "setitem": lambda df: df.__setitem__("NEW", 1),
+    "replace column": lambda df: df.__setitem__("ANNUAL_WAGE", 0.0),
+    "delitem": lambda df: df.__delitem__("ANNUAL_WAGE"),
+    "insert": lambda df: df.insert(0, "NEW", 1),
+    "pop": lambda df: df.pop("ANNUAL_WAGE"),
+    "loc": lambda df: df.loc.__setitem__((0, "ANNUAL_WAGE"), 1.0),
+    "iloc": lambda df: df.iloc.__setitem__((0, 0), 1.0),
+    "at": lambda df: df.at.__setitem__((0, "ANNUAL_WAGE"), 1.0),
+    "iat": lambda df: df.iat.__setitem__((0, 0), 1.0),
+    "fillna inplace": lambda df: df.fillna(0, inplace=True),
+    "drop inplace": lambda df: df.drop(columns="ANNUAL_WAGE", inplace=True),
+    "rename inplace": lambda df: df.rename(columns=str.lower, inplace=True),
+    "sort inplace": lambda df: df.sort_values("ANNUAL_WAGE", inplace=True),
+    "replace inplace": lambda df: df.replace(100_000.0, 0.0, inplace=True),
+    "set_index inplace": lambda df: df.set_index("WORKSITE_STATE", inplace=True),
+    "update": lambda df: df.update(pd.DataFrame({"ANNUAL_WAGE": [0.0]})),
+    "columns": lambda df: setattr(df, "columns", ["A", "B"]),
+    "index": lambda df: setattr(df, "index", [10, 11, 12]),
+    "column attribute": lambda df: setattr(df, "ANNUAL_WAGE", 0.0),
+}
+
+
+@pytest.mark.parametrize("mutate", MUTATIONS.values(), ids=MUTATIONS.keys())
+def test_mutations_raise(shared, mutate):
+    before = shared.copy()
+    with pytest.raises(TypeError):
+        mutate(shared)
+    pd.testing.assert_frame_equal(pd.DataFrame(shared), before)
+
+
+def test_buffers_are_read_only(shared):
+    with pytest.raises(ValueError):
+        shared["ANNUAL_WAGE"].to_numpy()[0] = 1.0
+    with pytest.raises(ValueError):
+        shared["WORKSITE_STATE"].cat.codes.to_numpy()[0] = 1
+
+
+def test_derived_frames_are_writeable(shared):
+    derived = shared[shared["WORKSITE_STATE"] == "CA"]
+    assert type(derived) is pd.DataFrame
+    derived["ANNUAL_WAGE"] = 0.0
+    derived.columns = ["A", "B"]
+    assert list(shared.columns) == ["ANNUAL_WAGE", "WORKSITE_STATE"]
+    assert shared["ANNUAL_WAGE"].iloc[0] == 100_000.0
+
+
+def test_attrs_are_kept(shared):
+    assert shared.attrs["dataset_version"] == "v1"
@@ -0,0 +1,55 @@
+import pandas as pd
+import pyarrow.parquet as pq
+from pandas.testing import assert_frame_equal
+from tests.conftest import LATE_TITLE_CODE, LATE_TITLE_ROW, canonical
+from utils.streaming_ingest import stream_ingest
+
+
+def ingest(tmp_path, raw_rows, chunk_size):
+    """Stream raw rows through a Feather file, returning the written rows"""
+    source = tmp_path / "raw.feather"
+    raw_rows.to_feather(source)
+    output = tmp_path / "processed.parquet"
+    rows_written = stream_ingest(str(source), str(output), chunk_size=chunk_size)
+    result = pd.read_parquet(output)
+    assert rows_written == len(result)
+    return result, pq.read_metadata(output)
+
+
+def test_stream_ingest_matches_process_data(tmp_path, raw_rows, processed_rows):
+    result, metadata = ingest(tmp_path, raw_rows, chunk_size=40)
+
+    assert metadata.num_row_groups > 1
+    assert_frame_equal(canonical(result), canonical(processed_rows))
+
+
+def test_late_titles_resolve_across_chunks(tmp_path, raw_rows):
+    late = raw_rows.index[raw_rows["SOC_CODE"] == LATE_TITLE_CODE]
+    # The code's untitled rows span several chunks but fit in the buffer
+    assert 1 < late[late < LATE_TITLE_ROW][-1] // 40 and len(late) < 2 * 40
+
+    result, _ = ingest(tmp_path, raw_rows, chunk_size=40)
+
+    titles = result.loc[result["SOC_CODE"] == "29-1141.01", "SOC_TITLE"]
+    assert titles.notna().all()
+    assert (result["SOC_CODE"] == "99-9999").any()
+    assert result.loc[result["SOC_CODE"] == "99-9999", "SOC_TITLE"].isna().all()
+
+
+def test_held_back_rows_are_bounded(tmp_path, raw_rows, processed_rows):
+    result, metadata = ingest(tmp_path, raw_rows, chunk_size=10)
+
+    # Rows still waiting for a title are flushed once 10 are held
+    flushed = result["SOC_CODE"].eq(LATE_TITLE_CODE) & result["SOC_TITLE"].isna()
+    assert flushed.any()
+    row_groups = [
+        metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)
+    ]
+    assert max(row_groups) < 2 * 10
+
+    # Apart from those titles, the rows are the same
+    untitled = ["SOC_TITLE"]
+    assert_frame_equal(
+        canonical(result.drop(columns=untitled)),
+        canonical(processed_rows.drop(columns=untitled)),
+    )
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pages.employer_analysis.top_employers import calculate_employer_stats
+from tests.conftest import make_raw_rows
+from utils.aggregate_context import AggregateContext
+from utils.data_processor import process_data
+from utils.wage_cube import primary_values
+
+TIED_EMPLOYER = "Employer Tied"
+
+
+@pytest.fixture(scope="module")
+def rows() -> pd.DataFrame:
+    raw = make_raw_rows(2000, seed=5)
+    # An employer with as many certifications in two states and two codes
+    tied = raw.index[-8:]
+    raw.loc[tied, "EMPLOYER_NAME"] = TIED_EMPLOYER
+    raw.loc[tied, "CASE_STATUS"] = "Certified"
+    raw.loc[tied, "FULL_TIME_POSITION"] = "Y"
+    raw.loc[tied, "WORKSITE_STATE"] = ["TX", "CA"] * 4
+    raw.loc[tied, "SOC_CODE"] = ["15-1211", "13-2011", "13-2011", "15-1211"] * 2
+    return process_data(raw)
+
+
+def groupby_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """Employer statistics computed per group from the rows, with modes"""
+    stats = df.groupby("EMPLOYER_NAME", observed=True).agg(
+        {
+            "ANNUAL_WAGE": ["count", "mean", "median", "std"],
+            "WAGE_RATIO": "mean",
+            "WORKSITE_STATE": lambda x: x.mode()[0],
+            "SOC_CODE": lambda x: x.mode()[0],
+        }
+    )
+    stats.columns = [
+        "Certifications",
+        "Mean Wage",
+        "Median Wage",
+        "Wage Std Dev",
+        "Avg Wage Ratio",
+        "Primary State",
+        "Primary SOC",
+    ]
+    stats.index = stats.index.astype(str)
+    return stats
+
+
+@pytest.mark.parametrize("column", ["WORKSITE_STATE", "SOC_CODE"])
+def test_primary_values_match_modes(rows, column):
+    primary = primary_values(rows, "EMPLOYER_NAME", column)
+    modes = rows.groupby("EMPLOYER_NAME", observed=True)[column].agg(
+        lambda x: x.mode()[0]
+    )
+    modes.index = modes.index.astype(str)
+
+    assert list(primary.index) == sorted(modes.index)
+    assert (primary.astype(str) == modes[primary.index].astype(str)).all()
+
+
+def test_tied_modes_go_to_the_smallest_value(rows):
+    state = primary_values(rows, "EMPLOYER_NAME", "WORKSITE_STATE")
+    soc = primary_values(rows, "EMPLOYER_NAME", "SOC_CODE")
+    assert state[TIED_EMPLOYER] == "CA"
+    assert soc[TIED_EMPLOYER] == "13-2011"
+
+
+def test_employer_stats_match_groupby(rows):
+    result = calculate_employer_stats(AggregateContext(rows))
+    expected = groupby_stats(rows)
+
+    # The most certified employers, in that order; ties may rank either way
+    counts = result["Certifications"].to_numpy()
+    assert len(result) == 15
+    assert (np.diff(counts) <= 0).all()
+    top_counts = expected["Certifications"].sort_values(ascending=False).head(15)
+    np.testing.assert_array_equal(counts, top_counts.to_numpy())
+
+    expected = expected.loc[result["Employer"].astype(str)]
+    for column in ["Mean Wage", "Median Wage", "Wage Std Dev", "Avg Wage Ratio"]:
+        np.testing.assert_allclose(
+            result[column].to_numpy(dtype=float),
+            expected[column].to_numpy(dtype=float),
+            rtol=1e-6,
+            err_msg=column,
+        )
+    for column in ["Primary State", "Primary SOC"]:
+        assert list(result[column].astype(str)) == list(expected[column].astype(str))
+    np.testing.assert_allclose(
+        result["Market Share"], counts / counts.sum() * 100, rtol=1e-12
+    )
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+import utils.wage_cube as wage_cube
+from tests.conftest import make_raw_rows
+from utils.data_constants import QUANTILE_RELATIVE_ACCURACY
+from utils.data_processor import process_data
+from utils.wage_cube import wage_median, wage_quantiles
+
+QUANTILES = [0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0]
+
+
+@pytest.fixture(scope="module")
+def rows() -> pd.DataFrame:
+    return process_data(make_raw_rows(6000, seed=3))
+
+
+def exact_quantiles(df, column, by=None):
+    """Quantiles as computed by pandas from the rows"""
+    if by is None:
+        return df[column].astype("float64").quantile(QUANTILES)
+    grouped = df.groupby(by, observed=True)[column]
+    return grouped.quantile(QUANTILES).astype("float64").unstack()
+
+
+def relative_errors(estimates, exact):
+    return (np.abs(np.asarray(estimates) - np.asarray(exact)) / np.asarray(exact)).max()
+
+
+@pytest.mark.parametrize("column", ["ANNUAL_WAGE", "ANNUAL_PREVAILING_WAGE"])
+def test_sketched_quantiles_within_accuracy(rows, column):
+    estimates = wage_quantiles(rows, column, QUANTILES, exact=False)
+    exact = exact_quantiles(rows, column)
+    assert list(estimates.index) == QUANTILES
+    assert relative_errors(estimates, exact) <= QUANTILE_RELATIVE_ACCURACY
+    # The extremes are the exact min and max kept per bin
+    assert estimates[0.0] == exact[0.0] and estimates[1.0] == exact[1.0]
+
+
+@pytest.mark.parametrize("by", ["WORKSITE_STATE", "SOC_CODE"])
+def test_sketched_group_quantiles_within_accuracy(rows, by):
+    estimates = wage_quantiles(rows, quantiles=QUANTILES, by=by, exact=False)
+    exact = exact_quantiles(rows, "ANNUAL_WAGE", by)
+    assert list(estimates.index) == list(exact.index.astype(str))
+    assert relative_errors(estimates, exact) <= QUANTILE_RELATIVE_ACCURACY
+
+
+def test_small_selections_are_exact(rows):
+    small = rows.iloc[:500]
+    pd.testing.assert_series_equal(
+        wage_quantiles(small, quantiles=QUANTILES),
+        exact_quantiles(small, "ANNUAL_WAGE"),
+    )
+    medians = wage_median(small, by="WORKSITE_STATE")
+    exact = exact_quantiles(small, "ANNUAL_WAGE", "WORKSITE_STATE")[0.5]
+    np.testing.assert_array_equal(medians.to_numpy(), exact.to_numpy())
+
+
+def test_smallest_groups_of_large_selections_are_exact(rows, monkeypatch):
+    monkeypatch.setattr(wage_cube, "QUANTILE_EXACT_MAX_ROWS", 1000)
+    sizes = rows.groupby("WORKSITE_STATE", observed=True).size().sort_values()
+    exact_states = sizes.index[sizes.cumsum() <= 1000].astype(str)
+    assert 0 < len(exact_states) < len(sizes)
+
+    medians = wage_median(rows, by="WORKSITE_STATE")
+    exact = exact_quantiles(rows, "ANNUAL_WAGE", "WORKSITE_STATE")[0.5]
+    exact.index = exact.index.astype(str)
+
+    pd.testing.assert_series_equal(
+        medians[exact_states], exact[exact_states], check_names=False
+    )
+    assert relative_errors(medians, exact[medians.index]) <= QUANTILE_RELATIVE_ACCURACY
+    # Larger groups are estimated from the sketch
+    assert (medians != exact[medians.index]).any()
+
+
+@pytest.mark.parametrize("exact", [None, True, False])
+def test_empty_selections(rows, exact):
+    empty = rows.iloc[:0]
+    assert np.isnan(wage_median(empty, exact=exact))
+    assert wage_median(empty, by="WORKSITE_STATE", exact=exact).empty
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.data_processor import standardize_soc_code, standardize_soc_codes
+from utils.wage_utils import annualize_wage, annualize_wages, clean_wage, clean_wages
+
+RAW_WAGES = [
+    "$1,000",
+    "1_000",
+    "inf",
+    "-inf",
+    " 85000.50 ",
+    "$120,000.00",
+    "not a wage",
+    "",
+    None,
+    np.nan,
+    42,
+    3.5,
+]
+
+UNITS = ["Hour", "Week", "Bi-Weekly", "Month", "Year", "Unknown", None, np.nan]
+
+SOC_CODES = [
+    "11-1011.00",
+    "11-1011.",
+    "11-1011",
+    "11-1011.01",
+    " 15-1252.00 ",
+    "15-1252.10",
+    None,
+    np.nan,
+]
+
+
+def assert_same_values(vectorized: pd.Series, expected: list) -> None:
+    """Compare element by element, with NaN equal to NaN"""
+    assert len(vectorized) == len(expected)
+    for actual, wanted in zip(vectorized.tolist(), expected):
+        if pd.isna(wanted):
+            assert pd.isna(actual)
+        else:
+            assert actual == wanted
+
+
+@pytest.mark.parametrize(
+    "wages",
+    [
+        pd.Series(RAW_WAGES, dtype=object),
+        pd.Series([1000, 2500, 70000]),
+        pd.Series([1000.5, np.nan, np.inf]),
+        pd.Series(["85,000", 90000, 1.5, None, "$1_000"], dtype=object),
+    ],
+    ids=["strings", "ints", "floats", "mixed"],
+)
+def test_clean_wages_matches_clean_wage(wages):
+    expected = [clean_wage(wage) for wage in wages]
+    result = clean_wages(wages)
+    assert result.dtype == "float64"
+    assert_same_values(result, expected)
+
+
+def test_annualize_wages_matches_annualize_wage():
+    wages = pd.Series([25.0, 1500.0, 3000.0, 8000.0, 100000.0, 5.0, 60000.0, np.nan])
+    df = pd.DataFrame({"WAGE_RATE_OF_PAY_FROM": wages, "WAGE_UNIT_OF_PAY": UNITS})
+    expected = [annualize_wage(row) for _, row in df.iterrows()]
+    assert_same_values(
+        annualize_wages(df["WAGE_RATE_OF_PAY_FROM"], df["WAGE_UNIT_OF_PAY"]), expected
+    )
+
+
+def test_annualize_wages_handles_categorical_units():
+    wages = pd.Series([20.0] * len(UNITS))
+    units = pd.Series(UNITS, dtype="category")
+    df = pd.DataFrame({"WAGE_RATE_OF_PAY_FROM": wages, "WAGE_UNIT_OF_PAY": units})
+    expected = [annualize_wage(row) for _, row in df.iterrows()]
+    assert_same_values(annualize_wages(wages, units), expected)
+
+
+def test_standardize_soc_codes_matches_standardize_soc_code():
+    codes = pd.Series(SOC_CODES, dtype=object)
+    expected = [standardize_soc_code(code) for code in codes]
+    assert_same_values(standardize_soc_codes(codes), expected)
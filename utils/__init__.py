@@ -3,10 +3,14 @@ from .data_constants import *
 from .wage_utils import *
 from .data_validation import validate_data
 from .data_processor import process_data
+from .dataset_store import list_periods, format_period, ingest_period
 
 __all__ = [
     "load_data",
     "get_soc_title",
     "process_data",
     "validate_data",
+    "list_periods",
+    "format_period",
+    "ingest_period",
 ]
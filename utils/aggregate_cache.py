@@ -0,0 +1,146 @@
+import functools
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+import pandas as pd
+import streamlit as st
+from .data_constants import AGGREGATE_CACHE_MAX_BYTES
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate memory held by a cached value in bytes"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+
+class AggregateCache:
+    """
+    Thread-safe LRU cache of page aggregates with a memory cap.
+
+    Entries are evicted least recently used first once their estimated total
+    size exceeds `max_bytes`. Values are shared by every session and must be
+    treated as read-only by callers.
+    """
+
+    def __init__(self, max_bytes: int = AGGREGATE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for `key`, computing and storing it on a miss.
+
+        Args:
+            key: Hashable cache key
+            compute: Function producing the value on a miss
+
+        Returns:
+            Any: Cached or freshly computed value
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+
+        value = compute()
+        size = _estimate_size(value)
+
+        with self._lock:
+            if key not in self._entries and size <= self.max_bytes:
+                self._entries[key] = (value, size)
+                self.total_bytes += size
+                while self.total_bytes > self.max_bytes:
+                    _, (_, evicted_size) = self._entries.popitem(last=False)
+                    self.total_bytes -= evicted_size
+                    self.evictions += 1
+
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current usage"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+            }
+
+    def clear(self) -> None:
+        """Drop all entries, keeping the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+
+@st.cache_resource
+def get_aggregate_cache() -> AggregateCache:
+    """Aggregate cache shared by all sessions"""
+    return AggregateCache()
+
+
+def filter_key(df: pd.DataFrame) -> Hashable:
+    """
+    Get the filter key of a filtered view, if it still applies.
+
+    `apply_filters` tags its result with the dataset version and the filter
+    values. pandas carries `attrs` over to derived frames, so the key is only
+    trusted while the frame still has the row count it was tagged with;
+    adding columns keeps it, taking a subset of rows drops it.
+
+    Args:
+        df: Filtered DataFrame
+
+    Returns:
+        Hashable: (dataset version, SOC, state, wage range), or None
+    """
+    key = df.attrs.get("filter_key")
+    if key is None or df.attrs.get("filter_rows") != len(df):
+        return None
+    return key
+
+
+def cached_aggregate(func: Callable) -> Callable:
+    """
+    Memoize a function of a filtered frame by its filter key.
+
+    The first argument is the frame or an `AggregateContext` of it; neither
+    is ever hashed. Further positional and keyword arguments must be
+    hashable and become part of the key. Frames without a valid filter key
+    are computed directly.
+    """
+
+    @functools.wraps(func)
+    def wrapper(source, *args, **kwargs):
+        df = source if isinstance(source, pd.DataFrame) else source.df
+        key = filter_key(df)
+        if key is None:
+            return func(source, *args, **kwargs)
+
+        cache_key = (
+            func.__module__,
+            func.__qualname__,
+            key,
+            args,
+            tuple(sorted(kwargs.items())),
+        )
+        return get_aggregate_cache().get_or_compute(
+            cache_key, lambda: func(source, *args, **kwargs)
+        )
+
+    return wrapper
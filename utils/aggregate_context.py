@@ -0,0 +1,166 @@
+import functools
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from .data_constants import SECTION_POOL_SIZE
+from .wage_cube import wage_summary
+
+# Thread attribute holding the ScriptRunContext Streamlit attaches to a thread
+_SCRIPT_RUN_CTX_ATTR = "streamlit_script_run_ctx"
+
+
+@st.cache_resource
+def get_section_pool() -> Optional[ThreadPoolExecutor]:
+    """Thread pool shared by all sessions, or None for serial execution"""
+    if SECTION_POOL_SIZE <= 1:
+        return None
+    return ThreadPoolExecutor(SECTION_POOL_SIZE, thread_name_prefix="section")
+
+
+def _aggregate(func: Callable[["AggregateContext"], Any]) -> property:
+    """Turn a method into a property computed once per context"""
+
+    @functools.wraps(func)
+    def getter(self: "AggregateContext") -> Any:
+        name = func.__name__
+        with self._lock:
+            if name in self._values:
+                self.reused[name] += 1
+                return self._values[name]
+            aggregate_lock = self._aggregate_locks.setdefault(name, threading.Lock())
+
+        # Only threads needing this aggregate wait for its computation; the
+        # context lock is held just to look up and store values
+        with aggregate_lock:
+            with self._lock:
+                if name in self._values:
+                    self.reused[name] += 1
+                    return self._values[name]
+            value = func(self)
+            with self._lock:
+                self._values[name] = value
+                self.computed[name] += 1
+            return value
+
+    return property(getter)
+
+
+class AggregateContext:
+    """
+    Aggregates of one filtered view, shared by every section of a rerun.
+
+    Created once per filtered view and passed to each `show_*` function, so
+    sections needing the same aggregate (e.g. certifications per state)
+    share one computation instead of each deriving it from the rows. Every
+    aggregate is computed on first access. Functions memoized with
+    `cached_aggregate` accept a context in place of its frame.
+
+    Given a thread pool (see `get_section_pool`), section aggregations
+    (functions of the context) can be submitted to it with `prefetch` before
+    any section renders; `result` then waits for them in page order. Most of
+    their work happens in pandas and NumPy routines that release the GIL, so
+    independent sections overlap.
+
+    `computed` and `reused` count accesses per aggregate; each reuse is a
+    computation the context saved.
+    """
+
+    def __init__(self, df: pd.DataFrame, pool: Optional[ThreadPoolExecutor] = None):
+        self.df = df
+        self.pool = pool
+        self.computed: Counter = Counter()
+        self.reused: Counter = Counter()
+        self._values: Dict[str, Any] = {}
+        self._futures: Dict[Callable, Future] = {}
+        self._aggregate_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def prefetch(self, *funcs: Callable[["AggregateContext"], Any]) -> None:
+        """
+        Start computing section aggregations on the thread pool.
+
+        Does nothing without a pool; functions already submitted are skipped.
+
+        Args:
+            *funcs: Functions taking the context, e.g. `cached_aggregate`
+                functions of the page sections about to render
+        """
+        if self.pool is None:
+            return
+
+        # Workers take the session's script context, which Streamlit caches
+        # and widgets look up, only while running its function: pool threads
+        # serve every session, so they must not keep it for the next one
+        script_run_ctx = get_script_run_ctx(suppress_warning=True)
+
+        def run(func: Callable[["AggregateContext"], Any]) -> Any:
+            thread = threading.current_thread()
+            previous_ctx = getattr(thread, _SCRIPT_RUN_CTX_ATTR, None)
+            if script_run_ctx is not None:
+                add_script_run_ctx(thread, script_run_ctx)
+            try:
+                return func(self)
+            finally:
+                setattr(thread, _SCRIPT_RUN_CTX_ATTR, previous_ctx)
+
+        with self._lock:
+            for func in funcs:
+                if func not in self._futures:
+                    self._futures[func] = self.pool.submit(run, func)
+
+    def result(self, func: Callable[["AggregateContext"], Any]) -> Any:
+        """
+        Get a section aggregation, waiting for it if it was prefetched.
+
+        Args:
+            func: Function taking the context
+
+        Returns:
+            Any: Result of `func(self)`
+        """
+        future = self._futures.get(func)
+        if future is None:
+            return func(self)
+        return future.result()
+
+    @_aggregate
+    def totals(self) -> pd.Series:
+        """Count and wage statistics of the whole view, see `wage_summary`"""
+        return wage_summary(self.df)
+
+    @_aggregate
+    def state_summary(self) -> pd.DataFrame:
+        """Count and wage statistics per state"""
+        return wage_summary(self.df, by="WORKSITE_STATE")
+
+    @_aggregate
+    def state_counts(self) -> pd.Series:
+        """Certifications per state"""
+        return self.state_summary["COUNT"]
+
+    @_aggregate
+    def employer_summary(self) -> pd.DataFrame:
+        """Count and wage statistics per employer"""
+        return wage_summary(self.df, by="EMPLOYER_NAME")
+
+    @_aggregate
+    def employer_counts(self) -> pd.Series:
+        """Certifications per employer"""
+        return self.employer_summary["COUNT"]
+
+    @_aggregate
+    def employer_sizes(self) -> np.ndarray:
+        """Certifications of each row's employer, aligned with the rows"""
+        return self.employer_counts.reindex(self.df["EMPLOYER_NAME"]).to_numpy()
+
+    def stats(self) -> Dict[str, int]:
+        """Number of aggregates computed and of reuses that saved a computation"""
+        return {
+            "computed": sum(self.computed.values()),
+            "reused": sum(self.reused.values()),
+        }
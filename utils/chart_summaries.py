@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from typing import Any, Dict, List
+from .data_constants import BOX_MAX_OUTLIERS, HISTOGRAM_BINS
+
+
+def box_summary(
+    values: pd.Series, max_outliers: int = BOX_MAX_OUTLIERS
+) -> Dict[str, Any]:
+    """
+    Compute the statistics a box plot draws.
+
+    Whiskers end at the most extreme values within 1.5 IQR of the quartiles,
+    as in Plotly. Values beyond them are outliers; at most `max_outliers` of
+    them are kept, spread evenly over their sorted order and always
+    including the most extreme ones.
+
+    Args:
+        values: Values to summarize; missing values are ignored
+        max_outliers: Maximum number of outliers to keep
+
+    Returns:
+        Dict[str, Any]: count, mean, q1, median, q3, lowerfence, upperfence
+            and outliers (np.ndarray); only count and outliers if there is no
+            data
+    """
+    values = np.sort(values.dropna().to_numpy(dtype="float64"))
+    if len(values) == 0:
+        return {"count": 0, "outliers": values}
+
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    lowerfence, upperfence = inside[0], inside[-1]
+
+    outliers = values[(values < lowerfence) | (values > upperfence)]
+    if len(outliers) > max_outliers:
+        if max_outliers > 0:
+            keep = np.linspace(0, len(outliers) - 1, max_outliers).round()
+            outliers = outliers[np.unique(keep.astype(int))]
+        else:
+            outliers = outliers[:0]
+
+    return {
+        "count": len(values),
+        "mean": values.mean(),
+        "q1": q1,
+        "median": median,
+        "q3": q3,
+        "lowerfence": lowerfence,
+        "upperfence": upperfence,
+        "outliers": outliers,
+    }
+
+
+def box_traces(summary: Dict[str, Any], name: str, **box_kwargs) -> List[Any]:
+    """
+    Build the traces drawing one box from its summary.
+
+    Args:
+        summary: Result of `box_summary`
+        name: Category name, used as x position and trace name
+        **box_kwargs: Further `go.Box` properties
+
+    Returns:
+        List[Any]: The box, plus a marker trace of its outliers if any
+    """
+    if summary["count"] == 0:
+        return []
+
+    traces = [
+        go.Box(
+            x=[name],
+            name=name,
+            q1=[summary["q1"]],
+            median=[summary["median"]],
+            q3=[summary["q3"]],
+            lowerfence=[summary["lowerfence"]],
+            upperfence=[summary["upperfence"]],
+            mean=[summary["mean"]],
+            legendgroup=name,
+            **box_kwargs,
+        )
+    ]
+    if len(summary["outliers"]) > 0:
+        traces.append(
+            go.Scatter(
+                x=[name] * len(summary["outliers"]),
+                y=summary["outliers"],
+                name=name,
+                mode="markers",
+                marker=dict(size=4, opacity=0.5),
+                legendgroup=name,
+                showlegend=False,
+            )
+        )
+    return traces
+
+
+def histogram_summary(values: pd.Series, bins: int = HISTOGRAM_BINS) -> pd.DataFrame:
+    """
+    Count values in equal-width bins spanning their range.
+
+    Args:
+        values: Values to count; missing values are ignored
+        bins: Number of bins
+
+    Returns:
+        pd.DataFrame: left, right and count of each bin
+    """
+    values = values.dropna().to_numpy(dtype="float64")
+    if len(values) == 0:
+        return pd.DataFrame({"left": [], "right": [], "count": []})
+
+    counts, edges = np.histogram(values, bins=bins)
+    return pd.DataFrame({"left": edges[:-1], "right": edges[1:], "count": counts})
+
+
+def histogram_trace(histogram: pd.DataFrame, **bar_kwargs) -> go.Bar:
+    """
+    Build a bar trace drawing a pre-binned histogram.
+
+    Args:
+        histogram: Result of `histogram_summary`
+        **bar_kwargs: Further `go.Bar` properties
+
+    Returns:
+        go.Bar: Bars spanning each bin
+    """
+    return go.Bar(
+        x=(histogram["left"] + histogram["right"]) / 2,
+        y=histogram["count"],
+        width=histogram["right"] - histogram["left"],
+        **bar_kwargs,
+    )
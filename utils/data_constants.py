@@ -1,10 +1,43 @@
+import os
 from typing import List, Dict
 
 # File paths and URLs
 DATA_PATH = "data"
-PROCESSED_DATA_FILE = "processed_h1b_data.parquet"
-RAW_DATA_FILE = "raw_h1b_data.xlsx"
-DATA_URL = "https://www.dol.gov/sites/dolgov/files/ETA/oflc/pdfs/LCA_Disclosure_Data_FY2024_Q1.xlsx"
+DATASET_DIR = "lca"  # Hive-partitioned processed dataset under DATA_PATH
+PROCESSED_DATA_FILE = "part-0.parquet"  # Processed file within each partition
+ARROW_CACHE_FILE = "part-0.arrow"  # Memory-mappable copy next to each Parquet file
+BUILD_LOCK_FILE = ".build.lock"  # Held while a partition's files are (re)built
+CUBE_FILE = "cube.parquet"  # Pre-aggregated cube stored with each partition
+SKETCH_FILE = "sketch.parquet"  # Quantile sketches stored with each partition
+EMPLOYER_CUBE_FILE = "employers.parquet"  # Employer-level cube of each partition
+SOC_DIMENSION_FILE = "dim_soc.parquet"  # SOC codes and titles of each partition
+STATE_DIMENSION_FILE = "dim_state.parquet"  # Worksite states of each partition
+EMPLOYER_DIMENSION_FILE = "dim_employer.parquet"  # Employers of each partition
+QUARANTINE_FILE = "quarantine.parquet"  # Rows of each partition failing row rules
+RAW_DATA_FILE = "LCA_Disclosure_Data_FY{fiscal_year}_Q{quarter}.xlsx"
+DATA_URL = "https://www.dol.gov/sites/dolgov/files/ETA/oflc/pdfs/" + RAW_DATA_FILE
+
+# Version of the raw-to-processed pipeline, recorded in each processed file.
+# Bump it after changing how raw rows are read, filtered or cleaned, so
+# partitions are re-ingested. Derived columns (ANNUAL_WAGE, WAGE_RATIO, ...)
+# have their own versions in DERIVED_COLUMNS and are recomputed without
+# re-ingesting.
+PIPELINE_VERSION = 1
+
+# Raw workbook downloads
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # Bytes read and written at a time
+DOWNLOAD_TIMEOUT = (10, 60)  # Seconds to connect, and to wait for more data
+DOWNLOAD_RETRIES = 3  # Resumed attempts after a dropped connection
+REFRESH_RAW_DATA = True  # Revalidate downloaded workbooks with the source on load
+
+# Fiscal periods as (fiscal year, quarter); partitions are keyed by both
+PARTITION_KEYS = ["fiscal_year", "quarter"]
+
+# Sort order of the rows in each partition's Arrow cache, so that each
+# employer's rows (and each employer's rows per state) are contiguous
+CLUSTER_COLUMNS = ["EMPLOYER_NAME", "WORKSITE_STATE"]
+DEFAULT_PERIOD = (2024, 1)
+PUBLISHED_PERIODS = [(2024, 1), (2024, 2), (2024, 3), (2024, 4)]
 
 # Column definitions
 STRING_COLUMNS = [
@@ -36,6 +69,84 @@ COLUMNS_TO_KEEP = [
     "WORKSITE_STATE",
 ]
 
+# Numeric columns of the processed data; all other kept columns are strings
+NUMERIC_COLUMNS = [
+    "WAGE_RATE_OF_PAY_FROM",
+    "PREVAILING_WAGE",
+    "ANNUAL_WAGE",
+    "ANNUAL_PREVAILING_WAGE",
+    "WAGE_RATIO",
+]
+
+# Repeated string columns held as categoricals (dictionary-encoded in Parquet)
+CATEGORICAL_COLUMNS = [
+    "EMPLOYER_NAME",
+    "JOB_TITLE",
+    "SOC_CODE",
+    "SOC_TITLE",
+    "WAGE_UNIT_OF_PAY",
+    "PW_UNIT_OF_PAY",
+    "WORKSITE_STATE",
+]
+WAGE_DTYPE = "float32"  # Storage type of NUMERIC_COLUMNS; ample for dollar amounts
+
+# Streaming ingest settings
+STREAMING_INGEST = True  # Stream the workbook in chunks instead of read_excel
+INGEST_CHUNK_SIZE = 50_000  # Raw rows per chunk / Parquet row group
+RAW_READER_ENGINE = None  # None picks the fastest installed reader per file type
+
+# Aggregation cube: wage measures per (SOC, state, wage bucket) cell
+CUBE_DIMENSIONS = ["SOC_CODE", "WORKSITE_STATE", "WAGE_BUCKET"]
+CUBE_MEASURES = [
+    "COUNT",
+    "WAGE_SUM",
+    "WAGE_SUMSQ",
+    "WAGE_MIN",
+    "WAGE_MAX",
+    "PREVAILING_SUM",
+    "RATIO_SUM",
+    "ABOVE_PREVAILING",
+]
+WAGE_BUCKET_WIDTH = 10_000  # Annual wage dollars per bucket
+EMPLOYER_CUBE_DIMENSIONS = ["EMPLOYER_NAME"] + CUBE_DIMENSIONS
+
+# Dimension tables: one row per distinct key with its descriptive columns,
+# row count and wage range. The first column of each file is its key.
+DIMENSION_TABLES = {
+    SOC_DIMENSION_FILE: ["SOC_CODE", "SOC_TITLE"],
+    STATE_DIMENSION_FILE: ["WORKSITE_STATE"],
+    EMPLOYER_DIMENSION_FILE: ["EMPLOYER_NAME"],
+}
+
+# Quantile sketches of each cube cell, for medians and percentiles
+SKETCH_COLUMNS = ["ANNUAL_WAGE", "ANNUAL_PREVAILING_WAGE"]
+SKETCH_KEYS = CUBE_DIMENSIONS + ["MEASURE", "SKETCH_BIN"]
+# Sketch quantiles are within 0.1% of exact; delete stored sketches after changing it
+QUANTILE_RELATIVE_ACCURACY = 0.001
+QUANTILE_EXACT_MAX_ROWS = 20_000  # Smaller selections use exact quantiles
+
+# Number of points of plotted cumulative distributions, whatever the row count
+CDF_GRID_POINTS = 1_001
+
+# Server-side chart summaries
+BOX_MAX_OUTLIERS = 200  # Outlier points drawn per box
+HISTOGRAM_BINS = 50
+
+# Number of largest employers offered in the employer drill-down
+DRILLDOWN_MAX_EMPLOYERS = 1_000
+
+# Render only the selected section of each group of tabs, behind a section
+# selector, instead of computing every tab on each rerun
+LAZY_SECTIONS = True
+
+# Worker threads computing the aggregates of independent sections
+# concurrently, one per core up to the sections of a page; 1 (a single
+# core) computes each one when its section renders
+SECTION_POOL_SIZE = min(4, os.cpu_count() or 1)
+
+# Memory cap of the shared cache of page aggregates and figures
+AGGREGATE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
 # Wage multipliers for different pay periods
 WAGE_MULTIPLIERS = {
     "hour": 40 * 52,  # 40 hours per week, 52 weeks per year
@@ -49,3 +160,4 @@ WAGE_MULTIPLIERS = {
 MIN_WAGE = 10_000
 MAX_WAGE = 10_000_000
 MIN_ROWS = 100
+FULL_VALIDATION = False  # Check every row on load instead of the Parquet footers
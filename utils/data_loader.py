@@ -1,17 +1,38 @@
 import pandas as pd
 import streamlit as st
-import requests
 import os
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from .data_constants import (
     DATA_PATH,
-    PROCESSED_DATA_FILE,
-    RAW_DATA_FILE,
-    DATA_URL,
-    STRING_COLUMNS,
+    DEFAULT_PERIOD,
+    STREAMING_INGEST,
+    REFRESH_RAW_DATA,
 )
 from .data_processor import process_data
-from .data_validation import validate_data, validate_raw_data
+from .downloader import download_file
+from .data_validation import quarantine_rows, validate_data, validate_raw_data
+from .dimensions import soc_titles
+from .pipeline_version import pipeline_metadata
+from .dataset_store import (
+    Period,
+    data_url,
+    dataset_version,
+    format_period,
+    ingest_period,
+    partition_lock,
+    partition_path,
+    quarantine_counts,
+    raw_data_path,
+    read_partitions,
+    refresh_derived_columns,
+    stale_columns,
+    verify_partition,
+    write_aggregates,
+    write_partition,
+    write_quarantine,
+)
+from .raw_readers import get_reader
+from .shared_data import ReadOnlyDataFrame, share_frame
 
 
 def ensure_data_directory() -> None:
@@ -20,84 +41,282 @@ def ensure_data_directory() -> None:
         os.makedirs(DATA_PATH)
 
 
-def download_raw_data() -> bool:
+def _download(period: Period) -> bool:
+    """Download a period's workbook, showing progress once data arrives"""
+    progress_bars = []
+
+    def show_progress(received: int, total: Optional[int]) -> None:
+        if not progress_bars:
+            st.info(
+                f"Downloading LCA data for {format_period(period)}... "
+                "This may take a moment."
+            )
+            progress_bars.append(st.progress(0.0))
+        if total:
+            progress_bars[0].progress(
+                min(received / total, 1.0),
+                text=f"{received / 1e6:,.0f} of {total / 1e6:,.0f} MB",
+            )
+
+    try:
+        ensure_data_directory()
+        return download_file(data_url(period), raw_data_path(period), show_progress)
+    finally:
+        for progress_bar in progress_bars:
+            progress_bar.empty()
+
+
+def download_raw_data(period: Period = DEFAULT_PERIOD) -> bool:
     """
-    Download the raw data file.
+    Download the raw data file for a period.
+
+    The workbook is streamed to disk and resumed if the connection drops;
+    an already downloaded workbook is only fetched again if it changed,
+    see `download_file`.
+
+    Args:
+        period: Fiscal period (fiscal year, quarter) to download
 
     Returns:
         bool: True if download was successful, False otherwise
     """
-    st.info("Downloading LCA data... This may take a moment.")
     try:
-        response = requests.get(DATA_URL, timeout=60)
-        response.raise_for_status()
-
-        ensure_data_directory()
-        raw_data_path = os.path.join(DATA_PATH, RAW_DATA_FILE)
-
-        with open(raw_data_path, "wb") as f:
-            f.write(response.content)
-
+        _download(period)
         return True
     except Exception as e:
         st.error(f"Error downloading data: {str(e)}")
         return False
 
 
-@st.cache_data
-def load_data() -> Optional[pd.DataFrame]:
+def refresh_raw_data(period: Period) -> bool:
     """
-    Load or download the H1B data.
+    Fetch a period's downloaded workbook again if it changed at the source.
+
+    The request is conditional, so an unchanged workbook costs one round
+    trip. A changed workbook no longer matches the fingerprint recorded in
+    its partition, so `refresh_partition` then ingests it again. Does
+    nothing unless REFRESH_RAW_DATA is set and the workbook was downloaded.
+    If the source cannot be reached, the workbook on disk is kept.
+
+    Args:
+        period: Fiscal period (fiscal year, quarter) to refresh
 
     Returns:
-        Optional[pd.DataFrame]: Processed DataFrame or None if error occurs
+        bool: True if a new workbook was downloaded
     """
-    processed_data_path = os.path.join(DATA_PATH, PROCESSED_DATA_FILE)
-    raw_data_path = os.path.join(DATA_PATH, RAW_DATA_FILE)
+    if not REFRESH_RAW_DATA or not os.path.exists(raw_data_path(period)):
+        return False
+    try:
+        return _download(period)
+    except Exception as e:
+        st.warning(
+            f"Could not check {format_period(period)} data for updates: {str(e)}"
+        )
+        return False
 
-    # Try to load processed data first
-    if os.path.exists(processed_data_path):
-        try:
-            df = pd.read_parquet(processed_data_path)
-            if validate_data(df):
-                return df
-        except Exception:
-            st.warning("Error reading processed data. Trying raw data...")
 
-    # Download raw data if needed
-    if not os.path.exists(raw_data_path):
-        if not download_raw_data():
-            return None
+def build_partition(period: Period) -> bool:
+    """
+    Build a period's processed partition from its raw data.
+
+    Only one process builds a period at a time. Processes and sessions
+    asking for the same period meanwhile wait for the build and then use
+    its partition instead of building their own.
+
+    Args:
+        period: Fiscal period (fiscal year, quarter) to build
+
+    Returns:
+        bool: True if the partition was built and is valid, False otherwise
+    """
+    stale_mtime = partition_mtime(period)
+    with partition_lock(period):
+        # Another process built the partition while this one waited
+        if partition_mtime(period) not in (None, stale_mtime):
+            return True
+        return _build_partition(period)
+
 
+def partition_mtime(period: Period) -> Optional[float]:
+    """Modification time of a period's processed file, None if missing"""
     try:
-        # Read raw data with explicit dtypes
-        df = pd.read_excel(raw_data_path, dtype={col: str for col in STRING_COLUMNS})
+        return os.path.getmtime(partition_path(period))
+    except OSError:
+        return None
 
-        if not validate_raw_data(df):
-            st.error("Raw data validation failed")
-            return None
 
-        # Process the data
-        processed_df = process_data(df)
+def _build_partition(period: Period) -> bool:
+    """Build a period's partition, holding its `partition_lock`"""
+    # Download raw data if needed
+    if not os.path.exists(raw_data_path(period)):
+        if not download_raw_data(period):
+            return False
 
-        if validate_data(processed_df):
-            # Save processed data
-            ensure_data_directory()
-            processed_df.to_parquet(processed_data_path)
-            return processed_df
+    processed_data_path = partition_path(period)
+    try:
+        if STREAMING_INGEST:
+            ingest_period(period)
+            processed_df = pd.read_parquet(processed_data_path)
         else:
-            st.error("Processed data validation failed")
-            return None
+            # Read only the raw columns the pipeline uses
+            df = get_reader(raw_data_path(period)).read(raw_data_path(period))
+
+            if not validate_raw_data(df):
+                st.error("Raw data validation failed")
+                return False
+
+            processed_df, quarantined, counts = quarantine_rows(process_data(df))
+            if validate_data(processed_df):
+                write_partition(
+                    period, processed_df, pipeline_metadata(raw_data_path(period))
+                )
+                write_quarantine(period, quarantined, counts)
+                write_aggregates(period, processed_df)
 
     except Exception as e:
         st.error(f"Error processing data: {str(e)}")
+        return False
+
+    if not validate_data(processed_df):
+        if os.path.exists(processed_data_path):
+            os.remove(processed_data_path)
+        st.error("Processed data validation failed")
+        return False
+
+    return True
+
+
+def refresh_partition(period: Period) -> bool:
+    """
+    Bring a period's partition up to date with its source and the pipeline.
+
+    A downloaded raw file is first refreshed from its source (see
+    `refresh_raw_data`). Partitions that are missing, or whose raw file or
+    pipeline changed, are built again; partitions whose derived column
+    definitions changed only get those columns recomputed. The whole refresh
+    holds the period's `partition_lock`, so no process reads the raw file
+    while another downloads it, or builds from it while it is replaced.
+
+    Args:
+        period: Fiscal period (fiscal year, quarter) to refresh
+
+    Returns:
+        bool: True if the partition is up to date, False otherwise
+    """
+    with partition_lock(period):
+        refresh_raw_data(period)
+        stale = stale_columns(period)
+        if stale:
+            try:
+                refresh_derived_columns(period)
+                stale = stale_columns(period)
+            except Exception as e:
+                st.warning(f"Error recomputing {', '.join(stale)}: {str(e)}")
+                stale = None
+
+        if stale is None:
+            return build_partition(period)
+        return True
+
+
+@st.cache_resource
+def load_data(
+    periods: Tuple[Period, ...] = (DEFAULT_PERIOD,)
+) -> Optional[ReadOnlyDataFrame]:
+    """
+    Load the H1B data for the selected periods, shared by all sessions.
+
+    The frame is cached as a resource, so every session and rerun gets the
+    same object rather than a copy. It is read-only; filter or copy it before
+    modifying anything. `df.attrs["dataset_version"]` identifies the loaded
+    data for caches of anything derived from it, and `df.attrs["periods"]`
+    records the loaded periods.
+
+    Args:
+        periods: Fiscal periods (fiscal year, quarter) to load
+
+    Returns:
+        Optional[ReadOnlyDataFrame]: Shared processed DataFrame or None if
+            error occurs
+    """
+    df = read_processed_data(periods)
+    if df is None:
         return None
 
+    df.attrs["dataset_version"] = dataset_version(periods)
+    df.attrs["periods"] = tuple(periods)
+    return share_frame(df)
+
+
+def read_processed_data(periods: Tuple[Period, ...]) -> Optional[pd.DataFrame]:
+    """
+    Read or build the processed data for the selected periods.
+
+    Only the partitions of the selected periods are read, so startup cost does
+    not grow with the number of periods kept on disk. Each partition is
+    checked by the fingerprints, validation record and row-group statistics
+    in its footer rather than by scanning its rows (see `stale_columns` and
+    `verify_partition`); set FULL_VALIDATION to check every row.
+
+    Args:
+        periods: Fiscal periods (fiscal year, quarter) to load
+
+    Returns:
+        Optional[pd.DataFrame]: Processed DataFrame or None if error occurs
+    """
+    for period in periods:
+        if not refresh_partition(period):
+            return None
+
+    # Try to load processed data first
+    try:
+        if all(verify_partition(period) for period in periods):
+            return read_partitions(periods)
+        st.warning("Processed data validation failed. Trying raw data...")
+    except Exception:
+        st.warning("Error reading processed data. Trying raw data...")
+
+    # Rebuild the selected partitions from raw data
+    for period in periods:
+        if not build_partition(period):
+            return None
+
+    df = read_partitions(periods)
+    if validate_data(df):
+        return df
+
+    st.error("Processed data validation failed")
+    return None
+
+
+@st.cache_data(max_entries=8)
+def _cached_quarantine_counts(
+    dataset_version: str, periods: Tuple[Period, ...]
+) -> Tuple[int, Dict[str, int]]:
+    """Count quarantined rows once per dataset version"""
+    return quarantine_counts(periods)
+
+
+def get_quarantine_counts(df: pd.DataFrame) -> Tuple[int, Dict[str, int]]:
+    """
+    Rows set aside while building the loaded data, see `quarantine_rows`.
+
+    Args:
+        df: DataFrame returned by `load_data`, or a filtered view of it
+
+    Returns:
+        Tuple[int, Dict[str, int]]: Number of quarantined rows, and of rows
+            failing each rule
+    """
+    return _cached_quarantine_counts(df.attrs["dataset_version"], df.attrs["periods"])
+
 
 def get_soc_title(df: pd.DataFrame, soc_code: str) -> str:
     """
     Get SOC title for a given SOC code.
 
+    Looked up in the SOC dimension table, see `dimension_table`.
+
     Args:
         df: DataFrame containing SOC data
         soc_code: SOC code to look up
@@ -108,5 +327,4 @@ def get_soc_title(df: pd.DataFrame, soc_code: str) -> str:
     if soc_code == "All":
         return ""
 
-    soc_titles = df[df["SOC_CODE"] == soc_code]["SOC_TITLE"].unique()
-    return soc_titles[0] if len(soc_titles) > 0 else ""
+    return soc_titles(df).get(soc_code, "")
@@ -1,6 +1,97 @@
+import numpy as np
 import pandas as pd
-from .data_constants import COLUMNS_TO_KEEP
-from .wage_utils import clean_wage, annualize_wage, calculate_wage_ratio
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple
+from .data_constants import (
+    COLUMNS_TO_KEEP,
+    WAGE_COLUMNS,
+    CATEGORICAL_COLUMNS,
+    NUMERIC_COLUMNS,
+    WAGE_DTYPE,
+    CUBE_DIMENSIONS,
+    CUBE_MEASURES,
+    WAGE_BUCKET_WIDTH,
+    EMPLOYER_CUBE_DIMENSIONS,
+    SKETCH_COLUMNS,
+    SKETCH_KEYS,
+    QUANTILE_RELATIVE_ACCURACY,
+    WAGE_MULTIPLIERS,
+)
+from .wage_utils import (
+    clean_wages,
+    annualize_wages,
+    calculate_wage_ratio,
+    wage_unit_multiplier,
+)
+
+# Matches codes whose decimal part is empty or all zeros, e.g. '11-1011.00'
+SOC_ZERO_DECIMAL_PATTERN = r"(?s)^([^.]*)\.0*(?:\..*)?$"
+
+# Ratio between consecutive sketch bin edges for QUANTILE_RELATIVE_ACCURACY
+SKETCH_GAMMA = (1 + QUANTILE_RELATIVE_ACCURACY) / (1 - QUANTILE_RELATIVE_ACCURACY)
+
+
+class DerivedColumn(NamedTuple):
+    """A processed column computed only from other processed columns"""
+
+    compute: Callable[[pd.DataFrame], pd.Series]
+    # Processed columns `compute` reads
+    inputs: List[str]
+    # Bump after changing how `compute` or the functions it calls compute
+    # the column, so partitions get it recomputed
+    version: int
+    # Constants the column is computed with, compared by value
+    constants: List[Any]
+
+
+def annual_wage(df: pd.DataFrame) -> pd.Series:
+    """Offered wage converted to an annual amount"""
+    return annualize_wages(df["WAGE_RATE_OF_PAY_FROM"], df["WAGE_UNIT_OF_PAY"])
+
+
+def annual_prevailing_wage(df: pd.DataFrame) -> pd.Series:
+    """Prevailing wage converted to an annual amount"""
+    return annualize_wages(df["PREVAILING_WAGE"], df["PW_UNIT_OF_PAY"])
+
+
+# Derived columns, in computation order. Partitions whose derived columns
+# were computed by other definitions get just those columns recomputed from
+# the stored ones, without re-reading the raw file.
+DERIVED_COLUMNS: Dict[str, DerivedColumn] = {
+    "ANNUAL_WAGE": DerivedColumn(
+        annual_wage,
+        ["WAGE_RATE_OF_PAY_FROM", "WAGE_UNIT_OF_PAY"],
+        1,
+        [WAGE_MULTIPLIERS],
+    ),
+    "ANNUAL_PREVAILING_WAGE": DerivedColumn(
+        annual_prevailing_wage,
+        ["PREVAILING_WAGE", "PW_UNIT_OF_PAY"],
+        1,
+        [WAGE_MULTIPLIERS],
+    ),
+    "WAGE_RATIO": DerivedColumn(
+        calculate_wage_ratio, ["ANNUAL_WAGE", "ANNUAL_PREVAILING_WAGE"], 1, []
+    ),
+}
+
+
+def derive_columns(df: pd.DataFrame, columns: Iterable[str]) -> pd.DataFrame:
+    """
+    Compute derived columns of processed rows.
+
+    Args:
+        df: Processed DataFrame holding the columns' inputs
+        columns: Columns of DERIVED_COLUMNS to (re)compute
+
+    Returns:
+        pd.DataFrame: Copy of `df` with the columns (re)computed
+    """
+    columns = set(columns)
+    df = df.copy()
+    for column, derived in DERIVED_COLUMNS.items():
+        if column in columns:
+            df[column] = derived.compute(df)
+    return df
 
 
 def standardize_soc_code(soc_code: str) -> str:
@@ -24,6 +115,299 @@ def standardize_soc_code(soc_code: str) -> str:
     return soc_str
 
 
+def standardize_soc_codes(soc_codes: pd.Series) -> pd.Series:
+    """
+    Vectorized equivalent of `standardize_soc_code` for a whole column.
+
+    Args:
+        soc_codes: Series of raw SOC codes
+
+    Returns:
+        pd.Series: Series of standardized SOC codes
+    """
+    present = soc_codes.notna()
+    result = soc_codes.copy()
+    result[present] = (
+        soc_codes[present]
+        .astype(str)
+        .str.strip()
+        .str.replace(SOC_ZERO_DECIMAL_PATTERN, r"\1", regex=True)
+    )
+    return result
+
+
+def compact_types(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert processed columns to their compact in-memory types.
+
+    Repeated string columns become categoricals, which hold one copy of each
+    distinct value plus integer codes, and wage columns are narrowed to
+    WAGE_DTYPE. Columns already in these types are left as they are.
+
+    Args:
+        df: Processed DataFrame
+
+    Returns:
+        pd.DataFrame: DataFrame with compact column types
+    """
+    dtypes = {col: "category" for col in CATEGORICAL_COLUMNS if col in df}
+    dtypes.update({col: WAGE_DTYPE for col in NUMERIC_COLUMNS if col in df})
+    return df.astype(dtypes)
+
+
+def wage_buckets(wages) -> np.ndarray:
+    """
+    Map annual wages to the cube's wage bucket numbers.
+
+    Bucket `b` holds wages in [b * WAGE_BUCKET_WIDTH, (b + 1) * WAGE_BUCKET_WIDTH).
+
+    Args:
+        wages: Annual wage or array of annual wages
+
+    Returns:
+        np.ndarray: Bucket number of each wage
+    """
+    return np.floor(np.asarray(wages, dtype="float64") / WAGE_BUCKET_WIDTH).astype(
+        "int32"
+    )
+
+
+def _with_keys(df: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+    """Rows with every key present; like groupby(observed=True), drop the rest"""
+    present = df[keys].notna().all(axis=1)
+    return df if present.all() else df[present]
+
+
+def build_cube(
+    df: pd.DataFrame, dimensions: List[str] = CUBE_DIMENSIONS
+) -> pd.DataFrame:
+    """
+    Aggregate processed rows into the (SOC, state, wage bucket) cube.
+
+    Every measure is a count, sum, minimum or maximum, so cubes of disjoint
+    sets of rows combine with `merge_cubes`, and any group of cells rolls up
+    to the exact count, mean and standard deviation of its rows. Rows missing
+    a dimension or the annual wage belong to no cell and are left out.
+
+    Args:
+        df: Processed DataFrame
+        dimensions: Cube dimensions; string columns of `df` plus WAGE_BUCKET
+
+    Returns:
+        pd.DataFrame: One row per non-empty cell with `dimensions` and
+            CUBE_MEASURES columns
+    """
+    df = _with_keys(
+        df, [dim for dim in dimensions if dim != "WAGE_BUCKET"] + ["ANNUAL_WAGE"]
+    )
+    wages = df["ANNUAL_WAGE"].to_numpy(dtype="float64")
+    prevailing = df["ANNUAL_PREVAILING_WAGE"].to_numpy(dtype="float64")
+    rows = pd.DataFrame(
+        {
+            dim: df[dim].astype(str).to_numpy()
+            for dim in dimensions
+            if dim != "WAGE_BUCKET"
+        }
+    )
+    rows = rows.assign(
+        **{
+            "WAGE_BUCKET": wage_buckets(wages),
+            "COUNT": np.ones(len(df), dtype="int64"),
+            "WAGE_SUM": wages,
+            "WAGE_SUMSQ": wages * wages,
+            "WAGE_MIN": wages,
+            "WAGE_MAX": wages,
+            "PREVAILING_SUM": prevailing,
+            "RATIO_SUM": df["WAGE_RATIO"].to_numpy(dtype="float64"),
+            "ABOVE_PREVAILING": (wages > prevailing).astype("int64"),
+        }
+    )
+    return merge_cubes([rows], dimensions)
+
+
+def merge_cubes(
+    cubes: Iterable[pd.DataFrame], dimensions: List[str] = CUBE_DIMENSIONS
+) -> pd.DataFrame:
+    """
+    Combine cubes of disjoint sets of rows into one cube.
+
+    Args:
+        cubes: Cubes (or per-row cube records) to combine
+        dimensions: Dimensions the cubes were built with
+
+    Returns:
+        pd.DataFrame: Combined cube, one row per non-empty cell
+    """
+    aggregations = {measure: "sum" for measure in CUBE_MEASURES}
+    aggregations.update({"WAGE_MIN": "min", "WAGE_MAX": "max"})
+
+    combined = pd.concat(cubes, ignore_index=True)
+    return (
+        combined.groupby(dimensions, sort=True)[CUBE_MEASURES]
+        .agg(aggregations)
+        .reset_index()
+    )
+
+
+def build_employer_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build the employer-level cube, keyed by EMPLOYER_CUBE_DIMENSIONS.
+
+    Each employer's cells roll up to its statistics under any filter, and
+    its per-state and per-SOC counts give its primary state and SOC code.
+
+    Args:
+        df: Processed DataFrame
+
+    Returns:
+        pd.DataFrame: One row per non-empty (employer, SOC, state, wage
+            bucket) cell
+    """
+    return build_cube(df, EMPLOYER_CUBE_DIMENSIONS)
+
+
+def merge_employer_cubes(cubes: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """Combine employer-level cubes of disjoint sets of rows"""
+    return merge_cubes(cubes, EMPLOYER_CUBE_DIMENSIONS)
+
+
+def build_dimension(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """
+    Build a dimension table: the distinct values of a key column.
+
+    Rows missing the key are left out, and missing descriptive values are
+    skipped when taking the first one.
+
+    Args:
+        df: Processed DataFrame
+        columns: Key column followed by descriptive columns, which take the
+            first value found per key (see DIMENSION_TABLES)
+
+    Returns:
+        pd.DataFrame: One row per key, sorted, with `columns`, COUNT,
+            WAGE_MIN and WAGE_MAX columns
+    """
+    df = _with_keys(df, columns[:1])
+    wages = df["ANNUAL_WAGE"].to_numpy(dtype="float64")
+    rows = pd.DataFrame(
+        {
+            columns[0]: df[columns[0]].astype(str).to_numpy(),
+            **{col: df[col].to_numpy(dtype=object) for col in columns[1:]},
+        }
+    )
+    rows = rows.assign(
+        COUNT=np.ones(len(df), dtype="int64"), WAGE_MIN=wages, WAGE_MAX=wages
+    )
+    return merge_dimensions([rows], columns)
+
+
+def merge_dimensions(
+    tables: Iterable[pd.DataFrame], columns: List[str]
+) -> pd.DataFrame:
+    """
+    Combine dimension tables of disjoint sets of rows into one table.
+
+    Args:
+        tables: Dimension tables (or per-row records) to combine
+        columns: Columns the tables were built with
+
+    Returns:
+        pd.DataFrame: Combined table, one row per key
+    """
+    aggregations = {col: "first" for col in columns[1:]}
+    aggregations.update({"COUNT": "sum", "WAGE_MIN": "min", "WAGE_MAX": "max"})
+
+    combined = pd.concat(tables, ignore_index=True)
+    return combined.groupby(columns[0], sort=True).agg(aggregations).reset_index()
+
+
+def sketch_bins(values) -> np.ndarray:
+    """
+    Map positive values to quantile sketch bins.
+
+    Bin `i` holds values in (SKETCH_GAMMA ** (i - 1), SKETCH_GAMMA ** i], so
+    every value in a bin is within QUANTILE_RELATIVE_ACCURACY of the bin's
+    representative value.
+
+    Args:
+        values: Array of positive values
+
+    Returns:
+        np.ndarray: Bin number of each value
+
+    Raises:
+        ValueError: If any value is missing or not positive, as it has no bin
+    """
+    values = np.asarray(values, dtype="float64")
+    if not (values > 0).all():
+        raise ValueError("Sketch bins need positive values")
+    logs = np.log(values) / np.log(SKETCH_GAMMA)
+    return np.ceil(logs).astype("int32")
+
+
+def build_sketch(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build relative-error quantile sketches of every cube cell.
+
+    A sketch counts the values of SKETCH_COLUMNS per logarithmic bin, keeping
+    each bin's exact minimum and maximum. Sketches of disjoint sets of rows
+    merge by adding counts (`merge_sketches`), and quantiles estimated from
+    a merged sketch stay within QUANTILE_RELATIVE_ACCURACY of the exact ones.
+    Rows missing a key or the annual wage are left out, as from the cube,
+    and so are missing or non-positive values, which have no bin.
+
+    Args:
+        df: Processed DataFrame
+
+    Returns:
+        pd.DataFrame: One row per non-empty bin with SKETCH_KEYS, COUNT, MIN
+            and MAX columns
+    """
+    df = _with_keys(df, ["SOC_CODE", "WORKSITE_STATE", "ANNUAL_WAGE"])
+    soc_codes = df["SOC_CODE"].astype(str).to_numpy()
+    states = df["WORKSITE_STATE"].astype(str).to_numpy()
+    buckets = wage_buckets(df["ANNUAL_WAGE"])
+
+    sketches = []
+    for column in SKETCH_COLUMNS:
+        values = df[column].to_numpy(dtype="float64")
+        binned = values > 0
+        values = values[binned]
+        sketches.append(
+            pd.DataFrame(
+                {
+                    "SOC_CODE": soc_codes[binned],
+                    "WORKSITE_STATE": states[binned],
+                    "WAGE_BUCKET": buckets[binned],
+                    "MEASURE": column,
+                    "SKETCH_BIN": sketch_bins(values),
+                    "COUNT": np.ones(len(values), dtype="int64"),
+                    "MIN": values,
+                    "MAX": values,
+                }
+            )
+        )
+    return merge_sketches(sketches)
+
+
+def merge_sketches(sketches: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Combine sketches of disjoint sets of rows into one sketch.
+
+    Args:
+        sketches: Sketches (or per-value sketch records) to combine
+
+    Returns:
+        pd.DataFrame: Combined sketch, one row per non-empty bin
+    """
+    combined = pd.concat(sketches, ignore_index=True)
+    return (
+        combined.groupby(SKETCH_KEYS, sort=True)
+        .agg({"COUNT": "sum", "MIN": "min", "MAX": "max"})
+        .reset_index()
+    )
+
+
 def process_data(df: pd.DataFrame) -> pd.DataFrame:
     """
     Process the raw H1B data.
@@ -36,7 +420,7 @@ def process_data(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
 
     # Standardize SOC codes first
-    df["SOC_CODE"] = df["SOC_CODE"].apply(standardize_soc_code)
+    df["SOC_CODE"] = standardize_soc_codes(df["SOC_CODE"])
 
     # Create SOC title map using first encountered title for each code
     soc_title_map = df.groupby("SOC_CODE")["SOC_TITLE"].first()
@@ -49,19 +433,12 @@ def process_data(df: pd.DataFrame) -> pd.DataFrame:
     ]
 
     # Clean wage columns
-    for col in ["WAGE_RATE_OF_PAY_FROM", "PREVAILING_WAGE"]:
-        df[col] = df[col].apply(clean_wage)
-
-    # Annualize wages
-    df["ANNUAL_WAGE"] = df.apply(
-        lambda x: annualize_wage(x, "WAGE_RATE_OF_PAY_FROM", "WAGE_UNIT_OF_PAY"), axis=1
-    )
-    df["ANNUAL_PREVAILING_WAGE"] = df.apply(
-        lambda x: annualize_wage(x, "PREVAILING_WAGE", "PW_UNIT_OF_PAY"), axis=1
-    )
+    for col in WAGE_COLUMNS:
+        df[col] = clean_wages(df[col])
 
-    # Calculate wage ratio
-    df["WAGE_RATIO"] = calculate_wage_ratio(df)
+    # Annualize wages and calculate the wage ratio
+    for column, derived in DERIVED_COLUMNS.items():
+        df[column] = derived.compute(df)
 
     # Select final columns
-    return df[COLUMNS_TO_KEEP]
+    return compact_types(df[COLUMNS_TO_KEEP])
@@ -1,12 +1,310 @@
+import hashlib
+import json
+import numpy as np
 import pandas as pd
-from typing import List
-from .data_constants import COLUMNS_TO_KEEP, MIN_WAGE, MAX_WAGE, MIN_ROWS
+import pyarrow as pa
+import pyarrow.parquet as pq
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+from .data_constants import (
+    COLUMNS_TO_KEEP,
+    NUMERIC_COLUMNS,
+    WAGE_DTYPE,
+    MIN_WAGE,
+    MAX_WAGE,
+    MIN_ROWS,
+)
+
+
+class RowRule(NamedTuple):
+    """A column's values must be present and, given bounds, within them"""
+
+    column: str
+    min_value: Optional[float] = None
+    max_value: Optional[float] = None
+
+    def passes(self, df: pd.DataFrame) -> np.ndarray:
+        """Mask of the rows satisfying the rule"""
+        values = df[self.column]
+        mask = values.notna().to_numpy(dtype=bool)
+        if self.min_value is not None:
+            mask = mask & (values >= self.min_value).to_numpy(dtype=bool)
+        if self.max_value is not None:
+            mask = mask & (values <= self.max_value).to_numpy(dtype=bool)
+        return mask
+
+    def holds(self, stats: Dict[str, Any]) -> bool:
+        """Whether a column's statistics show every row satisfies the rule"""
+        if stats["nulls"]:
+            return False
+        if self.min_value is not None and stats["min"] is not None:
+            if stats["min"] < self.min_value:
+                return False
+        if self.max_value is not None and stats["max"] is not None:
+            if stats["max"] > self.max_value:
+                return False
+        return True
+
+
+# Row-level rules of processed data. Rows failing any rule are quarantined at
+# ingest, and files record whether their rows pass them, see
+# `validation_metadata`.
+ROW_RULES: Dict[str, RowRule] = {
+    "annual_wage_in_range": RowRule("ANNUAL_WAGE", MIN_WAGE, MAX_WAGE),
+    "prevailing_wage_in_range": RowRule("ANNUAL_PREVAILING_WAGE", MIN_WAGE, MAX_WAGE),
+    "employer_present": RowRule("EMPLOYER_NAME"),
+    "soc_code_present": RowRule("SOC_CODE"),
+    "state_present": RowRule("WORKSITE_STATE"),
+}
+
+# Column of quarantined rows listing the rules they fail
+FAILED_RULES_COLUMN = "FAILED_RULES"
+
+# Key of the quarantine file's Parquet metadata holding per-rule counts
+QUARANTINE_METADATA_KEY = b"rule_failures"
+
+# Key of the processed files' Parquet metadata holding their validation record
+VALIDATION_METADATA_KEY = b"h1b_validation"
+
+
+def rule_failures(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Evaluate every row rule on processed rows.
+
+    Args:
+        df: Processed DataFrame
+
+    Returns:
+        pd.DataFrame: One boolean column per rule of ROW_RULES, True where
+            the row fails it, aligned with `df`
+    """
+    return pd.DataFrame(
+        {name: ~rule.passes(df) for name, rule in ROW_RULES.items()},
+        index=df.index,
+    )
+
+
+def quarantine_rows(
+    df: pd.DataFrame,
+) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, int]]:
+    """
+    Separate processed rows failing any row rule from the clean ones.
+
+    Args:
+        df: Processed DataFrame
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame, Dict[str, int]]: Clean rows, failing
+            rows with a FAILED_RULES column (comma-separated rule names), and
+            the number of rows failing each rule
+    """
+    failures = rule_failures(df)
+    failed = failures.to_numpy().any(axis=1)
+    counts = {name: int(count) for name, count in failures.sum().items()}
+    if not failed.any():
+        return df, df.iloc[:0].assign(**{FAILED_RULES_COLUMN: ""}), counts
+
+    names = np.array(list(ROW_RULES))
+    failed_rules = [",".join(names[row]) for row in failures.to_numpy()[failed]]
+    quarantined = df[failed].assign(**{FAILED_RULES_COLUMN: failed_rules})
+    return df[~failed], quarantined, counts
+
+
+def write_quarantine_file(
+    path: str, rows: pd.DataFrame, counts: Dict[str, int]
+) -> None:
+    """
+    Write quarantined rows, with their per-rule counts in the file metadata.
+
+    Args:
+        path: Parquet file to write
+        rows: Rows from `quarantine_rows`, possibly none
+        counts: Rows failing each rule
+    """
+    table = pa.Table.from_pandas(rows, preserve_index=False)
+    metadata = {
+        **(table.schema.metadata or {}),
+        QUARANTINE_METADATA_KEY: json.dumps(counts).encode(),
+    }
+    pq.write_table(table.replace_schema_metadata(metadata), path)
+
+
+def read_quarantine_counts(path: str) -> Dict[str, int]:
+    """Per-rule counts of a quarantine file, from its footer only"""
+    metadata = pq.read_schema(path).metadata or {}
+    return json.loads(metadata.get(QUARANTINE_METADATA_KEY, b"{}"))
+
+
+def _fold(values: Any, reduce: Any) -> Optional[float]:
+    """Reduce the known values among some, None if there are none"""
+    known = [value for value in values if value is not None]
+    return float(reduce(known)) if known else None
+
+
+def column_stats(df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    """
+    Statistics of the processed columns, as recorded in processed files.
+
+    Args:
+        df: Processed DataFrame
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Null count of every column of
+            COLUMNS_TO_KEEP, with the min and max of NUMERIC_COLUMNS as
+            stored (None if all null)
+    """
+    stats = {}
+    for col in COLUMNS_TO_KEEP:
+        values = df[col]
+        stats[col] = {"nulls": int(values.isna().sum())}
+        if col in NUMERIC_COLUMNS:
+            # At the storage type, so they match the row-group statistics
+            known = values.dropna().astype(WAGE_DTYPE)
+            stats[col]["min"] = float(known.min()) if len(known) else None
+            stats[col]["max"] = float(known.max()) if len(known) else None
+    return stats
+
+
+def merge_column_stats(
+    left: Dict[str, Dict[str, Any]], right: Dict[str, Dict[str, Any]]
+) -> Dict[str, Dict[str, Any]]:
+    """Statistics of two sets of rows from the statistics of each"""
+    merged = {}
+    for col, stats in left.items():
+        merged[col] = {"nulls": stats["nulls"] + right[col]["nulls"]}
+        if "min" in stats:
+            merged[col]["min"] = _fold([stats["min"], right[col]["min"]], min)
+            merged[col]["max"] = _fold([stats["max"], right[col]["max"]], max)
+    return merged
+
+
+def schema_fingerprint(schema: pa.Schema) -> str:
+    """Fingerprint of a schema's column names and types"""
+    text = str(schema.remove_metadata())
+    return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+
+def rule_results(stats: Dict[str, Dict[str, Any]]) -> Dict[str, bool]:
+    """Whether every row passes each row rule, from column statistics alone"""
+    return {name: rule.holds(stats[rule.column]) for name, rule in ROW_RULES.items()}
+
+
+def validation_metadata(
+    stats: Dict[str, Dict[str, Any]], rows: int, schema: pa.Schema
+) -> Dict[bytes, bytes]:
+    """
+    Parquet metadata recording the validation of a processed file.
+
+    Args:
+        stats: Statistics of the file's rows, see `column_stats`
+        rows: Number of rows in the file
+        schema: Arrow schema the file is written with
+
+    Returns:
+        Dict[bytes, bytes]: Metadata holding the schema fingerprint, row
+            count, column statistics, per-rule results and overall result
+    """
+    rules = rule_results(stats)
+    record = {
+        "schema": schema_fingerprint(schema),
+        "rows": rows,
+        "columns": stats,
+        "rules": rules,
+        "valid": rows >= MIN_ROWS and all(rules.values()),
+    }
+    return {VALIDATION_METADATA_KEY: json.dumps(record).encode()}
+
+
+def row_group_stats(
+    metadata: pq.FileMetaData,
+) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Column statistics of a Parquet file from its row-group statistics.
+
+    Args:
+        metadata: Footer of a processed file
+
+    Returns:
+        Optional[Dict[str, Dict[str, Any]]]: Statistics as from
+            `column_stats`, or None if some row group lacks them
+    """
+    stats = {col: {"nulls": 0} for col in COLUMNS_TO_KEEP}
+    for col in NUMERIC_COLUMNS:
+        stats[col].update(min=None, max=None)
+
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        for j in range(row_group.num_columns):
+            chunk = row_group.column(j)
+            col_stats = stats.get(chunk.path_in_schema)
+            if col_stats is None:
+                continue
+            chunk_stats = chunk.statistics
+            if chunk_stats is None or not chunk_stats.has_null_count:
+                return None
+            col_stats["nulls"] += chunk_stats.null_count
+            if "min" not in col_stats:
+                continue
+            if chunk_stats.has_min_max:
+                col_stats["min"] = _fold([col_stats["min"], chunk_stats.min], min)
+                col_stats["max"] = _fold([col_stats["max"], chunk_stats.max], max)
+            elif chunk_stats.null_count < row_group.num_rows:
+                return None
+    return stats
+
+
+def verify_footer(path: str, schema: pa.Schema) -> Optional[bool]:
+    """
+    Validate a processed file from its footer alone, without reading rows.
+
+    The validation record written with the file (see `validation_metadata`)
+    must match the expected schema and the file's own row count and
+    row-group statistics, and those statistics must pass the current row
+    rules and MIN_ROWS, so a change to the rules is caught without
+    rewriting the file.
+
+    Args:
+        path: Processed Parquet file
+        schema: Arrow schema the file must have
+
+    Returns:
+        Optional[bool]: Whether the file is valid, or None if its footer
+            cannot tell (no validation record or row-group statistics), so
+            its rows must be checked with `validate_data`
+    """
+    metadata = pq.read_metadata(path)
+    record = (metadata.metadata or {}).get(VALIDATION_METADATA_KEY)
+    if record is None:
+        return None
+    record = json.loads(record)
+
+    file_schema = metadata.schema.to_arrow_schema().remove_metadata()
+    if record.get("schema") != schema_fingerprint(schema):
+        return False
+    if not file_schema.equals(schema.remove_metadata()):
+        return False
+    if record.get("rows") != metadata.num_rows:
+        return False
+
+    stats = row_group_stats(metadata)
+    if stats is None:
+        return None
+    if stats != record.get("columns"):
+        return False
+
+    return (
+        record.get("valid") is True
+        and metadata.num_rows >= MIN_ROWS
+        and all(rule_results(stats).values())
+    )
 
 
 def validate_data(df: pd.DataFrame) -> bool:
     """
     Validate the processed data meets requirements.
 
+    Every row must pass every rule of ROW_RULES; use `quarantine_rows` to
+    set failing rows aside instead of rejecting the frame.
+
     Args:
         df: DataFrame to validate
 
@@ -22,19 +320,8 @@ def validate_data(df: pd.DataFrame) -> bool:
         if len(df) < MIN_ROWS:
             return False
 
-        # Check for reasonable wage ranges
-        if not (
-            df["ANNUAL_WAGE"].between(MIN_WAGE, MAX_WAGE).all()
-            and df["ANNUAL_PREVAILING_WAGE"].between(MIN_WAGE, MAX_WAGE).all()
-        ):
-            return False
-
-        # Check for non-empty required fields
-        required_non_empty = ["EMPLOYER_NAME", "SOC_CODE", "WORKSITE_STATE"]
-        if df[required_non_empty].isna().any().any():
-            return False
-
-        return True
+        # Check reasonable wage ranges and non-empty required fields
+        return not rule_failures(df).to_numpy().any()
 
     except Exception:
         return False
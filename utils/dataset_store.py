@@ -0,0 +1,615 @@
+import functools
+import hashlib
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from typing import (
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from .data_constants import (
+    DATA_PATH,
+    DATASET_DIR,
+    PROCESSED_DATA_FILE,
+    ARROW_CACHE_FILE,
+    BUILD_LOCK_FILE,
+    CUBE_FILE,
+    SKETCH_FILE,
+    EMPLOYER_CUBE_FILE,
+    RAW_DATA_FILE,
+    DATA_URL,
+    PARTITION_KEYS,
+    CLUSTER_COLUMNS,
+    DIMENSION_TABLES,
+    INGEST_CHUNK_SIZE,
+    QUARANTINE_FILE,
+    FULL_VALIDATION,
+)
+from .data_processor import (
+    build_cube,
+    build_dimension,
+    build_employer_cube,
+    build_sketch,
+    compact_types,
+    derive_columns,
+    merge_cubes,
+    merge_dimensions,
+    merge_employer_cubes,
+    merge_sketches,
+)
+from .data_validation import (
+    FAILED_RULES_COLUMN,
+    column_stats,
+    quarantine_rows,
+    read_quarantine_counts,
+    validate_data,
+    validation_metadata,
+    verify_footer,
+    write_quarantine_file,
+)
+from .file_lock import atomic_write, file_lock
+from .pipeline_version import (
+    pipeline_fingerprint,
+    pipeline_metadata,
+    read_pipeline_metadata,
+    source_changed,
+    stale_derived_columns,
+)
+from .streaming_ingest import PROCESSED_SCHEMA, stream_ingest
+
+# A fiscal period as (fiscal year, quarter)
+Period = Tuple[int, int]
+
+# Schema metadata recording the sort order of an Arrow cache
+CLUSTER_METADATA_KEY = b"cluster_columns"
+CLUSTER_METADATA = ",".join(CLUSTER_COLUMNS).encode()
+
+# Pre-aggregated tables stored with each partition, by file name, with the
+# functions that build one from processed rows and merge several periods'
+AGGREGATES: Dict[
+    str,
+    Tuple[
+        Callable[[pd.DataFrame], pd.DataFrame],
+        Callable[[Iterable[pd.DataFrame]], pd.DataFrame],
+    ],
+] = {
+    CUBE_FILE: (build_cube, merge_cubes),
+    SKETCH_FILE: (build_sketch, merge_sketches),
+    EMPLOYER_CUBE_FILE: (build_employer_cube, merge_employer_cubes),
+    **{
+        file_name: (
+            functools.partial(build_dimension, columns=columns),
+            functools.partial(merge_dimensions, columns=columns),
+        )
+        for file_name, columns in DIMENSION_TABLES.items()
+    },
+}
+
+
+def format_period(period: Period) -> str:
+    """Format a period for display, e.g. 'FY2024 Q1'"""
+    fiscal_year, quarter = period
+    return f"FY{fiscal_year} Q{quarter}"
+
+
+def partition_dir(period: Period) -> str:
+    """Directory of the hive partition holding a period's processed data"""
+    fiscal_year, quarter = period
+    return os.path.join(
+        DATA_PATH,
+        DATASET_DIR,
+        f"{PARTITION_KEYS[0]}={fiscal_year}",
+        f"{PARTITION_KEYS[1]}={quarter}",
+    )
+
+
+def partition_path(period: Period) -> str:
+    """Path of a period's processed Parquet file"""
+    return os.path.join(partition_dir(period), PROCESSED_DATA_FILE)
+
+
+def arrow_cache_path(period: Period) -> str:
+    """Path of a period's uncompressed Arrow IPC cache of the processed data"""
+    return os.path.join(partition_dir(period), ARROW_CACHE_FILE)
+
+
+def partition_lock(period: Period) -> ContextManager[None]:
+    """
+    Lock serializing (re)builds of a period's files across processes.
+
+    Builders hold it while writing the partition or any file derived from
+    it. Processes waiting for it should check again whether the file they
+    need is still missing, as the holder has usually just built it.
+    """
+    return file_lock(os.path.join(partition_dir(period), BUILD_LOCK_FILE))
+
+
+def quarantine_path(period: Period) -> str:
+    """Path of the rows set aside from a period's processed data"""
+    return os.path.join(partition_dir(period), QUARANTINE_FILE)
+
+
+def aggregate_path(period: Period, file_name: str) -> str:
+    """Path of one of a period's pre-aggregated tables"""
+    return os.path.join(partition_dir(period), file_name)
+
+
+def raw_data_path(period: Period) -> str:
+    """Path of a period's raw disclosure workbook"""
+    fiscal_year, quarter = period
+    return os.path.join(
+        DATA_PATH, RAW_DATA_FILE.format(fiscal_year=fiscal_year, quarter=quarter)
+    )
+
+
+def data_url(period: Period) -> str:
+    """DOL download URL of a period's disclosure workbook"""
+    fiscal_year, quarter = period
+    return DATA_URL.format(fiscal_year=fiscal_year, quarter=quarter)
+
+
+def list_periods() -> List[Period]:
+    """
+    List the periods that have a processed partition on disk.
+
+    Only directory names are inspected, so the cost does not depend on how
+    much data each partition holds.
+
+    Returns:
+        List[Period]: Sorted list of available periods
+    """
+    year_key, quarter_key = PARTITION_KEYS
+    dataset_path = os.path.join(DATA_PATH, DATASET_DIR)
+    if not os.path.isdir(dataset_path):
+        return []
+
+    periods = []
+    for year_dir in os.listdir(dataset_path):
+        if not year_dir.startswith(f"{year_key}="):
+            continue
+        for quarter_dir in os.listdir(os.path.join(dataset_path, year_dir)):
+            if not quarter_dir.startswith(f"{quarter_key}="):
+                continue
+            period = (int(year_dir.split("=")[1]), int(quarter_dir.split("=")[1]))
+            if os.path.exists(partition_path(period)):
+                periods.append(period)
+
+    return sorted(periods)
+
+
+def _sort_keys(column: pa.ChunkedArray) -> np.ndarray:
+    """Integer keys ordering a column's values, with nulls first"""
+    values = column.combine_chunks()
+    if not pa.types.is_dictionary(values.type):
+        return pc.rank(values, null_placement="at_start", tiebreaker="dense").to_numpy()
+
+    # Dictionary arrays cannot be sorted directly; rank the dictionary instead
+    ranks = pc.rank(values.dictionary, tiebreaker="dense").to_numpy()
+    indices = values.indices.fill_null(-1).to_numpy()
+    return np.where(indices < 0, 0, ranks[indices])
+
+
+def cluster_table(table: pa.Table) -> pa.Table:
+    """
+    Sort processed rows by CLUSTER_COLUMNS.
+
+    The sort is stable, so rows keep their ingest order within each group.
+
+    Args:
+        table: Processed data with unified dictionaries
+
+    Returns:
+        pa.Table: The same rows, each group of CLUSTER_COLUMNS contiguous
+    """
+    keys = [_sort_keys(table.column(col)) for col in reversed(CLUSTER_COLUMNS)]
+    clustered = table.take(np.lexsort(keys))
+    return clustered.replace_schema_metadata(
+        {**(table.schema.metadata or {}), CLUSTER_METADATA_KEY: CLUSTER_METADATA}
+    )
+
+
+def write_arrow_cache(period: Period, table: pa.Table) -> None:
+    """
+    Write a period's processed data as an uncompressed Arrow IPC file.
+
+    Args:
+        period: Period the data belongs to
+        table: Processed data of the period, clustered by `cluster_table`
+    """
+    with atomic_write(arrow_cache_path(period)) as temp_path:
+        with pa.OSFile(temp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+
+def _arrow_cache_is_current(period: Period) -> bool:
+    """Whether a period's Arrow cache exists, is clustered and is up to date"""
+    cache_path = arrow_cache_path(period)
+    if not os.path.exists(cache_path) or os.path.getmtime(
+        cache_path
+    ) < os.path.getmtime(partition_path(period)):
+        return False
+    metadata = pa.ipc.open_file(pa.memory_map(cache_path)).schema.metadata or {}
+    return metadata.get(CLUSTER_METADATA_KEY) == CLUSTER_METADATA
+
+
+def read_partition_table(period: Period) -> pa.Table:
+    """
+    Read one period's processed data as an Arrow table.
+
+    The data is memory-mapped from the partition's Arrow IPC cache, so it is
+    neither decompressed nor decoded, and worker processes on the same host
+    share the same page-cache pages. The cache holds the rows clustered by
+    CLUSTER_COLUMNS and is (re)built from the Parquet file when it is
+    missing, older than it, or was written in another order; one process
+    builds it while others wait for it.
+
+    Args:
+        period: Period to read; must have a processed partition
+
+    Returns:
+        pa.Table: Processed data of the period, clustered by CLUSTER_COLUMNS
+    """
+    cache_path = arrow_cache_path(period)
+
+    if not _arrow_cache_is_current(period):
+        with partition_lock(period):
+            # Another process may have built it while this one waited
+            if not _arrow_cache_is_current(period):
+                # IPC files allow one dictionary per column, but each Parquet
+                # row group brings its own
+                table = cluster_table(
+                    pq.read_table(partition_path(period)).unify_dictionaries()
+                )
+                try:
+                    write_arrow_cache(period, table)
+                except OSError:
+                    return table  # The cache is optional, e.g. on a read-only disk
+
+    return pa.ipc.open_file(pa.memory_map(cache_path)).read_all()
+
+
+def dataset_version(periods: Sequence[Period]) -> str:
+    """
+    Identify the on-disk version of the selected periods' data.
+
+    The version changes whenever a selected partition is rewritten, so it can
+    key caches of anything derived from the loaded data.
+
+    Args:
+        periods: Selected periods; each must have a processed partition
+
+    Returns:
+        str: Short hex digest of the partitions' paths, sizes and mtimes
+    """
+    digest = hashlib.sha1()
+    for period in periods:
+        stat = os.stat(partition_path(period))
+        digest.update(f"{period}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:16]
+
+
+def read_partitions(periods: Sequence[Period]) -> pd.DataFrame:
+    """
+    Read the processed data of the selected periods only.
+
+    Partitions are addressed by path, so unselected periods are never opened.
+    Rows come clustered by CLUSTER_COLUMNS within each period.
+    Numeric columns without nulls stay backed by the memory-mapped Arrow
+    cache. Dictionary-encoded columns load as categoricals; files written
+    before the compact schema are converted on load.
+
+    Args:
+        periods: Periods to read; each must have a processed partition
+
+    Returns:
+        pd.DataFrame: Processed rows of all selected periods
+    """
+    table = pa.concat_tables([read_partition_table(period) for period in periods])
+    return compact_types(table.to_pandas(split_blocks=True))
+
+
+def write_aggregate(period: Period, file_name: str, table: pd.DataFrame) -> None:
+    """
+    Store one of a period's pre-aggregated tables next to its processed data.
+
+    Args:
+        period: Period the table belongs to
+        file_name: Name of the table in AGGREGATES
+        table: Table built from the period's processed data
+    """
+    with atomic_write(aggregate_path(period, file_name)) as temp_path:
+        table.to_parquet(temp_path, index=False)
+
+
+def write_aggregates(period: Period, df: pd.DataFrame) -> None:
+    """
+    Build and store all pre-aggregated tables of a period.
+
+    Args:
+        period: Period the data belongs to
+        df: Processed data of the period
+    """
+    for file_name, (build, _) in AGGREGATES.items():
+        write_aggregate(period, file_name, build(df))
+
+
+def read_aggregate(period: Period, file_name: str) -> pd.DataFrame:
+    """
+    Read one of a period's pre-aggregated tables.
+
+    The table is (re)built from the processed data when it is missing or
+    older than the Parquet file, e.g. for partitions written before the
+    table existed.
+
+    Args:
+        period: Period to read; must have a processed partition
+        file_name: Name of the table in AGGREGATES
+
+    Returns:
+        pd.DataFrame: Pre-aggregated table of the period
+    """
+    path = aggregate_path(period, file_name)
+
+    def is_current() -> bool:
+        return os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(
+            partition_path(period)
+        )
+
+    if is_current():
+        return pd.read_parquet(path)
+
+    with partition_lock(period):
+        # Another process may have built it while this one waited
+        if is_current():
+            return pd.read_parquet(path)
+
+        build, _ = AGGREGATES[file_name]
+        table = build(read_partitions([period]))
+        try:
+            write_aggregate(period, file_name, table)
+        except OSError:
+            pass  # The table can be rebuilt on every load, e.g. on a read-only disk
+        return table
+
+
+def read_aggregates(periods: Sequence[Period], file_name: str) -> pd.DataFrame:
+    """
+    Read a pre-aggregated table combined over the selected periods.
+
+    Args:
+        periods: Periods to read; each must have a processed partition
+        file_name: Name of the table in AGGREGATES
+
+    Returns:
+        pd.DataFrame: Pre-aggregated table of all selected periods
+    """
+    if len(periods) == 1:
+        return read_aggregate(periods[0], file_name)
+    _, merge = AGGREGATES[file_name]
+    return merge(read_aggregate(period, file_name) for period in periods)
+
+
+def write_partition(
+    period: Period, df: pd.DataFrame, metadata: Dict[bytes, bytes]
+) -> None:
+    """
+    Write a period's processed rows as its Parquet file, atomically.
+
+    Args:
+        period: Period the rows belong to
+        df: Processed rows
+        metadata: Schema metadata to store, see `pipeline_metadata`; the
+            rows' validation record is added, see `validation_metadata`
+    """
+    table = pa.Table.from_pandas(df, schema=PROCESSED_SCHEMA, preserve_index=False)
+    metadata = {
+        **metadata,
+        **validation_metadata(column_stats(df), len(df), PROCESSED_SCHEMA),
+    }
+    os.makedirs(partition_dir(period), exist_ok=True)
+    with atomic_write(partition_path(period)) as temp_path:
+        pq.write_table(
+            table.replace_schema_metadata(metadata),
+            temp_path,
+            row_group_size=INGEST_CHUNK_SIZE,
+        )
+
+
+def write_quarantine(
+    period: Period, rows: pd.DataFrame, counts: Dict[str, int]
+) -> None:
+    """
+    Store the rows set aside from a period's processed data, atomically.
+
+    Args:
+        period: Period the rows belong to
+        rows: Quarantined rows from `quarantine_rows`, possibly none
+        counts: Rows failing each rule
+    """
+    with atomic_write(quarantine_path(period)) as temp_path:
+        write_quarantine_file(temp_path, rows, counts)
+
+
+def read_quarantine(period: Period) -> pd.DataFrame:
+    """Quarantined rows of a period, without their failed rules"""
+    path = quarantine_path(period)
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    rows = pd.read_parquet(path)
+    return rows.drop(columns=[FAILED_RULES_COLUMN], errors="ignore")
+
+
+def quarantine_counts(periods: Sequence[Period]) -> Tuple[int, Dict[str, int]]:
+    """
+    Rows set aside from the selected periods' processed data.
+
+    Only the quarantine files' footers are read.
+
+    Args:
+        periods: Periods to count
+
+    Returns:
+        Tuple[int, Dict[str, int]]: Number of quarantined rows, and of rows
+            failing each rule (a row may fail several)
+    """
+    rows, counts = 0, {}
+    for period in periods:
+        path = quarantine_path(period)
+        if not os.path.exists(path):
+            continue
+        rows += pq.read_metadata(path).num_rows
+        for rule, count in read_quarantine_counts(path).items():
+            counts[rule] = counts.get(rule, 0) + count
+    return rows, counts
+
+
+def verify_partition(period: Period, full: bool = FULL_VALIDATION) -> bool:
+    """
+    Validate a period's partition, from its footer where possible.
+
+    The validation record and row-group statistics in the Parquet footer are
+    checked instead of the rows (see `verify_footer`); the rows are only
+    read and checked with `validate_data` when `full` is set or the footer
+    cannot tell, e.g. for partitions written before the record was kept.
+
+    Args:
+        period: Period to validate; must have a processed partition
+        full: Check every row regardless of the footer
+
+    Returns:
+        bool: True if the partition is valid, False otherwise
+    """
+    valid = None if full else verify_footer(partition_path(period), PROCESSED_SCHEMA)
+    if valid is None:
+        valid = validate_data(read_partitions([period]))
+    return valid
+
+
+def stale_columns(period: Period) -> Optional[List[str]]:
+    """
+    Check a period's partition against its source and the current pipeline.
+
+    Only the Parquet footer is read, and the raw file is only hashed if its
+    size or mtime changed. Partitions written before fingerprints were
+    recorded are taken to come from the current source and pipeline, with
+    every derived column stale.
+
+    Args:
+        period: Period to check
+
+    Returns:
+        Optional[List[str]]: Derived columns to recompute (empty if the
+            partition is current), or None if the partition is missing, its
+            raw file changed or the pipeline changed, so it must be ingested
+            again
+    """
+    if not os.path.exists(partition_path(period)):
+        return None
+
+    recorded = read_pipeline_metadata(partition_path(period))
+    if recorded.get("pipeline", pipeline_fingerprint()) != pipeline_fingerprint():
+        return None
+    source = recorded.get("source")
+    if source and os.path.exists(raw_data_path(period)):
+        if source_changed(raw_data_path(period), source):
+            return None
+
+    return stale_derived_columns(recorded)
+
+
+def refresh_derived_columns(period: Period) -> List[str]:
+    """
+    Recompute the derived columns of a partition whose definitions changed.
+
+    The columns are computed from the stored ones, so the raw file is not
+    read again, and the partition is rewritten with updated fingerprints.
+    Quarantined rows are recomputed too, and the rows are split again by
+    the row rules, so rows may move into or out of quarantine.
+    Its Arrow cache and pre-aggregated tables are rebuilt on next read, as
+    they are then older than it. Nothing is done unless `stale_columns`
+    returns some columns once the period's `partition_lock` is held.
+
+    Args:
+        period: Period to refresh; must have a processed partition
+
+    Returns:
+        List[str]: Columns recomputed
+
+    Raises:
+        ValueError: If the recomputed clean data fails validation
+    """
+    with partition_lock(period):
+        stale = stale_columns(period)
+        if not stale:
+            return []
+
+        path = partition_path(period)
+        rows = pd.concat(
+            [pq.read_table(path).to_pandas(), read_quarantine(period)],
+            ignore_index=True,
+        )
+        df, quarantined, counts = quarantine_rows(
+            derive_columns(compact_types(rows), stale)
+        )
+        if not validate_data(df):
+            raise ValueError("Recomputed data failed validation")
+
+        # The partition is replaced first, then the quarantine file
+        source = read_pipeline_metadata(path).get("source")
+        with atomic_write(quarantine_path(period)) as temp_quarantine_path:
+            write_quarantine_file(temp_quarantine_path, quarantined, counts)
+            write_partition(period, df, pipeline_metadata(source=source))
+
+    return stale
+
+
+def ingest_period(period: Period, source_path: Optional[str] = None) -> int:
+    """
+    Process a period's raw file into its own partition.
+
+    Other partitions are left untouched, so adding a quarter never rewrites
+    existing history. The partition is written to a temporary file first and
+    only moved into place once processing succeeds; its pre-aggregated
+    tables are then built from the written data. The whole ingest holds the
+    period's `partition_lock`. The file records fingerprints of its source
+    and of the pipeline, see `stale_columns`. Rows failing row rules are
+    quarantined rather than failing the whole period, see `quarantine_rows`.
+
+    Args:
+        period: Period to ingest
+        source_path: Raw XLSX, CSV or Arrow file; defaults to the period's
+            downloaded workbook
+
+    Returns:
+        int: Number of processed rows written
+    """
+    os.makedirs(partition_dir(period), exist_ok=True)
+    source_path = source_path or raw_data_path(period)
+
+    with partition_lock(period):
+        # Drop the Arrow cache of any previous ingest of this period
+        if os.path.exists(arrow_cache_path(period)):
+            os.remove(arrow_cache_path(period))
+
+        # The partition is replaced first, then the quarantine file
+        with atomic_write(quarantine_path(period)) as temp_quarantine_path:
+            with atomic_write(partition_path(period)) as temp_path:
+                rows_written = stream_ingest(
+                    source_path,
+                    temp_path,
+                    metadata=pipeline_metadata(source_path),
+                    quarantine_path=temp_quarantine_path,
+                )
+        write_aggregates(period, read_partitions([period]))
+
+    return rows_written
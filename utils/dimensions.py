@@ -0,0 +1,71 @@
+import pandas as pd
+import streamlit as st
+from typing import Tuple
+from .data_constants import (
+    DIMENSION_TABLES,
+    SOC_DIMENSION_FILE,
+    STATE_DIMENSION_FILE,
+)
+from .data_processor import build_dimension
+from .dataset_store import Period, read_aggregates
+
+
+@st.cache_resource(max_entries=32)
+def _cached_dimension(
+    dataset_version: str, periods: Tuple[Period, ...], file_name: str
+) -> pd.DataFrame:
+    """Load a dimension table once per dataset version"""
+    return read_aggregates(periods, file_name)
+
+
+def dimension_table(df: pd.DataFrame, file_name: str) -> pd.DataFrame:
+    """
+    Get a dimension table of the dataset a frame was loaded from.
+
+    Frames loaded by `load_data`, and views filtered from them, are answered
+    from the tables stored with each partition, whose size depends on the
+    number of distinct keys rather than rows. The table describes the whole
+    loaded dataset, not the view. Any other frame is aggregated from its rows.
+    The returned table is shared; do not modify it.
+
+    Args:
+        df: Loaded DataFrame or a filtered view of it
+        file_name: Dimension table, one of DIMENSION_TABLES
+
+    Returns:
+        pd.DataFrame: One row per key, sorted, with the table's columns,
+            COUNT, WAGE_MIN and WAGE_MAX
+    """
+    version = df.attrs.get("dataset_version")
+    periods = df.attrs.get("periods")
+    if version is None or periods is None:
+        return build_dimension(df, DIMENSION_TABLES[file_name])
+    return _cached_dimension(version, periods, file_name)
+
+
+def soc_titles(df: pd.DataFrame) -> pd.Series:
+    """
+    SOC title of every SOC code of the loaded dataset.
+
+    Args:
+        df: Loaded DataFrame or a filtered view of it
+
+    Returns:
+        pd.Series: SOC titles indexed by sorted SOC code
+    """
+    socs = dimension_table(df, SOC_DIMENSION_FILE)
+    return pd.Series(socs["SOC_TITLE"].to_numpy(), index=socs["SOC_CODE"])
+
+
+def wage_bounds(df: pd.DataFrame) -> Tuple[float, float]:
+    """
+    Lowest and highest annual wage of the loaded dataset.
+
+    Args:
+        df: Loaded DataFrame or a filtered view of it
+
+    Returns:
+        Tuple[float, float]: (min, max) annual wage
+    """
+    states = dimension_table(df, STATE_DIMENSION_FILE)
+    return float(states["WAGE_MIN"].min()), float(states["WAGE_MAX"].max())
@@ -0,0 +1,169 @@
+import json
+import os
+import requests
+from typing import Callable, Dict, Optional
+from .data_constants import DOWNLOAD_CHUNK_SIZE, DOWNLOAD_TIMEOUT, DOWNLOAD_RETRIES
+
+# Called with the bytes received so far and the total size, if known
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+# Response headers identifying a version of the remote file
+VALIDATOR_HEADERS = ["ETag", "Last-Modified"]
+
+# Connection failures after which the download resumes from the partial file
+RESUMABLE_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+def partial_path(path: str) -> str:
+    """Path of the partial download of a file"""
+    return path + ".part"
+
+
+def validators_path(path: str) -> str:
+    """Path of the validators (ETag, Last-Modified) stored next to a file"""
+    return path + ".http.json"
+
+
+def read_validators(path: str) -> Dict[str, str]:
+    """Validators of a downloaded or partial file, empty if unknown"""
+    try:
+        with open(validators_path(path)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_validators(path: str, response: requests.Response) -> None:
+    """Store the validators of the response a file is downloaded from"""
+    validators = {
+        header: response.headers[header]
+        for header in VALIDATOR_HEADERS
+        if header in response.headers
+    }
+    with open(validators_path(path), "w") as f:
+        json.dump(validators, f)
+
+
+def _request_headers(path: str, offset: int) -> Dict[str, str]:
+    """Headers resuming a partial download, or revalidating a complete one"""
+    if offset:
+        validators = read_validators(partial_path(path))
+        # If-Range makes the server send the whole file should it have changed
+        return {
+            "Range": f"bytes={offset}-",
+            "If-Range": validators.get("ETag") or validators["Last-Modified"],
+        }
+
+    validators = read_validators(path) if os.path.exists(path) else {}
+    headers = {}
+    if "ETag" in validators:
+        headers["If-None-Match"] = validators["ETag"]
+    if "Last-Modified" in validators:
+        headers["If-Modified-Since"] = validators["Last-Modified"]
+    return headers
+
+
+def _resumable_offset(path: str) -> int:
+    """Bytes of a partial download that can be resumed, 0 to start over"""
+    part_path = partial_path(path)
+    if not os.path.exists(part_path) or not read_validators(part_path):
+        return 0
+    return os.path.getsize(part_path)
+
+
+def _transfer(
+    session: requests.Session,
+    url: str,
+    path: str,
+    progress: Optional[ProgressCallback],
+) -> bool:
+    """One download attempt, appending to any resumable partial file"""
+    part_path = partial_path(path)
+    offset = _resumable_offset(path)
+
+    with session.get(
+        url,
+        headers=_request_headers(path, offset),
+        stream=True,
+        timeout=DOWNLOAD_TIMEOUT,
+    ) as response:
+        if response.status_code == 304:
+            return False
+        if response.status_code == 416 and offset:
+            # The partial file does not fit the remote one; start over
+            os.remove(part_path)
+            return _transfer(session, url, path, progress)
+        response.raise_for_status()
+
+        if response.status_code == 206:
+            content_range = response.headers.get("Content-Range", "")
+            start, _, size = content_range.removeprefix("bytes ").partition("/")
+            if int(start.split("-")[0]) != offset:
+                raise requests.ConnectionError(f"Unexpected range {content_range}")
+            total = int(size) if size.isdigit() else None
+        else:
+            offset = 0
+            length = response.headers.get("Content-Length")
+            total = int(length) if length is not None else None
+            write_validators(part_path, response)
+
+        received = offset
+        with open(part_path, "ab" if offset else "wb") as f:
+            for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+                received += len(chunk)
+                if progress is not None:
+                    progress(received, total)
+
+    if total is not None and received != total:
+        raise requests.ConnectionError(
+            f"Download ended after {received:,} of {total:,} bytes"
+        )
+
+    os.replace(validators_path(part_path), validators_path(path))
+    os.replace(part_path, path)
+    return True
+
+
+def download_file(
+    url: str,
+    path: str,
+    progress: Optional[ProgressCallback] = None,
+    session: Optional[requests.Session] = None,
+) -> bool:
+    """
+    Download a file over HTTP, streaming it to disk.
+
+    The body is written in DOWNLOAD_CHUNK_SIZE chunks to a partial file next
+    to `path`, which replaces `path` only once complete. A dropped connection
+    is retried up to DOWNLOAD_RETRIES times, each time resuming with a Range
+    request from the bytes already written; an interrupted download is also
+    resumed by the next call. The ETag and Last-Modified of the download are
+    stored next to the file, so a later call makes a conditional request and
+    skips the transfer when the remote file is unchanged.
+
+    Args:
+        url: URL to download
+        path: Destination file
+        progress: Called after each chunk with the bytes received so far and
+            the total size, if the server reports it
+        session: Session to send the requests with
+
+    Returns:
+        bool: True if the file was downloaded, False if it was up to date
+
+    Raises:
+        requests.RequestException: If the server returns an error or the
+            connection keeps failing
+    """
+    session = session or requests.Session()
+    for attempt in range(DOWNLOAD_RETRIES + 1):
+        try:
+            return _transfer(session, url, path, progress)
+        except RESUMABLE_ERRORS:
+            if attempt == DOWNLOAD_RETRIES:
+                raise
@@ -0,0 +1,114 @@
+import os
+import secrets
+import stat
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: locks only exclude threads of this process
+    fcntl = None
+
+# Lock files held by each thread, so a holder can re-enter its own lock
+_held = threading.local()
+
+# Process-local locks by lock file path, where a lock file cannot be used
+_local_locks: Dict[str, threading.Lock] = {}
+_local_locks_guard = threading.Lock()
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """
+    Hold an exclusive lock on a lock file, waiting until it is free.
+
+    The lock is an advisory `flock`, so it excludes other processes (e.g.
+    Streamlit workers) and other threads of this process alike, and the OS
+    releases it if its holder dies, so a crashed build never leaves a stale
+    lock behind. A thread already holding the lock re-enters it at once.
+    Where the lock file cannot be used (no fcntl, or a read-only disk), only
+    threads of this process are excluded.
+
+    Args:
+        path: Lock file, created if missing; its contents are irrelevant
+    """
+    path = os.path.abspath(path)
+    held = getattr(_held, "paths", None)
+    if held is None:
+        held = _held.paths = set()
+    if path in held:
+        yield
+        return
+
+    held.add(path)
+    try:
+        with _exclusive(path):
+            yield
+    finally:
+        held.discard(path)
+
+
+@contextmanager
+def _exclusive(path: str) -> Iterator[None]:
+    """Lock a lock file, or only this process's lock on it if that fails"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        lock_file = open(path, "a") if fcntl is not None else None
+    except OSError:
+        lock_file = None  # e.g. a read-only disk, which no process can write
+
+    if lock_file is None:
+        with _local_locks_guard:
+            lock = _local_locks.setdefault(path, threading.Lock())
+        with lock:
+            yield
+        return
+
+    with lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _create_temp_file(path: str) -> str:
+    """Create a unique empty file next to `path`, as a new `path` would be"""
+    directory, name = os.path.split(path)
+    while True:
+        temp_path = os.path.join(directory, f"{name}.{secrets.token_hex(4)}.tmp")
+        try:
+            # Unlike mkstemp's 0600, 0666 lets the umask decide, as for open()
+            os.close(os.open(temp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666))
+            return temp_path
+        except FileExistsError:
+            continue
+
+
+@contextmanager
+def atomic_write(path: str) -> Iterator[str]:
+    """
+    Write a file through a temporary file that replaces it only on success.
+
+    The temporary file is unique and lies in the same directory, so
+    concurrent writers never share one and the final rename is atomic:
+    readers see either the old or the complete new file. The new file keeps
+    the permissions of the file it replaces, or gets those the umask gives
+    a new file.
+
+    Args:
+        path: File to (re)write
+
+    Yields:
+        str: Path of the temporary file to write to
+    """
+    temp_path = _create_temp_file(path)
+    try:
+        yield temp_path
+        if os.path.exists(path):
+            os.chmod(temp_path, stat.S_IMODE(os.stat(path).st_mode))
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
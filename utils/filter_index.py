@@ -0,0 +1,173 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from typing import Optional, Tuple
+from .aggregate_cache import cached_aggregate
+
+
+class GroupIndex:
+    """
+    Offset index of the rows holding each distinct value of a column.
+
+    `order` lists all row positions grouped by value, ascending within each
+    group, and the rows of group `i` are `order[offsets[i] : offsets[i + 1]]`.
+    For a column the data is clustered by, every group is one contiguous run
+    of rows, which `select_rows` slices without copying.
+    """
+
+    def __init__(self, values: pd.Series):
+        codes, uniques = pd.factorize(values)
+        self.values = pd.Index(uniques)
+        self.order = np.argsort(codes, kind="stable").astype(np.int32)
+        self.offsets = np.searchsorted(codes[self.order], np.arange(len(uniques) + 1))
+        self._groups = {value: i for i, value in enumerate(uniques)}
+
+    def rows(self, value: object) -> np.ndarray:
+        """Ascending positions of the rows holding `value` (empty if none)"""
+        i = self._groups.get(value)
+        if i is None:
+            return self.order[:0]
+        return self.order[self.offsets[i] : self.offsets[i + 1]]
+
+    def sizes(self) -> pd.Series:
+        """Number of rows per distinct value"""
+        return pd.Series(np.diff(self.offsets), index=self.values)
+
+
+class FilterIndex:
+    """
+    Precomputed lookups resolving sidebar filters to row positions.
+
+    Holds offset indexes of the rows of every SOC code, state and employer,
+    and a wage-sorted permutation of all rows, so a filter combination is resolved with set
+    intersections and a binary search instead of full-column scans.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.num_rows = len(df)
+        self.soc_index = GroupIndex(df["SOC_CODE"])
+        self.state_index = GroupIndex(df["WORKSITE_STATE"])
+        self.employer_index = GroupIndex(df["EMPLOYER_NAME"])
+
+        self.wages = df["ANNUAL_WAGE"].to_numpy()
+        self.wage_order = np.argsort(self.wages, kind="stable").astype(np.int32)
+        self.sorted_wages = self.wages[self.wage_order]
+
+    def select(
+        self, selected_soc: str, selected_state: str, wage_range: Tuple[float, float]
+    ) -> Optional[np.ndarray]:
+        """
+        Resolve a filter combination to the positions of the matching rows.
+
+        Args:
+            selected_soc: SOC code or "All"
+            selected_state: State or "All"
+            wage_range: Inclusive (min, max) annual wage
+
+        Returns:
+            Optional[np.ndarray]: Ascending row positions, or None if every
+                row matches
+        """
+        row_sets = []
+        if selected_soc != "All":
+            row_sets.append(self.soc_index.rows(selected_soc))
+        if selected_state != "All":
+            row_sets.append(self.state_index.rows(selected_state))
+
+        # Rows within the wage range form one slice of the wage-sorted order
+        start = np.searchsorted(self.sorted_wages, wage_range[0], side="left")
+        stop = np.searchsorted(self.sorted_wages, wage_range[1], side="right")
+        all_wages = start == 0 and stop == self.num_rows
+
+        if not row_sets:
+            if all_wages:
+                return None
+            return np.sort(self.wage_order[start:stop])
+
+        # Intersect starting from the smallest set, then check wages directly
+        row_sets.sort(key=len)
+        rows = row_sets[0]
+        for other in row_sets[1:]:
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        if not all_wages:
+            wages = self.wages[rows]
+            rows = rows[(wages >= wage_range[0]) & (wages <= wage_range[1])]
+        return rows
+
+
+@st.cache_resource(max_entries=8)
+def _cached_filter_index(dataset_version: str, _df: pd.DataFrame) -> FilterIndex:
+    """Build the filter index once per dataset version"""
+    return FilterIndex(_df)
+
+
+def get_filter_index(df: pd.DataFrame) -> FilterIndex:
+    """
+    Get the filter index of a loaded dataset.
+
+    Args:
+        df: Shared dataset returned by `load_data`
+
+    Returns:
+        FilterIndex: Index built once per dataset version
+    """
+    dataset_version = df.attrs.get("dataset_version")
+    if dataset_version is None:
+        return FilterIndex(df)
+    return _cached_filter_index(dataset_version, df)
+
+
+def select_rows(df: pd.DataFrame, rows: Optional[np.ndarray]) -> pd.DataFrame:
+    """
+    Build the filtered frame for resolved row positions.
+
+    Nothing is copied when all rows or one contiguous run of rows match;
+    otherwise only the matching rows are gathered.
+
+    Args:
+        df: Shared dataset or a filtered view of it
+        rows: Ascending row positions, or None for all rows
+
+    Returns:
+        pd.DataFrame: New frame holding the selected rows
+    """
+    if rows is None:
+        return df.copy(deep=False)
+    if len(rows) > 0 and rows[-1] - rows[0] + 1 == len(rows):
+        return df.iloc[rows[0] : rows[-1] + 1]
+    return df.iloc[rows]
+
+
+@cached_aggregate
+def group_index(df: pd.DataFrame, column: str) -> GroupIndex:
+    """
+    Get the offset index of a filtered view's rows by one column.
+
+    Built in one pass over the view and cached with its filter, so charts
+    looping over groups slice each group's rows instead of scanning the whole
+    view per group.
+
+    Args:
+        df: Filtered DataFrame
+        column: Column to group by, e.g. "EMPLOYER_NAME"
+
+    Returns:
+        GroupIndex: Row positions of each value of `column` within `df`
+    """
+    return GroupIndex(df[column])
+
+
+def group_rows(df: pd.DataFrame, column: str, value: object) -> pd.DataFrame:
+    """
+    Get the rows of a filtered view holding one value of a column.
+
+    Args:
+        df: Filtered DataFrame
+        column: Column to match, e.g. "EMPLOYER_NAME"
+        value: Value to match
+
+    Returns:
+        pd.DataFrame: Matching rows; a slice without copies when they are
+            contiguous, as employers are in the clustered dataset
+    """
+    return select_rows(df, group_index(df, column).rows(value))
@@ -0,0 +1,139 @@
+import functools
+import hashlib
+import json
+import os
+import pyarrow.parquet as pq
+from typing import Any, Dict, List, Optional
+from .data_constants import COLUMNS_TO_KEEP, PIPELINE_VERSION
+from .data_processor import DERIVED_COLUMNS
+
+# Key of the processed files' Parquet metadata holding their fingerprints
+PIPELINE_METADATA_KEY = b"h1b_pipeline"
+
+
+def _digest(*parts: Any) -> str:
+    """Short hex digest of the `repr` of some values"""
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(repr(part).encode())
+    return digest.hexdigest()[:16]
+
+
+def pipeline_fingerprint() -> str:
+    """Fingerprint of the pipeline up to the derived columns"""
+    stored = [col for col in COLUMNS_TO_KEEP if col not in DERIVED_COLUMNS]
+    return _digest(PIPELINE_VERSION, stored)
+
+
+@functools.lru_cache(maxsize=None)
+def derived_fingerprints() -> Dict[str, str]:
+    """
+    Fingerprint of every derived column's definition.
+
+    A column's fingerprint covers its version and constants, and the
+    fingerprints of the derived columns it reads, so bumping ANNUAL_WAGE's
+    version also changes WAGE_RATIO's. Source code is not fingerprinted, so
+    edits to comments or docstrings keep partitions current.
+
+    Returns:
+        Dict[str, str]: Fingerprint by column of DERIVED_COLUMNS
+    """
+    fingerprints: Dict[str, str] = {}
+    for column, derived in DERIVED_COLUMNS.items():
+        inputs = [fingerprints.get(col, col) for col in derived.inputs]
+        fingerprints[column] = _digest(derived.version, derived.constants, inputs)
+    return fingerprints
+
+
+def source_fingerprint(path: str) -> Dict[str, Any]:
+    """
+    Identify the contents of a raw file.
+
+    Args:
+        path: Raw file
+
+    Returns:
+        Dict[str, Any]: SHA-256 of the contents, with the size and mtime it
+            was computed at
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(functools.partial(f.read, 1024 * 1024), b""):
+            digest.update(block)
+    stat = os.stat(path)
+    return {
+        "sha256": digest.hexdigest(),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def source_changed(path: str, recorded: Dict[str, Any]) -> bool:
+    """
+    Whether a raw file differs from the one a fingerprint was taken of.
+
+    The file is only hashed when its size or mtime differ from the recorded
+    ones, so an untouched file costs a `stat`.
+
+    Args:
+        path: Raw file
+        recorded: Fingerprint from `source_fingerprint`
+
+    Returns:
+        bool: True if the contents changed
+    """
+    stat = os.stat(path)
+    if stat.st_size == recorded.get("size") and stat.st_mtime_ns == recorded.get(
+        "mtime_ns"
+    ):
+        return False
+    return source_fingerprint(path)["sha256"] != recorded.get("sha256")
+
+
+def pipeline_metadata(
+    source_path: Optional[str] = None,
+    source: Optional[Dict[str, Any]] = None,
+) -> Dict[bytes, bytes]:
+    """
+    Parquet metadata recording how a processed file was produced.
+
+    Args:
+        source_path: Raw file the rows were processed from, to fingerprint
+        source: Fingerprint of the raw file, if already known
+
+    Returns:
+        Dict[bytes, bytes]: Schema metadata holding the source, pipeline and
+            derived column fingerprints
+    """
+    if source is None and source_path is not None:
+        source = source_fingerprint(source_path)
+    fingerprints = {
+        "source": source,
+        "pipeline": pipeline_fingerprint(),
+        "derived": derived_fingerprints(),
+    }
+    return {PIPELINE_METADATA_KEY: json.dumps(fingerprints).encode()}
+
+
+def read_pipeline_metadata(path: str) -> Dict[str, Any]:
+    """
+    Fingerprints recorded in a processed file, from its footer only.
+
+    Args:
+        path: Processed Parquet file
+
+    Returns:
+        Dict[str, Any]: Recorded fingerprints, empty for files written before
+            they were recorded
+    """
+    metadata = pq.read_schema(path).metadata or {}
+    if PIPELINE_METADATA_KEY not in metadata:
+        return {}
+    return json.loads(metadata[PIPELINE_METADATA_KEY])
+
+
+def stale_derived_columns(recorded: Dict[str, Any]) -> List[str]:
+    """Derived columns whose recorded fingerprint is not the current one"""
+    current = derived_fingerprints()
+    computed = recorded.get("derived", {})
+    return [col for col in DERIVED_COLUMNS if computed.get(col) != current[col]]
@@ -0,0 +1,231 @@
+import abc
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.dataset as ds
+from openpyxl import load_workbook
+from typing import Dict, Iterable, Iterator, List, Optional
+from .data_constants import (
+    STRING_COLUMNS,
+    WAGE_COLUMNS,
+    INGEST_CHUNK_SIZE,
+    RAW_READER_ENGINE,
+)
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:  # Optional fast XLSX parser
+    CalamineWorkbook = None
+
+# The only raw columns the processing pipeline uses
+RAW_COLUMNS = STRING_COLUMNS + WAGE_COLUMNS
+
+
+def _normalize_raw_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Give string columns the dtype `pd.read_excel(dtype=str)` would use"""
+    for col in df.columns:
+        if col in STRING_COLUMNS:
+            present = df[col].notna() & (df[col] != "")
+            df[col] = df[col].astype(str).where(present)
+    return df
+
+
+def _chunk_rows(
+    rows: Iterable[tuple], columns: List[str], chunk_size: int
+) -> Iterator[pd.DataFrame]:
+    """Project header-led row tuples to `columns` and group them into chunks"""
+    rows = iter(rows)
+    header = next(rows, None)
+    if header is None:
+        return
+
+    positions = [i for i, name in enumerate(header) if name in columns]
+    names = [header[i] for i in positions]
+
+    batch = []
+    for row in rows:
+        batch.append(tuple(row[i] if i < len(row) else None for i in positions))
+        if len(batch) >= chunk_size:
+            yield _normalize_raw_frame(pd.DataFrame.from_records(batch, columns=names))
+            batch = []
+
+    if batch:
+        yield _normalize_raw_frame(pd.DataFrame.from_records(batch, columns=names))
+
+
+def _rebatch(
+    batches: Iterable[pa.RecordBatch], chunk_size: int
+) -> Iterator[pd.DataFrame]:
+    """Regroup Arrow record batches into DataFrames of about `chunk_size` rows"""
+    pending = []
+    pending_rows = 0
+    for batch in batches:
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        if pending_rows >= chunk_size:
+            table = pa.Table.from_batches(pending)
+            yield _normalize_raw_frame(table.to_pandas())
+            pending, pending_rows = [], 0
+
+    if pending:
+        table = pa.Table.from_batches(pending)
+        yield _normalize_raw_frame(table.to_pandas())
+
+
+class RawReader(abc.ABC):
+    """
+    Reads a raw LCA disclosure file, projected to the columns we use.
+
+    Subclasses implement `iter_chunks`; only the requested columns are
+    materialized, so cost scales with the columns used rather than with the
+    columns the source file contains.
+    """
+
+    name = ""
+    extensions: tuple = ()
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Whether the reader's dependencies are installed"""
+        return True
+
+    @abc.abstractmethod
+    def iter_chunks(
+        self,
+        path: str,
+        columns: List[str] = RAW_COLUMNS,
+        chunk_size: int = INGEST_CHUNK_SIZE,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream the file as DataFrame chunks.
+
+        Args:
+            path: Path to the raw file
+            columns: Names of the columns to keep; absent columns are skipped
+            chunk_size: Maximum number of rows per chunk
+
+        Yields:
+            pd.DataFrame: Chunk of raw rows
+        """
+
+    def read(self, path: str, columns: List[str] = RAW_COLUMNS) -> pd.DataFrame:
+        """
+        Read the whole file into one DataFrame.
+
+        Args:
+            path: Path to the raw file
+            columns: Names of the columns to keep; absent columns are skipped
+
+        Returns:
+            pd.DataFrame: Raw rows projected to `columns`
+        """
+        chunks = list(self.iter_chunks(path, columns))
+        if not chunks:
+            return pd.DataFrame()
+        return pd.concat(chunks, ignore_index=True)
+
+
+class OpenpyxlReader(RawReader):
+    """XLSX reader built on openpyxl's read-only row iterator"""
+
+    name = "openpyxl"
+    extensions = (".xlsx",)
+
+    def iter_chunks(self, path, columns=RAW_COLUMNS, chunk_size=INGEST_CHUNK_SIZE):
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            yield from _chunk_rows(rows, columns, chunk_size)
+        finally:
+            workbook.close()
+
+
+class CalamineReader(RawReader):
+    """XLSX reader built on the Rust calamine parser, if installed"""
+
+    name = "calamine"
+    extensions = (".xlsx",)
+
+    @classmethod
+    def is_available(cls):
+        return CalamineWorkbook is not None
+
+    def iter_chunks(self, path, columns=RAW_COLUMNS, chunk_size=INGEST_CHUNK_SIZE):
+        workbook = CalamineWorkbook.from_path(path)
+        try:
+            rows = workbook.get_sheet_by_index(0).iter_rows()
+            yield from _chunk_rows(rows, columns, chunk_size)
+        finally:
+            if hasattr(workbook, "close"):
+                workbook.close()
+
+
+class CsvReader(RawReader):
+    """DOL CSV export reader using pyarrow's streaming CSV parser"""
+
+    name = "csv"
+    extensions = (".csv",)
+
+    def iter_chunks(self, path, columns=RAW_COLUMNS, chunk_size=INGEST_CHUNK_SIZE):
+        header = pa_csv.open_csv(path).schema.names
+        present = [col for col in header if col in columns]
+
+        # Read everything as text; wages are cleaned by process_data
+        convert_options = pa_csv.ConvertOptions(
+            include_columns=present,
+            column_types={col: pa.string() for col in present},
+        )
+        batches = pa_csv.open_csv(path, convert_options=convert_options)
+        yield from _rebatch(batches, chunk_size)
+
+
+class ArrowReader(RawReader):
+    """Reader for previously ingested Arrow IPC/Feather or Parquet files"""
+
+    name = "arrow"
+    extensions = (".arrow", ".feather", ".ipc", ".parquet")
+
+    def iter_chunks(self, path, columns=RAW_COLUMNS, chunk_size=INGEST_CHUNK_SIZE):
+        file_format = "parquet" if path.endswith(".parquet") else "ipc"
+        dataset = ds.dataset(path, format=file_format)
+        present = [col for col in dataset.schema.names if col in columns]
+        batches = dataset.to_batches(columns=present, batch_size=chunk_size)
+        yield from _rebatch(batches, chunk_size)
+
+
+# Registered readers by engine name; XLSX engines are listed fastest first
+READERS: Dict[str, RawReader] = {
+    reader.name: reader
+    for reader in (CalamineReader(), OpenpyxlReader(), CsvReader(), ArrowReader())
+}
+
+
+def get_reader(path: str, engine: Optional[str] = RAW_READER_ENGINE) -> RawReader:
+    """
+    Pick a raw reader for a file.
+
+    Args:
+        path: Path to the raw file
+        engine: Name of a registered reader, or None to choose the fastest
+            available reader for the file extension
+
+    Returns:
+        RawReader: Reader able to parse the file
+
+    Raises:
+        ValueError: If the engine is unknown or unavailable, or no reader
+            handles the file extension
+    """
+    if engine is not None:
+        reader = READERS.get(engine)
+        if reader is None or not reader.is_available():
+            raise ValueError(f"Raw reader engine not available: {engine}")
+        return reader
+
+    extension = os.path.splitext(path)[1].lower()
+    for reader in READERS.values():
+        if extension in reader.extensions and reader.is_available():
+            return reader
+
+    raise ValueError(f"No raw reader for file type: {extension}")
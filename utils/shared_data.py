@@ -0,0 +1,143 @@
+import functools
+import inspect
+import numpy as np
+import pandas as pd
+from typing import Callable
+
+READ_ONLY_MESSAGE = (
+    "The shared dataset is read-only; derive a new frame "
+    "(e.g. with df.copy()) before modifying it"
+)
+
+
+class _ReadOnlyIndexer:
+    """Wraps a .loc/.iloc/.at/.iat indexer so it can only be read from"""
+
+    def __init__(self, indexer):
+        self._indexer = indexer
+
+    def __getitem__(self, key):
+        return self._indexer[key]
+
+    def __setitem__(self, key, value):
+        raise TypeError(READ_ONLY_MESSAGE)
+
+
+class ReadOnlyDataFrame(pd.DataFrame):
+    """
+    DataFrame shared read-only across all sessions.
+
+    Column assignment and deletion, relabelling columns or rows, indexer
+    assignment and in-place methods raise TypeError, and the column buffers
+    are flagged read-only as well. Any frame derived from it (filtering,
+    `copy`, ...) is an ordinary DataFrame. Writes to it never reach the
+    shared data: without pandas 3's Copy-on-Write, a view writing into the
+    shared buffers in place raises ValueError instead.
+    """
+
+    @property
+    def _constructor(self):
+        return pd.DataFrame
+
+    @property
+    def loc(self):
+        return _ReadOnlyIndexer(super().loc)
+
+    @property
+    def iloc(self):
+        return _ReadOnlyIndexer(super().iloc)
+
+    @property
+    def at(self):
+        return _ReadOnlyIndexer(super().at)
+
+    @property
+    def iat(self):
+        return _ReadOnlyIndexer(super().iat)
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(READ_ONLY_MESSAGE)
+
+    def __setattr__(self, name, value):
+        # Relabelling, or shadowing a column with an attribute, would change
+        # the frame of every session
+        if name in ("columns", "index") or (
+            "_mgr" in self.__dict__ and name in self.columns
+        ):
+            raise TypeError(READ_ONLY_MESSAGE)
+        super().__setattr__(name, value)
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    insert = _read_only
+    isetitem = _read_only
+    pop = _read_only
+    update = _read_only
+    _update_inplace = _read_only
+
+
+def _not_in_place(method: Callable) -> Callable:
+    """Wrap a DataFrame method so calling it with inplace=True raises"""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if kwargs.get("inplace"):
+            raise TypeError(READ_ONLY_MESSAGE)
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+# Some in-place methods (e.g. fillna) write through the block manager rather
+# than `_update_inplace`, so every method taking `inplace` is guarded
+for _name, _method in inspect.getmembers(pd.DataFrame, inspect.isfunction):
+    if not _name.startswith("_"):
+        if "inplace" in inspect.signature(_method).parameters:
+            setattr(ReadOnlyDataFrame, _name, _not_in_place(_method))
+
+
+def _is_read_only(values: np.ndarray) -> bool:
+    """Whether no array in the view chain of `values` is writeable"""
+    while isinstance(values, np.ndarray):
+        if values.flags.writeable:
+            return False
+        values = values.base
+    return True
+
+
+def _read_only_column(series: pd.Series) -> pd.Series:
+    """Copy a column into buffers that are flagged read-only"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy(copy=True)
+        codes.flags.writeable = False
+        values = pd.Categorical.from_codes(codes, dtype=series.dtype)
+    elif _is_read_only(np.asarray(series.array)):
+        # Columns backed by memory-mapped Arrow data are kept as they are
+        return series
+    else:
+        values = series.to_numpy(copy=True)
+        values.flags.writeable = False
+
+    return pd.Series(values, index=series.index, name=series.name, copy=False)
+
+
+def share_frame(df: pd.DataFrame) -> ReadOnlyDataFrame:
+    """
+    Convert a loaded frame into the read-only frame shared by all sessions.
+
+    The data is copied once here, into buffers no other object references,
+    so sessions can then hold the result without any further copies. Columns
+    already backed by read-only memory (the memory-mapped Arrow cache) are
+    not copied.
+
+    Args:
+        df: Processed DataFrame
+
+    Returns:
+        ReadOnlyDataFrame: Read-only frame with the same data
+    """
+    shared = ReadOnlyDataFrame(
+        {col: _read_only_column(df[col]) for col in df.columns}, copy=False
+    )
+    shared.attrs = dict(df.attrs)
+    return shared
@@ -0,0 +1,151 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from typing import Dict, Optional
+from .data_constants import (
+    COLUMNS_TO_KEEP,
+    NUMERIC_COLUMNS,
+    WAGE_DTYPE,
+    INGEST_CHUNK_SIZE,
+    RAW_READER_ENGINE,
+)
+from .data_processor import process_data, standardize_soc_codes
+from .data_validation import (
+    ROW_RULES,
+    column_stats,
+    merge_column_stats,
+    quarantine_rows,
+    validate_raw_data,
+    validation_metadata,
+    write_quarantine_file,
+)
+from .raw_readers import get_reader
+
+# String columns are dictionary-encoded so they load back as categoricals
+PROCESSED_SCHEMA = pa.schema(
+    [
+        (
+            col,
+            (
+                pa.from_numpy_dtype(WAGE_DTYPE)
+                if col in NUMERIC_COLUMNS
+                else pa.dictionary(pa.int32(), pa.string())
+            ),
+        )
+        for col in COLUMNS_TO_KEEP
+    ]
+)
+
+
+def stream_ingest(
+    raw_data_path: str,
+    processed_data_path: str,
+    chunk_size: int = INGEST_CHUNK_SIZE,
+    engine: Optional[str] = RAW_READER_ENGINE,
+    metadata: Optional[Dict[bytes, bytes]] = None,
+    quarantine_path: Optional[str] = None,
+) -> int:
+    """
+    Process a raw file chunk by chunk into a Parquet file.
+
+    Each chunk goes through `process_data` and is appended to the output as
+    one row group, so peak memory depends on `chunk_size` rather than on the
+    size of the raw file. SOC titles are resolved across chunks so the output
+    matches processing the whole file at once: rows whose code has no title
+    yet are held back until a later chunk provides one. At most `chunk_size`
+    rows are held; once that many are, they are written with the titles
+    known so far, so codes still without one keep a null title, as codes
+    never given a title do when the whole file is processed.
+
+    With `quarantine_path`, rows failing any rule of ROW_RULES are written
+    there instead, see `quarantine_rows`. Statistics of the written rows
+    are accumulated chunk by chunk and recorded in the footer once all are
+    written, see `validation_metadata`.
+
+    Args:
+        raw_data_path: Path to the raw XLSX, CSV or Arrow file
+        processed_data_path: Path of the Parquet file to write
+        chunk_size: Number of raw rows per chunk
+        engine: Raw reader engine, or None to pick one by file type
+        metadata: Schema metadata to store in the Parquet file
+        quarantine_path: Parquet file receiving the rows failing row rules,
+            with per-rule counts; None keeps every row
+
+    Returns:
+        int: Number of processed rows written
+
+    Raises:
+        ValueError: If the raw file is missing required columns
+    """
+    soc_titles: Dict[str, str] = {}
+    pending = []
+    pending_rows = 0
+    rows_written = 0
+    quarantined = []
+    rule_counts = dict.fromkeys(ROW_RULES, 0)
+    stats = column_stats(pd.DataFrame(columns=COLUMNS_TO_KEEP))
+
+    def write(processed_df: pd.DataFrame) -> None:
+        nonlocal rows_written, stats
+        processed_df = processed_df.assign(
+            SOC_TITLE=processed_df["SOC_CODE"].map(soc_titles).astype("category")
+        )
+        if quarantine_path is not None:
+            processed_df, failed_df, counts = quarantine_rows(processed_df)
+            quarantined.append(failed_df)
+            for rule, count in counts.items():
+                rule_counts[rule] += count
+        writer.write_table(
+            pa.Table.from_pandas(
+                processed_df, schema=PROCESSED_SCHEMA, preserve_index=False
+            )
+        )
+        rows_written += len(processed_df)
+        stats = merge_column_stats(stats, column_stats(processed_df))
+
+    reader = get_reader(raw_data_path, engine)
+
+    schema = PROCESSED_SCHEMA.with_metadata(metadata or {})
+    with pq.ParquetWriter(processed_data_path, schema) as writer:
+        for chunk in reader.iter_chunks(raw_data_path, chunk_size=chunk_size):
+            if not validate_raw_data(chunk):
+                raise ValueError("Raw data is missing required columns")
+
+            # Keep the first title encountered for each code across all chunks
+            chunk_titles = (
+                chunk["SOC_TITLE"]
+                .groupby(standardize_soc_codes(chunk["SOC_CODE"]))
+                .first()
+                .dropna()
+            )
+            for soc_code, soc_title in chunk_titles.items():
+                soc_titles.setdefault(soc_code, soc_title)
+
+            processed_df = process_data(chunk)
+
+            # Rows whose code has no title yet may get one from a later chunk
+            unresolved = ~processed_df["SOC_CODE"].isin(soc_titles.keys())
+            if unresolved.any():
+                pending.append(processed_df[unresolved])
+                pending_rows += int(unresolved.sum())
+            write(processed_df[~unresolved])
+
+            if pending_rows >= chunk_size:
+                write(pd.concat(pending))
+                pending, pending_rows = [], 0
+
+        if pending:
+            write(pd.concat(pending))
+
+        writer.add_key_value_metadata(
+            validation_metadata(stats, rows_written, PROCESSED_SCHEMA)
+        )
+
+    if quarantine_path is not None:
+        write_quarantine_file(
+            quarantine_path,
+            pd.concat(quarantined) if quarantined else pd.DataFrame(),
+            rule_counts,
+        )
+
+    return rows_written
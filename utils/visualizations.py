@@ -1,7 +1,35 @@
-import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
+from typing import Tuple
+from .chart_summaries import histogram_summary, histogram_trace
+from .data_constants import CDF_GRID_POINTS
+from .grouped_stats import grouped_stats
+
+
+def cdf_grid(
+    values: pd.Series, points: int = CDF_GRID_POINTS
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sample the empirical CDF of a column on a fixed grid of probabilities.
+
+    The grid does not depend on the data, so the plotted payload stays the
+    same size for any number of rows, and CDFs of different columns share
+    their y values. Missing values are ignored.
+
+    Args:
+        values: Values to describe
+        points: Number of grid points
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Cumulative probabilities and the
+            quantiles at those probabilities (empty if there are no values)
+    """
+    probabilities = np.linspace(0, 1, points)
+    values = values.dropna().to_numpy(dtype="float64")
+    if len(values) == 0:
+        return probabilities[:0], values
+    return probabilities, np.quantile(values, probabilities)
 
 
 def plot_wage_distribution(df):
@@ -9,11 +37,10 @@ def plot_wage_distribution(df):
     fig = go.Figure()
 
     # Add offered wage CDF
-    sorted_actual = np.sort(df["ANNUAL_WAGE"].dropna())
-    yvals = np.arange(1, len(sorted_actual) + 1) / len(sorted_actual)
+    yvals, actual = cdf_grid(df["ANNUAL_WAGE"])
     fig.add_trace(
         go.Scatter(
-            x=sorted_actual,
+            x=actual,
             y=yvals,
             name="Offered Wage",
             line=dict(color="rgb(0, 0, 255)"),  # Blue
@@ -21,11 +48,10 @@ def plot_wage_distribution(df):
     )
 
     # Add prevailing wage CDF
-    sorted_prev = np.sort(df["ANNUAL_PREVAILING_WAGE"].dropna())
-    yvals_prev = np.arange(1, len(sorted_prev) + 1) / len(sorted_prev)
+    yvals_prev, prevailing = cdf_grid(df["ANNUAL_PREVAILING_WAGE"])
     fig.add_trace(
         go.Scatter(
-            x=sorted_prev,
+            x=prevailing,
             y=yvals_prev,
             name="Prevailing Wage",
             line=dict(color="rgb(128, 128, 128)"),  # Gray
@@ -45,13 +71,15 @@ def plot_wage_distribution(df):
 
 def create_employer_table(df):
     """Create employer statistics table"""
-    employer_stats = (
-        df.groupby("EMPLOYER_NAME")
-        .agg({"ANNUAL_WAGE": ["count", "mean", "median"]})
-        .reset_index()
+    stats = grouped_stats(df, "EMPLOYER_NAME")
+    employer_stats = pd.DataFrame(
+        {
+            "Employer": stats.index,
+            "Number of H1Bs": stats["count"].to_numpy(),
+            "Mean Wage": stats["mean"].to_numpy(),
+            "Median Wage": stats[0.5].to_numpy(),
+        }
     )
-
-    employer_stats.columns = ["Employer", "Number of H1Bs", "Mean Wage", "Median Wage"]
     employer_stats = employer_stats.sort_values("Number of H1Bs", ascending=False).head(
         10
     )
@@ -92,15 +120,15 @@ def create_employer_table(df):
 
 def plot_wage_ratio_distribution(df):
     """Create wage ratio distribution plot"""
-    fig = px.histogram(
-        df,
-        x="WAGE_RATIO",
-        nbins=50,
-        title="Distribution of Actual/Prevailing Wage Ratio",
-        labels={"WAGE_RATIO": "Offered Wage / Prevailing Wage"},
-    )
+    # Bin on the server so the figure size does not depend on the row count
+    histogram = histogram_summary(df["WAGE_RATIO"])
+    fig = go.Figure(histogram_trace(histogram, name="WAGE_RATIO"))
 
     fig.update_layout(
+        title="Distribution of Actual/Prevailing Wage Ratio",
+        xaxis_title="Offered Wage / Prevailing Wage",
+        yaxis_title="count",
+        bargap=0,
         showlegend=False,
         height=400,
         xaxis=dict(tickformat=".2f"),  # Format x-axis ticks to 2 decimal places
@@ -0,0 +1,340 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from .aggregate_cache import filter_key
+from .data_constants import (
+    CUBE_FILE,
+    CUBE_MEASURES,
+    DIMENSION_TABLES,
+    SKETCH_FILE,
+    EMPLOYER_CUBE_FILE,
+    QUANTILE_EXACT_MAX_ROWS,
+)
+from .data_processor import SKETCH_GAMMA, wage_buckets
+from .dataset_store import AGGREGATES, Period, read_aggregates
+from .filter_index import group_index, select_rows
+
+
+class WageCube:
+    """
+    Pre-aggregated tables (cubes and quantile sketches) of a loaded dataset.
+
+    Resolves a sidebar filter to cube cells instead of rows. Cells of the
+    selected SOC code and state whose wage bucket lies inside the wage range
+    are taken as they are; only the (at most two) buckets cut by the ends of
+    the range need their rows.
+    """
+
+    def __init__(self, tables: Dict[str, pd.DataFrame]):
+        self.tables = tables
+        buckets = (
+            tables[CUBE_FILE]
+            .groupby("WAGE_BUCKET")
+            .agg({"WAGE_MIN": "min", "WAGE_MAX": "max"})
+        )
+        self.bucket_min = buckets["WAGE_MIN"]
+        self.bucket_max = buckets["WAGE_MAX"]
+
+    def select(
+        self,
+        file_name: str,
+        selected_soc: str,
+        selected_state: str,
+        wage_range: Tuple[float, float],
+    ) -> Tuple[pd.DataFrame, List[int]]:
+        """
+        Resolve a filter combination to whole cube cells.
+
+        Args:
+            file_name: Table to select from, one of AGGREGATES
+            selected_soc: SOC code or "All"
+            selected_state: State or "All"
+            wage_range: Inclusive (min, max) annual wage
+
+        Returns:
+            Tuple[pd.DataFrame, List[int]]: Table rows of the cells lying
+                entirely inside the filter, and the wage buckets only partly
+                inside the range, whose rows must be aggregated separately
+        """
+        low_bucket, high_bucket = (int(b) for b in wage_buckets(wage_range))
+
+        # An end of the range only cuts its bucket if some wage lies beyond it
+        partial = []
+        if wage_range[0] > self.bucket_min.get(low_bucket, np.inf):
+            partial.append(low_bucket)
+        if wage_range[1] < self.bucket_max.get(high_bucket, -np.inf):
+            partial.append(high_bucket)
+
+        cells = self.tables[file_name]
+        mask = cells["WAGE_BUCKET"].between(low_bucket, high_bucket)
+        if partial:
+            mask &= ~cells["WAGE_BUCKET"].isin(partial)
+        if selected_soc != "All":
+            mask &= cells["SOC_CODE"] == selected_soc
+        if selected_state != "All":
+            mask &= cells["WORKSITE_STATE"] == selected_state
+
+        return cells[mask], sorted(set(partial))
+
+
+@st.cache_resource(max_entries=8)
+def _cached_wage_cube(dataset_version: str, periods: Tuple[Period, ...]) -> WageCube:
+    """Load the pre-aggregated tables once per dataset version"""
+    return WageCube(
+        {
+            file_name: read_aggregates(periods, file_name)
+            for file_name in AGGREGATES
+            if file_name not in DIMENSION_TABLES
+        }
+    )
+
+
+def filtered_cells(df: pd.DataFrame, file_name: str = CUBE_FILE) -> pd.DataFrame:
+    """
+    Get cube cells holding exactly the rows of a filtered view.
+
+    Views tagged by `apply_filters` are answered from the stored table plus
+    the rows of partly selected wage buckets; any other frame is aggregated
+    from its rows.
+
+    Args:
+        df: Filtered DataFrame
+        file_name: Pre-aggregated table to select from, one of AGGREGATES
+
+    Returns:
+        pd.DataFrame: Cells of the view's rows
+    """
+    build, merge = AGGREGATES[file_name]
+    key = filter_key(df)
+    periods = df.attrs.get("periods")
+    if key is None or periods is None:
+        return build(df)
+
+    dataset_version, selected_soc, selected_state, wage_range = key
+    cube = _cached_wage_cube(dataset_version, periods)
+    cells, partial = cube.select(file_name, selected_soc, selected_state, wage_range)
+    if not partial:
+        return cells
+
+    boundary = np.isin(wage_buckets(df["ANNUAL_WAGE"]), partial)
+    return merge([cells, build(df[boundary])])
+
+
+def _cube_for(by: Optional[str]) -> str:
+    """Name of the cube holding dimension `by`"""
+    return EMPLOYER_CUBE_FILE if by == "EMPLOYER_NAME" else CUBE_FILE
+
+
+def wage_summary(
+    df: pd.DataFrame, by: Optional[str] = None
+) -> Union[pd.DataFrame, pd.Series]:
+    """
+    Roll up count and wage statistics of a filtered view from the cube.
+
+    Args:
+        df: Filtered DataFrame
+        by: Dimension to group by ("SOC_CODE", "WORKSITE_STATE" or
+            "EMPLOYER_NAME"), or None for totals
+
+    Returns:
+        Union[pd.DataFrame, pd.Series]: COUNT, MEAN_WAGE, WAGE_STD (sample),
+            WAGE_MIN, WAGE_MAX, MEAN_PREVAILING_WAGE, MEAN_WAGE_RATIO and
+            ABOVE_PREVAILING_SHARE, per value of `by` (sorted, non-empty groups
+            only) or in total
+    """
+    cells = filtered_cells(df, _cube_for(by))
+    aggregations = {measure: "sum" for measure in CUBE_MEASURES}
+    aggregations.update({"WAGE_MIN": "min", "WAGE_MAX": "max"})
+    if by is None:
+        totals = cells[CUBE_MEASURES].agg(aggregations)
+        # Object dtype keeps COUNT an integer in the single row
+        return _summarize(totals.to_frame().T).astype(object).iloc[0]
+
+    return _summarize(cells.groupby(by, sort=True)[CUBE_MEASURES].agg(aggregations))
+
+
+def primary_values(df: pd.DataFrame, by: str, column: str) -> pd.Series:
+    """
+    Most frequent value of `column` per `by` group of a filtered view.
+
+    Computed from cube cell counts with vectorized sorts rather than a mode
+    per group. Ties go to the smallest value, as with `Series.mode()[0]`.
+
+    Args:
+        df: Filtered DataFrame
+        by: Dimension to group by, e.g. "EMPLOYER_NAME"
+        column: Other cube dimension, e.g. "WORKSITE_STATE"
+
+    Returns:
+        pd.Series: Most frequent `column` value, indexed by sorted `by` values
+    """
+    cells = filtered_cells(df, _cube_for(by))
+    counts = cells.groupby([by, column], sort=True)["COUNT"].sum().reset_index()
+
+    # Within each group, a stable sort by descending count keeps ties in
+    # ascending order of `column`
+    counts = counts.sort_values(
+        [by, "COUNT"], ascending=[True, False], kind="stable"
+    ).drop_duplicates(by)
+    return counts.set_index(by)[column]
+
+
+def _summarize(measures: pd.DataFrame) -> pd.DataFrame:
+    """Derive means, standard deviation and shares from summed measures"""
+    count = measures["COUNT"].astype("float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance = (measures["WAGE_SUMSQ"] - measures["WAGE_SUM"] ** 2 / count) / (
+            count - 1
+        )
+    return pd.DataFrame(
+        {
+            "COUNT": measures["COUNT"].astype("int64"),
+            "MEAN_WAGE": measures["WAGE_SUM"] / count,
+            "WAGE_STD": np.sqrt(variance.clip(lower=0)).where(count > 1),
+            "WAGE_MIN": measures["WAGE_MIN"],
+            "WAGE_MAX": measures["WAGE_MAX"],
+            "MEAN_PREVAILING_WAGE": measures["PREVAILING_SUM"] / count,
+            "MEAN_WAGE_RATIO": measures["RATIO_SUM"] / count,
+            "ABOVE_PREVAILING_SHARE": measures["ABOVE_PREVAILING"] / count,
+        }
+    )
+
+
+def _sketch_quantiles(
+    sketch: pd.DataFrame, quantiles: Sequence[float], by: Optional[str]
+) -> pd.DataFrame:
+    """
+    Estimate quantiles per group from merged sketch bins.
+
+    Order statistics are located by cumulative bin counts and interpolated
+    like `pd.Series.quantile`. A bin stands for its representative value,
+    clipped to the exact minimum and maximum of the values it holds, so bins
+    holding a single distinct value give that value exactly.
+    """
+    keys = ["SKETCH_BIN"] if by is None else [by, "SKETCH_BIN"]
+    bins = sketch.groupby(keys, sort=True).agg(
+        {"COUNT": "sum", "MIN": "min", "MAX": "max"}
+    )
+    if bins.empty:
+        # No values: NaN overall, like Series.quantile, or no groups
+        groups = pd.Index([0]) if by is None else pd.Index([], name=by)
+        return pd.DataFrame(np.nan, index=groups, columns=quantiles)
+
+    if by is None:
+        groups = pd.Index([0])
+        group_codes = np.zeros(len(bins), dtype="int64")
+    else:
+        group_codes, groups = pd.factorize(bins.index.get_level_values(by))
+
+    bin_numbers = bins.index.get_level_values("SKETCH_BIN").to_numpy()
+    representative = 2 * SKETCH_GAMMA**bin_numbers / (SKETCH_GAMMA + 1)
+    values = np.clip(representative, bins["MIN"].to_numpy(), bins["MAX"].to_numpy())
+
+    # Cumulative counts across all groups; each group's ranks are offset by
+    # the counts of the groups before it
+    ends = np.cumsum(bins["COUNT"].to_numpy())
+    group_ends = ends[np.searchsorted(group_codes, np.arange(len(groups)), "right") - 1]
+    group_starts = np.concatenate([[0], group_ends[:-1]])
+    group_sizes = group_ends - group_starts
+
+    results = {}
+    for q in quantiles:
+        position = (group_sizes - 1) * q
+        lower, upper = np.floor(position), np.ceil(position)
+        low_value = values[np.searchsorted(ends, group_starts + lower, "right")]
+        high_value = values[np.searchsorted(ends, group_starts + upper, "right")]
+        results[q] = low_value + (position - lower) * (high_value - low_value)
+
+    return pd.DataFrame(results, index=groups)
+
+
+def _exact_quantiles(
+    df: pd.DataFrame, column: str, quantiles: List[float], by: Optional[str]
+) -> Union[pd.DataFrame, pd.Series]:
+    """Quantiles computed from the rows, shaped like `wage_quantiles`"""
+    if by is None:
+        return df[column].astype("float64").quantile(quantiles)
+    exact = df.groupby(by, observed=True)[column].quantile(quantiles)
+    # Keep a column per quantile when there are no groups
+    return exact.astype("float64").unstack().reindex(columns=quantiles)
+
+
+def wage_quantiles(
+    df: pd.DataFrame,
+    column: str = "ANNUAL_WAGE",
+    quantiles: Sequence[float] = (0.5,),
+    by: Optional[str] = None,
+    exact: Optional[bool] = None,
+) -> Union[pd.DataFrame, pd.Series]:
+    """
+    Quantiles of a wage column of a filtered view.
+
+    By default, selections of up to QUANTILE_EXACT_MAX_ROWS rows are answered
+    exactly from the rows. Larger ones merge the quantile sketches of the
+    selected cube cells, within QUANTILE_RELATIVE_ACCURACY of the exact values.
+    When grouping a larger selection, the smallest groups, by the counts of
+    their cells, are still answered exactly, as long as they hold up to
+    QUANTILE_EXACT_MAX_ROWS rows together, so a state with a handful of
+    rows gets its exact median.
+
+    Args:
+        df: Filtered DataFrame
+        column: Wage column, one of SKETCH_COLUMNS
+        quantiles: Quantiles to compute, between 0 and 1
+        by: Cube dimension to group by ("SOC_CODE" or "WORKSITE_STATE"), or
+            None for the whole selection
+        exact: Force exact (True) or sketched (False) quantiles; None
+            decides by the number of rows of the selection and its groups
+
+    Returns:
+        Union[pd.DataFrame, pd.Series]: Quantiles per value of `by` (sorted,
+            non-empty groups only; one column per quantile), or indexed by
+            quantile
+    """
+    quantiles = list(quantiles)
+    if exact or (exact is None and len(df) <= QUANTILE_EXACT_MAX_ROWS):
+        return _exact_quantiles(df, column, quantiles, by)
+
+    sketch = filtered_cells(df, SKETCH_FILE)
+    sketch = sketch[sketch["MEASURE"] == column]
+    estimates = _sketch_quantiles(sketch, quantiles, by)
+    if by is None:
+        return estimates.iloc[0]
+    estimates = estimates.rename_axis(by)
+    if exact is False:
+        return estimates
+
+    # Replace the estimates of the smallest groups with exact quantiles
+    sizes = sketch.groupby(by, sort=True)["COUNT"].sum().sort_values(kind="stable")
+    small = sizes.index[sizes.cumsum() <= QUANTILE_EXACT_MAX_ROWS]
+    if len(small):
+        index = group_index(df, by)
+        rows = np.sort(np.concatenate([index.rows(group) for group in small]))
+        exact_values = _exact_quantiles(select_rows(df, rows), column, quantiles, by)
+        estimates.loc[exact_values.index] = exact_values.to_numpy()
+    return estimates
+
+
+def wage_median(
+    df: pd.DataFrame,
+    column: str = "ANNUAL_WAGE",
+    by: Optional[str] = None,
+    exact: Optional[bool] = None,
+) -> Union[pd.Series, float]:
+    """
+    Median of a wage column of a filtered view, see `wage_quantiles`.
+
+    Args:
+        df: Filtered DataFrame
+        column: Wage column, one of SKETCH_COLUMNS
+        by: Cube dimension to group by, or None for the whole selection
+        exact: Force exact (True) or sketched (False) medians
+
+    Returns:
+        Union[pd.Series, float]: Median per value of `by`, or overall
+    """
+    medians = wage_quantiles(df, column, (0.5,), by, exact)
+    if by is None:
+        return medians.iloc[0]
+    return medians[0.5]
@@ -55,6 +55,86 @@ def annualize_wage(
     return wage  # Default to assuming annual if unit not recognized
 
 
+def clean_wages(wages: pd.Series) -> pd.Series:
+    """
+    Vectorized equivalent of `clean_wage` for a whole column.
+
+    Args:
+        wages: Series of raw wage values (strings, floats or ints)
+
+    Returns:
+        pd.Series: Float Series of cleaned wages, np.nan where invalid
+    """
+    if pd.api.types.is_numeric_dtype(wages):
+        return wages.astype("float64")
+
+    present = wages.notna()
+    cleaned = (
+        wages[present]
+        .astype(str)
+        .str.replace("$", "", regex=False)
+        .str.replace(",", "", regex=False)
+        .str.strip()
+    )
+    result = pd.Series(np.nan, index=wages.index, dtype="float64")
+    result[present] = pd.to_numeric(cleaned, errors="coerce").astype("float64")
+
+    # Values `to_numeric` rejects but `float` accepts (e.g. "1_000", "inf")
+    # are rare, so fall back to the scalar path for just those entries.
+    unparsed = present & result.isna()
+    if unparsed.any():
+        result[unparsed] = wages[unparsed].map(clean_wage).astype("float64")
+
+    return result
+
+
+def wage_unit_multiplier(unit: Any) -> float:
+    """
+    Get the annualization multiplier for a single unit of pay.
+
+    Mirrors the matching rules of `annualize_wage`: missing units are treated
+    as annual, and the first key of WAGE_MULTIPLIERS contained in the
+    lowercased unit wins.
+
+    Args:
+        unit: Unit of pay value (e.g. "Hour", "Bi-Weekly")
+
+    Returns:
+        float: Multiplier converting a wage in that unit to an annual wage
+    """
+    if pd.isna(unit):
+        return 1
+
+    unit = str(unit).lower()
+    for key, multiplier in WAGE_MULTIPLIERS.items():
+        if key in unit:
+            return multiplier
+
+    return 1
+
+
+def annualize_wages(wages: pd.Series, units: pd.Series) -> pd.Series:
+    """
+    Vectorized equivalent of `annualize_wage` for whole columns.
+
+    The unit column only has a handful of distinct values, so the multiplier
+    is resolved once per distinct unit and applied as a single array multiply.
+
+    Args:
+        wages: Series of cleaned wage values
+        units: Series of units of pay aligned with `wages`
+
+    Returns:
+        pd.Series: Series of annualized wages
+    """
+    codes, uniques = pd.factorize(units)
+    multipliers = np.array(
+        [wage_unit_multiplier(unit) for unit in uniques] + [1], dtype="float64"
+    )
+    # factorize marks missing units with -1, which picks the trailing 1
+    return wages.astype("float64") * multipliers[codes]
+
+
 def calculate_wage_ratio(df: pd.DataFrame) -> pd.Series:
     """
     Calculate the ratio between actual and prevailing wages.